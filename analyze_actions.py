@@ -1,9 +1,19 @@
+import argparse
 import json
+import sys
 from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from profiling import add_profile_arguments, finish_profile, profiler_from_args
+
+args = add_profile_arguments(argparse.ArgumentParser(description="Statistiques de initial-actions.json")).parse_args()
+profiler = profiler_from_args(args, 'analyze_actions.py').start()
 
 # Charger le fichier JSON
-with open('data/seed/initial-actions.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+with profiler.stage('load'):
+    with open('data/seed/initial-actions.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
 
 # Analyser les actions
 actions = data.get('actions', [])
@@ -19,7 +29,7 @@ print()
 
 # Analyser les exemples
 examples_stats = []
-for action in actions:
+for action in profiler.track(actions):
     num_examples = len(action.get('examples', []))
     examples_stats.append(num_examples)
 
@@ -34,3 +44,5 @@ examples_distribution = Counter(examples_stats)
 print("Distribution du nombre d'exemples:")
 for num, count in sorted(examples_distribution.items()):
     print(f"  {num} exemple(s): {count} actions")
+
+finish_profile(profiler, args)
@@ -3,15 +3,20 @@ Script d'analyse du fichier enrichi final
 Affiche des statistiques détaillées et des exemples
 """
 
-import json
+import argparse
+import sys
 from collections import Counter
+from pathlib import Path
 
-def analyze_final():
-    # Charger le fichier enrichi
-    with open('data/seed/initial-actions.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from corpus_client import load_actions
+from profiling import NULL_PROFILER, Profiler, add_profile_arguments, finish_profile, profiler_from_args
 
-    actions = data.get('actions', [])
+def analyze_final(profiler: Profiler = NULL_PROFILER):
+    # Charger le corpus (un fichier par action dans data/seed/actions, servi par le démon s'il tourne)
+    with profiler.stage('load'):
+        actions = load_actions()
+    by_id = {a.get('id', '').casefold(): a for a in actions}
 
     print("=" * 80)
     print("ANALYSE DU FICHIER INITIAL-ACTIONS.JSON ENRICHI")
@@ -41,7 +46,7 @@ def analyze_final():
 
     # Par catégorie
     by_category = {}
-    for action in actions:
+    for action in profiler.track(actions):
         cat = action.get('category', 'Unknown')
         if cat not in by_category:
             by_category[cat] = {'actions': 0, 'examples': 0}
@@ -99,7 +104,7 @@ def analyze_final():
     ]
 
     for action_id, category in examples_to_show:
-        action = next((a for a in actions if a['id'] == action_id), None)
+        action = by_id.get(action_id.casefold())
         if action:
             print(f"{'=' * 80}")
             print(f"📌 {action['title']}")
@@ -128,4 +133,9 @@ def analyze_final():
 
 
 if __name__ == '__main__':
-    analyze_final()
+    parser = argparse.ArgumentParser(description="Analyse du corpus enrichi")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, 'analyze_final.py').start()
+    analyze_final(profiler)
+    finish_profile(profiler, args)
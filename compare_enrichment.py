@@ -4,16 +4,26 @@ Compare original vs enriched initial-actions.json
 Shows detailed statistics and concrete examples of improvements
 """
 
+import argparse
 import json
+import sys
 from collections import defaultdict
+from pathlib import Path
 
-# Load original (backup)
-with open('data/seed/initial-actions.BACKUP.json', 'r', encoding='utf-8') as f:
-    original = json.load(f)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from profiling import add_profile_arguments, finish_profile, profiler_from_args
 
-# Load enriched (current)
-with open('data/seed/initial-actions.json', 'r', encoding='utf-8') as f:
-    enriched = json.load(f)
+args = add_profile_arguments(argparse.ArgumentParser(description="Compare initial-actions.json à sa sauvegarde")).parse_args()
+profiler = profiler_from_args(args, 'compare_enrichment.py').start()
+
+with profiler.stage('load'):
+    # Load original (backup)
+    with open('data/seed/initial-actions.BACKUP.json', 'r', encoding='utf-8') as f:
+        original = json.load(f)
+
+    # Load enriched (current)
+    with open('data/seed/initial-actions.json', 'r', encoding='utf-8') as f:
+        enriched = json.load(f)
 
 # Create lookup by ID
 original_by_id = {action['id']: action for action in original['actions']}
@@ -67,7 +77,7 @@ print("🏆 TOP 10 AMÉLIORATIONS (plus d'exemples ajoutés)")
 print("-" * 80)
 
 improvements = []
-for action_id in enriched_by_id:
+for action_id in profiler.track(enriched_by_id):
     if action_id in original_by_id:
         original_count = len(original_by_id[action_id].get('examples', []))
         enriched_count = len(enriched_by_id[action_id].get('examples', []))
@@ -174,3 +184,5 @@ print(f"• Moyenne d'exemples par action: {original_total/len(original['actions
 print(f"• Descriptions {((avg_enriched_desc/avg_original_desc - 1) * 100):.0f}% plus détaillées")
 print(f"• Toutes les catégories ont été enrichies")
 print()
+
+finish_profile(profiler, args)
@@ -3,18 +3,25 @@ Script d'enrichissement des exemples TwinShell
 Transforme chaque commande en ressource pédagogique complète
 """
 
+import argparse
 import json
 import re
-from typing import List, Dict, Any
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 from copy import deepcopy
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from profiling import NULL_PROFILER, Profiler, add_profile_arguments, finish_profile, profiler_from_args
+
 
 class ExampleEnricher:
     """Classe principale pour enrichir les exemples des commandes"""
 
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Dict[str, Any], profiler: Optional[Profiler] = None):
         self.data = data
         self.actions = data.get('actions', [])
+        self.profiler = profiler or NULL_PROFILER
         self.enrichment_stats = {
             'total_actions': len(self.actions),
             'enriched': 0,
@@ -29,7 +36,8 @@ class ExampleEnricher:
             if idx % 50 == 0:
                 print(f"  Progression: {idx}/{len(self.actions)} actions traitées")
 
-            self.enrich_action(action)
+            with self.profiler.action(action.get('id', '')):
+                self.enrich_action(action)
 
         print(f"\n✅ Enrichissement terminé!")
         print(f"   Actions enrichies: {self.enrichment_stats['enriched']}")
@@ -47,30 +55,31 @@ class ExampleEnricher:
         initial_count = len(current_examples)
 
         # Enrichir selon la catégorie
-        new_examples = []
-
         if '🏢 Active Directory' in category:
-            new_examples = self.enrich_ad_examples(action)
+            enrich = self.enrich_ad_examples
         elif '🌐 Network' in category or 'DNS' in category:
-            new_examples = self.enrich_network_examples(action)
+            enrich = self.enrich_network_examples
         elif '📊 Monitoring' in category or 'Logs' in category:
-            new_examples = self.enrich_monitoring_examples(action)
+            enrich = self.enrich_monitoring_examples
         elif '💻 Windows' in category:
-            new_examples = self.enrich_windows_examples(action)
+            enrich = self.enrich_windows_examples
         elif '🐧' in category:
-            new_examples = self.enrich_linux_examples(action)
+            enrich = self.enrich_linux_examples
         elif 'Performance' in category or '⚡' in category:
-            new_examples = self.enrich_performance_examples(action)
+            enrich = self.enrich_performance_examples
         elif 'GPO' in action_id or 'gpo' in action_id.lower():
-            new_examples = self.enrich_gpo_examples(action)
+            enrich = self.enrich_gpo_examples
         elif 'Security' in category or '🔒' in category or '🔐' in category:
-            new_examples = self.enrich_security_examples(action)
+            enrich = self.enrich_security_examples
         elif 'Git' in category or '🔀' in category:
-            new_examples = self.enrich_git_examples(action)
+            enrich = self.enrich_git_examples
         elif 'Storage' in category or 'Backup' in category:
-            new_examples = self.enrich_storage_examples(action)
+            enrich = self.enrich_storage_examples
         else:
-            new_examples = self.enrich_generic_examples(action)
+            enrich = self.enrich_generic_examples
+
+        with self.profiler.stage(enrich.__name__, items=1):
+            new_examples = enrich(action)
 
         # Si des exemples ont été générés, les ajouter
         if new_examples:
@@ -952,10 +961,15 @@ class ExampleEnricher:
 
 def main():
     """Fonction principale"""
-    import sys
+    parser = argparse.ArgumentParser(description="Enrichissement des exemples TwinShell")
+    parser.add_argument('--input', default='data/seed/initial-actions.json')
+    parser.add_argument('--output', default='data/seed/initial-actions-enriched.json')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
 
-    input_file = 'data/seed/initial-actions.json'
-    output_file = 'data/seed/initial-actions-enriched.json'
+    input_file = args.input
+    output_file = args.output
+    profiler = profiler_from_args(args, 'enrich_examples.py').start()
 
     print("=" * 70)
     print("Script d'enrichissement des exemples TwinShell")
@@ -965,8 +979,9 @@ def main():
     # Charger le fichier
     print(f"📖 Chargement de {input_file}...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with profiler.stage('load'):
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         print(f"✅ Fichier chargé : {len(data.get('actions', []))} actions trouvées")
     except Exception as e:
         print(f"❌ Erreur de chargement : {e}")
@@ -975,21 +990,25 @@ def main():
     print()
 
     # Enrichir
-    enricher = ExampleEnricher(data)
-    enriched_data = enricher.enrich_all()
+    enricher = ExampleEnricher(data, profiler)
+    with profiler.stage('enrich_all', items=len(enricher.actions)):
+        enriched_data = enricher.enrich_all()
 
     print()
 
     # Sauvegarder
     print(f"💾 Sauvegarde vers {output_file}...")
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(enriched_data, f, ensure_ascii=False, indent=2)
+        with profiler.stage('save'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(enriched_data, f, ensure_ascii=False, indent=2)
         print(f"✅ Fichier sauvegardé avec succès!")
     except Exception as e:
         print(f"❌ Erreur de sauvegarde : {e}")
         sys.exit(1)
 
+    finish_profile(profiler, args)
+
     print()
     print("=" * 70)
     print("✨ Enrichissement terminé avec succès!")
@@ -3,11 +3,20 @@ Script d'enrichissement massif des exemples TwinShell v2
 Version améliorée avec enrichissement automatique intelligent
 """
 
+import argparse
 import json
 import re
-from typing import List, Dict, Any
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 from copy import deepcopy
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from checkpoint import CheckpointError, RunJournal, add_checkpoint_arguments, journal_from_args
+from command_templates import parse
+from profiling import NULL_PROFILER, Profiler, add_profile_arguments, finish_profile, profiler_from_args
+from seed_corpus import open_atomic
+
 
 class AutoEnricher:
     """Classe pour enrichissement automatique basé sur les patterns de commandes"""
@@ -163,10 +172,11 @@ class AutoEnricher:
 class ExampleEnricherV2:
     """Classe principale v2 avec enrichissement massif"""
 
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Dict[str, Any], profiler: Optional[Profiler] = None):
         self.data = data
         self.actions = data.get('actions', [])
         self.auto_enricher = AutoEnricher()
+        self.profiler = profiler or NULL_PROFILER
         self.enrichment_stats = {
             'total_actions': len(self.actions),
             'enriched': 0,
@@ -174,27 +184,40 @@ class ExampleEnricherV2:
             'by_category': {}
         }
 
-    def enrich_all(self) -> Dict[str, Any]:
-        """Enrichit toutes les actions"""
+    def enrich_all(self, journal: Optional[RunJournal] = None) -> Dict[str, Any]:
+        """Enrichit toutes les actions (avec un journal, les actions déjà enrichies sont reprises)"""
         print(f"Enrichissement massif de {len(self.actions)} actions...\n")
 
         for idx, action in enumerate(self.actions, 1):
             if idx % 50 == 0:
                 print(f"  Progression: {idx}/{len(self.actions)} actions traitées")
 
-            initial_count = len(action.get('examples', []))
-            self.enrich_action(action)
-            final_count = len(action.get('examples', []))
-
-            if final_count > initial_count:
+            # La position distingue d'éventuels ids en double
+            key = f"{idx}:{action.get('id', '')}"
+            entry = journal.restore(key) if journal else None
+            if entry is not None:
+                action = self.actions[idx - 1] = entry.output
+                added = entry.data.get('added', 0)
+            else:
+                initial_count = len(action.get('examples', []))
+                with self.profiler.action(action.get('id', '')):
+                    self.enrich_action(action)
+                added = len(action.get('examples', [])) - initial_count
+                if journal:
+                    journal.record(key, action, added=added)
+
+            if added > 0:
                 self.enrichment_stats['enriched'] += 1
-                self.enrichment_stats['examples_added'] += (final_count - initial_count)
+                self.enrichment_stats['examples_added'] += added
 
                 category = action.get('category', 'Unknown')
                 if category not in self.enrichment_stats['by_category']:
                     self.enrichment_stats['by_category'][category] = {'actions': 0, 'examples': 0}
                 self.enrichment_stats['by_category'][category]['actions'] += 1
-                self.enrichment_stats['by_category'][category]['examples'] += (final_count - initial_count)
+                self.enrichment_stats['by_category'][category]['examples'] += added
+
+        if journal and journal.restored:
+            print(f"\n⏭️  {journal.restored} actions reprises du journal ({journal.redone} à refaire)")
 
         print(f"\n✅ Enrichissement terminé!")
         print(f"   Actions enrichies: {self.enrichment_stats['enriched']}")
@@ -227,13 +250,16 @@ class ExampleEnricherV2:
 
         # Enrichissement automatique
         if platform == 0:  # Windows/PowerShell
-            new_examples = self.auto_enricher.auto_enrich_powershell_command(cmd_pattern, action)
+            with self.profiler.stage('auto_enrich_powershell_command', items=1):
+                new_examples = self.auto_enricher.auto_enrich_powershell_command(cmd_pattern, action)
         else:  # Linux/Bash
-            new_examples = self.auto_enricher.auto_enrich_bash_command(cmd_pattern, action)
+            with self.profiler.stage('auto_enrich_bash_command', items=1):
+                new_examples = self.auto_enricher.auto_enrich_bash_command(cmd_pattern, action)
 
         # Si toujours pas assez, ajouter des exemples génériques supplémentaires
         if len(new_examples) < target_count:
-            new_examples = self.add_generic_examples(new_examples, action, target_count)
+            with self.profiler.stage('add_generic_examples', items=1):
+                new_examples = self.add_generic_examples(new_examples, action, target_count)
 
         action['examples'] = new_examples
 
@@ -242,6 +268,7 @@ class ExampleEnricherV2:
         cmd_template = action.get('windowsCommandTemplate') or action.get('linuxCommandTemplate') or {}
         cmd_pattern = cmd_template.get('commandPattern', '')
         parameters = cmd_template.get('parameters', [])
+        parsed_pattern = parse(cmd_pattern)
 
         # Ajouter des exemples basés sur les paramètres disponibles
         for param in parameters[:target - len(examples)]:
@@ -251,7 +278,7 @@ class ExampleEnricherV2:
 
             if param_name and len(examples) < target:
                 # Remplacer le placeholder dans la commande
-                example_cmd = cmd_pattern.replace(f"{{{param_name}}}", str(param_default) if param_default else f"<{param_name}>")
+                example_cmd = parsed_pattern.render({param_name: str(param_default) if param_default else f"<{param_name}>"})
 
                 examples.append({
                     "command": example_cmd,
@@ -271,10 +298,16 @@ class ExampleEnricherV2:
 
 def main():
     """Fonction principale"""
-    import sys
+    parser = argparse.ArgumentParser(description="Enrichissement massif des exemples TwinShell V2")
+    parser.add_argument('--input', default='data/seed/initial-actions.json')
+    parser.add_argument('--output', default='data/seed/initial-actions-enriched-v2.json')
+    add_profile_arguments(parser)
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args()
 
-    input_file = 'data/seed/initial-actions.json'
-    output_file = 'data/seed/initial-actions-enriched-v2.json'
+    input_file = args.input
+    output_file = args.output
+    profiler = profiler_from_args(args, 'enrich_examples_v2.py').start()
 
     print("=" * 70)
     print("Script d'enrichissement MASSIF des exemples TwinShell V2")
@@ -284,8 +317,9 @@ def main():
     # Charger
     print(f"📖 Chargement de {input_file}...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with profiler.stage('load'):
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         print(f"✅ Fichier chargé : {len(data.get('actions', []))} actions")
     except Exception as e:
         print(f"❌ Erreur : {e}")
@@ -294,21 +328,31 @@ def main():
     print()
 
     # Enrichir
-    enricher = ExampleEnricherV2(data)
-    enriched_data = enricher.enrich_all()
+    enricher = ExampleEnricherV2(data, profiler)
+    try:
+        journal = journal_from_args(args, 'enrich_examples_v2.py', Path(input_file), Path(output_file))
+    except CheckpointError as e:
+        print(f"❌ Erreur : {e}")
+        sys.exit(1)
+    with journal, profiler.stage('enrich_all', items=len(enricher.actions)):
+        enriched_data = enricher.enrich_all(journal)
 
     print()
 
     # Sauvegarder
     print(f"💾 Sauvegarde vers {output_file}...")
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(enriched_data, f, ensure_ascii=False, indent=2)
+        with profiler.stage('save'):
+            with open_atomic(Path(output_file)) as f:
+                json.dump(enriched_data, f, ensure_ascii=False, indent=2)
+        journal.discard()
         print(f"✅ Fichier sauvegardé!")
     except Exception as e:
         print(f"❌ Erreur : {e}")
         sys.exit(1)
 
+    finish_profile(profiler, args)
+
     print()
     print("=" * 70)
     print("✨ Enrichissement MASSIF terminé!")
@@ -3,23 +3,34 @@ Script de migration vers des fiches unifiées cross-platform
 Regroupe les commandes Windows/Linux équivalentes dans des fiches uniques
 """
 
+import argparse
 import json
 import re
+import sys
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from copy import deepcopy
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from checkpoint import CheckpointError, JournalEntry, RunJournal, add_checkpoint_arguments, journal_from_args
+from profiling import NULL_PROFILER, Profiler, add_profile_arguments, finish_profile, profiler_from_args
+from seed_corpus import merge_tags, open_atomic
+
 
 class CrossPlatformMigrator:
     """Migrateur vers des fiches cross-platform unifiées"""
 
-    def __init__(self, data: Dict[str, Any]):
+    def __init__(self, data: Dict[str, Any], profiler: Optional[Profiler] = None):
         self.data = data
         self.actions = data.get('actions', [])
+        self.profiler = profiler or NULL_PROFILER
         self.windows_actions = [a for a in self.actions if a.get('platform') == 0]
         self.linux_actions = [a for a in self.actions if a.get('platform') == 1]
 
         # Définir les paires d'équivalents connus
         self.known_pairs = self.define_known_pairs()
+        self._search_texts: Dict[str, str] = {}
+        self._patterns: Dict[str, re.Pattern] = {}
 
         # Statistiques
         self.stats = {
@@ -190,18 +201,28 @@ class CrossPlatformMigrator:
             },
         ]
 
-    def find_match(self, action: Dict[str, Any], patterns: List[str]) -> bool:
-        """Vérifie si une action correspond aux patterns"""
-        title = action.get('title', '').lower()
-        description = action.get('description', '').lower()
+    def search_text(self, action: Dict[str, Any]) -> str:
+        """Titre, description et commandes en minuscules, calculés une fois par action"""
+        key = action.get('id', '')
+        text = self._search_texts.get(key)
+        if text is None:
+            title = action.get('title', '').lower()
+            description = action.get('description', '').lower()
 
-        win_cmd = action.get('windowsCommandTemplate', {}).get('commandPattern', '').lower()
-        linux_cmd = action.get('linuxCommandTemplate', {}).get('commandPattern', '').lower()
+            win_cmd = action.get('windowsCommandTemplate', {}).get('commandPattern', '').lower()
+            linux_cmd = action.get('linuxCommandTemplate', {}).get('commandPattern', '').lower()
 
-        search_text = f"{title} {description} {win_cmd} {linux_cmd}"
+            text = self._search_texts[key] = f"{title} {description} {win_cmd} {linux_cmd}"
+        return text
 
+    def find_match(self, action: Dict[str, Any], patterns: List[str]) -> bool:
+        """Vérifie si une action correspond aux patterns"""
+        search_text = self.search_text(action)
         for pattern in patterns:
-            if re.search(pattern.lower(), search_text):
+            compiled = self._patterns.get(pattern)
+            if compiled is None:
+                compiled = self._patterns[pattern] = re.compile(pattern.lower())
+            if compiled.search(search_text):
                 return True
         return False
 
@@ -254,7 +275,7 @@ class CrossPlatformMigrator:
             "platform": 2,  # 2 = Cross-platform
             "supportedPlatforms": [],
             "level": base_action.get('level', 0),
-            "tags": list(set(base_action.get('tags', []))),
+            "tags": merge_tags(base_action.get('tags', [])),
             "notes": "",
             "links": [],
         }
@@ -267,8 +288,7 @@ class CrossPlatformMigrator:
             unified['windowsExamples'] = windows_action.get('examples', [])
 
             # Fusionner les tags
-            unified['tags'].extend(windows_action.get('tags', []))
-            unified['tags'] = list(set(unified['tags']))
+            unified['tags'] = merge_tags(unified['tags'], windows_action.get('tags', []))
 
             # Fusionner les notes
             win_notes = windows_action.get('notes', '')
@@ -286,8 +306,7 @@ class CrossPlatformMigrator:
             unified['linuxExamples'] = linux_action.get('examples', [])
 
             # Fusionner les tags
-            unified['tags'].extend(linux_action.get('tags', []))
-            unified['tags'] = list(set(unified['tags']))
+            unified['tags'] = merge_tags(unified['tags'], linux_action.get('tags', []))
 
             # Fusionner les notes
             linux_notes = linux_action.get('notes', '')
@@ -341,8 +360,69 @@ class CrossPlatformMigrator:
 
         return differences
 
-    def migrate(self) -> Dict[str, Any]:
-        """Effectue la migration complète"""
+    def merge_pair(self, pair_def: Dict[str, Any], unified_actions: List[Dict],
+                   used_windows: set, used_linux: set) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]:
+        """Fusionne une paire connue et marque ses actions comme utilisées
+
+        Retourne (action unifiée, action Windows, action Linux), None quand absentes.
+        """
+        with self.profiler.stage('find_pair', items=1):
+            win_action, linux_action = self.find_pair(pair_def)
+
+        if not (win_action or linux_action):
+            return None, None, None
+
+        self.stats['pairs_found'] += 1
+
+        # Créer l'action unifiée
+        with self.profiler.stage('create_unified_action', items=1):
+            unified = self.create_unified_action(
+                pair_def['concept'],
+                pair_def['category'],
+                win_action,
+                linux_action
+            )
+
+        unified_actions.append(unified)
+        self.stats['unified_created'] += 1
+
+        # Marquer comme utilisées
+        if win_action:
+            used_windows.add(win_action['id'])
+        if linux_action:
+            used_linux.add(linux_action['id'])
+
+        # Afficher
+        status = "✅" if (win_action and linux_action) else "⚠️"
+        platforms = []
+        if win_action:
+            platforms.append(f"Windows ({len(win_action.get('examples', []))} ex)")
+        if linux_action:
+            platforms.append(f"Linux ({len(linux_action.get('examples', []))} ex)")
+
+        print(f"{status} {pair_def['concept']}")
+        print(f"   {' + '.join(platforms)}")
+
+        return unified, win_action, linux_action
+
+    def restore_pair(self, pair_def: Dict[str, Any], entry: JournalEntry, unified_actions: List[Dict],
+                     used_windows: set, used_linux: set):
+        """Reprend une paire fusionnée par une exécution interrompue"""
+        if entry.output is None:
+            return
+
+        self.stats['pairs_found'] += 1
+        unified_actions.append(entry.output)
+        self.stats['unified_created'] += 1
+        if entry.data.get('windows'):
+            used_windows.add(entry.data['windows'])
+        if entry.data.get('linux'):
+            used_linux.add(entry.data['linux'])
+
+        print(f"⏭️  {pair_def['concept']} (repris du journal)")
+
+    def migrate(self, journal: Optional[RunJournal] = None) -> Dict[str, Any]:
+        """Effectue la migration complète (avec un journal, les paires déjà fusionnées sont reprises)"""
         print("=" * 80)
         print("MIGRATION VERS FICHES UNIFIÉES CROSS-PLATFORM")
         print("=" * 80)
@@ -365,39 +445,18 @@ class CrossPlatformMigrator:
         print("🔄 Recherche et fusion des paires connues...")
         print()
 
-        for pair_def in self.known_pairs:
-            win_action, linux_action = self.find_pair(pair_def)
-
-            if win_action or linux_action:
-                self.stats['pairs_found'] += 1
-
-                # Créer l'action unifiée
-                unified = self.create_unified_action(
-                    pair_def['concept'],
-                    pair_def['category'],
-                    win_action,
-                    linux_action
-                )
-
-                unified_actions.append(unified)
-                self.stats['unified_created'] += 1
-
-                # Marquer comme utilisées
-                if win_action:
-                    used_windows.add(win_action['id'])
-                if linux_action:
-                    used_linux.add(linux_action['id'])
-
-                # Afficher
-                status = "✅" if (win_action and linux_action) else "⚠️"
-                platforms = []
-                if win_action:
-                    platforms.append(f"Windows ({len(win_action.get('examples', []))} ex)")
-                if linux_action:
-                    platforms.append(f"Linux ({len(linux_action.get('examples', []))} ex)")
-
-                print(f"{status} {pair_def['concept']}")
-                print(f"   {' + '.join(platforms)}")
+        for position, pair_def in enumerate(self.known_pairs, 1):
+            key = f"{position}:{pair_def['concept']}"
+            entry = journal.restore(key) if journal else None
+            if entry is not None:
+                self.restore_pair(pair_def, entry, unified_actions, used_windows, used_linux)
+                continue
+            with self.profiler.action(pair_def['concept']):
+                unified, win_action, linux_action = self.merge_pair(pair_def, unified_actions, used_windows, used_linux)
+            if journal:
+                journal.record(key, unified,
+                               windows=win_action['id'] if win_action else None,
+                               linux=linux_action['id'] if linux_action else None)
 
         print()
         print(f"✅ {self.stats['pairs_found']} paires trouvées et fusionnées")
@@ -405,18 +464,20 @@ class CrossPlatformMigrator:
 
         # Ajouter les actions non appariées (Windows only)
         print("📦 Conservation des actions Windows non appariées...")
-        for action in self.windows_actions:
-            if action['id'] not in used_windows:
-                unified_actions.append(deepcopy(action))
-                self.stats['windows_only'] += 1
+        with self.profiler.stage('keep_windows_only', items=len(self.windows_actions)):
+            for action in self.windows_actions:
+                if action['id'] not in used_windows:
+                    unified_actions.append(deepcopy(action))
+                    self.stats['windows_only'] += 1
         print(f"   {self.stats['windows_only']} actions Windows conservées")
 
         # Ajouter les actions non appariées (Linux only)
         print("📦 Conservation des actions Linux non appariées...")
-        for action in self.linux_actions:
-            if action['id'] not in used_linux:
-                unified_actions.append(deepcopy(action))
-                self.stats['linux_only'] += 1
+        with self.profiler.stage('keep_linux_only', items=len(self.linux_actions)):
+            for action in self.linux_actions:
+                if action['id'] not in used_linux:
+                    unified_actions.append(deepcopy(action))
+                    self.stats['linux_only'] += 1
         print(f"   {self.stats['linux_only']} actions Linux conservées")
 
         print()
@@ -432,7 +493,8 @@ class CrossPlatformMigrator:
         print()
 
         # Créer le nouveau fichier de données
-        new_data = deepcopy(self.data)
+        with self.profiler.stage('copy_data'):
+            new_data = deepcopy(self.data)
         new_data['actions'] = unified_actions
         new_data['schemaVersion'] = "2.0"  # Nouvelle version du schéma
 
@@ -476,11 +538,18 @@ une seule fiche, facilitant l'apprentissage cross-platform.
 
 def main():
     """Fonction principale"""
-    import sys
-
-    input_file = 'data/seed/initial-actions.json'
-    output_file = 'data/seed/initial-actions-unified.json'
-    report_file = 'RAPPORT_MIGRATION_UNIFIED.md'
+    parser = argparse.ArgumentParser(description="Migration vers des fiches unifiées cross-platform")
+    parser.add_argument('--input', default='data/seed/initial-actions.json')
+    parser.add_argument('--output', default='data/seed/initial-actions-unified.json')
+    parser.add_argument('--report', default='RAPPORT_MIGRATION_UNIFIED.md')
+    add_profile_arguments(parser)
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args()
+
+    input_file = args.input
+    output_file = args.output
+    report_file = args.report
+    profiler = profiler_from_args(args, 'migrate_to_unified.py').start()
 
     print()
     print("╔════════════════════════════════════════════════════════════════════╗")
@@ -493,8 +562,9 @@ def main():
     # Charger
     print(f"📖 Chargement de {input_file}...")
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with profiler.stage('load'):
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         print(f"✅ Chargé: {len(data.get('actions', []))} actions")
     except Exception as e:
         print(f"❌ Erreur: {e}")
@@ -503,14 +573,22 @@ def main():
     print()
 
     # Migrer
-    migrator = CrossPlatformMigrator(data)
-    unified_data = migrator.migrate()
+    migrator = CrossPlatformMigrator(data, profiler)
+    try:
+        journal = journal_from_args(args, 'migrate_to_unified.py', Path(input_file), Path(output_file))
+    except CheckpointError as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+    with journal, profiler.stage('migrate', items=len(migrator.actions)):
+        unified_data = migrator.migrate(journal)
 
     # Sauvegarder
     print(f"💾 Sauvegarde vers {output_file}...")
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(unified_data, f, ensure_ascii=False, indent=2)
+        with profiler.stage('save'):
+            with open_atomic(Path(output_file)) as f:
+                json.dump(unified_data, f, ensure_ascii=False, indent=2)
+        journal.discard()
         print(f"✅ Sauvegardé!")
     except Exception as e:
         print(f"❌ Erreur: {e}")
@@ -537,6 +615,8 @@ def main():
     print(f"📊 Rapport : {report_file}")
     print()
 
+    finish_profile(profiler, args)
+
 
 if __name__ == '__main__':
     main()
@@ -1,20 +1,52 @@
 #!/usr/bin/env python3
 """
 Audit script for TwinShell commands database.
-Analyzes initial-actions.json for quality issues.
+Analyzes the seed actions (data/seed/actions/ or a monolithic export)
+for quality issues.
 """
 
+import argparse
 import json
 import re
 from collections import defaultdict
 from pathlib import Path
 
+import corpus_client
+import seed_corpus
+from profiling import NULL_PROFILER, add_profile_arguments, finish_profile, profiler_from_args
+from text_normalizer import normalize_for_search
+
+PLATFORM_MAP = {0: 'Windows', 1: 'Linux', 2: 'Both'}
+LEVEL_MAP = {0: 'Info', 1: 'Run', 2: 'Dangerous'}
+
+DEPRECATED_COMMANDS = {
+    'wmic': 'Deprecated - use Get-CimInstance instead',
+    'net user': 'Consider using Get-LocalUser for better output',
+    'netsh interface ip show config': 'Consider using Get-NetIPConfiguration',
+}
+
+DANGEROUS_PATTERNS = [
+    (r'rm\s+-rf\s+/', 'Dangerous recursive delete from root'),
+    (r'Remove-Item.*-Recurse.*-Force.*\$env:', 'Dangerous recursive delete of system paths'),
+    (r'Format-Volume', 'Disk formatting command'),
+    (r'Clear-Disk', 'Disk clearing command'),
+    (r'Stop-Computer\s+-Force', 'Force shutdown without confirmation'),
+    (r'Restart-Computer\s+-Force', 'Force restart without confirmation'),
+]
+
+# Normalized / compiled once instead of once per command and rule
+NORMALIZED_DEPRECATED_COMMANDS = [(normalize_for_search(k), v) for k, v in DEPRECATED_COMMANDS.items()]
+COMPILED_DANGEROUS_PATTERNS = [(re.compile(p, re.IGNORECASE), desc) for p, desc in DANGEROUS_PATTERNS]
+
 def load_actions(file_path):
+    """Load actions from the per-file seed directory or a monolithic export."""
+    if Path(file_path).is_dir():
+        return corpus_client.load_actions(file_path)
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     return data.get('actions', [])
 
-def analyze_actions(actions):
+def analyze_actions(actions, profiler=NULL_PROFILER):
     issues = defaultdict(list)
     stats = {
         'total': len(actions),
@@ -29,85 +61,76 @@ def analyze_actions(actions):
         'empty_description': 0,
     }
 
-    platform_map = {0: 'Windows', 1: 'Linux', 2: 'Both'}
-    level_map = {0: 'Info', 1: 'Run', 2: 'Dangerous'}
+    for action in actions:
+        with profiler.action(action.get('id', 'unknown')):
+            analyze_action(action, stats, issues, profiler)
 
-    deprecated_commands = {
-        'wmic': 'Deprecated - use Get-CimInstance instead',
-        'net user': 'Consider using Get-LocalUser for better output',
-        'netsh interface ip show config': 'Consider using Get-NetIPConfiguration',
-    }
+    return stats, dict(issues)
 
-    dangerous_patterns = [
-        (r'rm\s+-rf\s+/', 'Dangerous recursive delete from root'),
-        (r'Remove-Item.*-Recurse.*-Force.*\$env:', 'Dangerous recursive delete of system paths'),
-        (r'Format-Volume', 'Disk formatting command'),
-        (r'Clear-Disk', 'Disk clearing command'),
-        (r'Stop-Computer\s+-Force', 'Force shutdown without confirmation'),
-        (r'Restart-Computer\s+-Force', 'Force restart without confirmation'),
-    ]
+def analyze_action(action, stats, issues, profiler=NULL_PROFILER):
+    action_id = action.get('id', 'unknown')
+    title = action.get('title', 'No title')
+    category = action.get('category', 'Unknown')
+    platform = action.get('platform', 0)
+    level = action.get('level', 0)
+    description = action.get('description', '')
+    examples = action.get('examples', [])
+    windows_template = action.get('windowsCommandTemplate')
+    linux_template = action.get('linuxCommandTemplate')
+
+    # Stats
+    stats['by_platform'][PLATFORM_MAP.get(platform, 'Unknown')] += 1
+    stats['by_level'][LEVEL_MAP.get(level, 'Unknown')] += 1
+    stats['by_category'][category] += 1
+
+    if examples:
+        stats['with_examples'] += 1
+    else:
+        stats['without_examples'] += 1
 
-    for action in actions:
-        action_id = action.get('id', 'unknown')
-        title = action.get('title', 'No title')
-        category = action.get('category', 'Unknown')
-        platform = action.get('platform', 0)
-        level = action.get('level', 0)
-        description = action.get('description', '')
-        examples = action.get('examples', [])
-        windows_template = action.get('windowsCommandTemplate')
-        linux_template = action.get('linuxCommandTemplate')
-
-        # Stats
-        stats['by_platform'][platform_map.get(platform, 'Unknown')] += 1
-        stats['by_level'][level_map.get(level, 'Unknown')] += 1
-        stats['by_category'][category] += 1
-
-        if examples:
-            stats['with_examples'] += 1
-        else:
-            stats['without_examples'] += 1
-
-        if windows_template or linux_template:
-            stats['with_template'] += 1
-        else:
-            stats['without_template'] += 1
-
-        if description and len(description.strip()) > 10:
-            stats['with_description'] += 1
-        else:
-            stats['empty_description'] += 1
-            issues['empty_description'].append(f"{title} ({action_id[:8]})")
-
-        # Check for deprecated commands
-        all_commands = []
-        if windows_template:
-            all_commands.append(windows_template.get('commandPattern', ''))
-        if linux_template:
-            all_commands.append(linux_template.get('commandPattern', ''))
-        for ex in examples:
-            all_commands.append(ex.get('command', ''))
+    if windows_template or linux_template:
+        stats['with_template'] += 1
+    else:
+        stats['without_template'] += 1
 
+    if description and len(description.strip()) > 10:
+        stats['with_description'] += 1
+    else:
+        stats['empty_description'] += 1
+        issues['empty_description'].append(f"{title} ({action_id[:8]})")
+
+    # Check for deprecated commands
+    all_commands = []
+    if windows_template:
+        all_commands.append(windows_template.get('commandPattern', ''))
+    if linux_template:
+        all_commands.append(linux_template.get('commandPattern', ''))
+    for ex in examples:
+        all_commands.append(ex.get('command', ''))
+
+    with profiler.stage('rule:deprecated', items=len(all_commands)):
         for cmd in all_commands:
-            cmd_lower = cmd.lower()
-            for deprecated, reason in deprecated_commands.items():
-                if deprecated.lower() in cmd_lower:
+            normalized = normalize_for_search(cmd)
+            for deprecated, reason in NORMALIZED_DEPRECATED_COMMANDS:
+                if deprecated in normalized:
                     issues['deprecated'].append(f"{title}: {reason}")
                     break
 
-        # Check for dangerous commands not marked as dangerous
-        if level != 2:  # Not marked as Dangerous
+    # Check for dangerous commands not marked as dangerous
+    if level != 2:  # Not marked as Dangerous
+        with profiler.stage('rule:unmarked_dangerous', items=len(all_commands)):
             for cmd in all_commands:
-                for pattern, desc in dangerous_patterns:
-                    if re.search(pattern, cmd, re.IGNORECASE):
+                for pattern, desc in COMPILED_DANGEROUS_PATTERNS:
+                    if pattern.search(cmd):
                         issues['unmarked_dangerous'].append(f"{title}: {desc}")
                         break
 
-        # Check for empty examples
-        if not examples:
-            issues['no_examples'].append(f"{title} ({action_id[:8]})")
+    # Check for empty examples
+    if not examples:
+        issues['no_examples'].append(f"{title} ({action_id[:8]})")
 
-        # Check for placeholder examples that weren't replaced
+    # Check for placeholder examples that weren't replaced
+    with profiler.stage('rule:placeholder_examples', items=len(examples)):
         for ex in examples:
             cmd = ex.get('command', '')
             if '<' in cmd and '>' in cmd and not cmd.startswith('#'):
@@ -116,8 +139,6 @@ def analyze_actions(actions):
                     issues['placeholder_examples'].append(f"{title}: {cmd[:50]}...")
                     break
 
-    return stats, dict(issues)
-
 def print_report(stats, issues):
     print("=" * 70)
     print("AUDIT DES COMMANDES TWINSHELL")
@@ -226,7 +247,21 @@ def print_report(stats, issues):
         print("Verdict: À AMÉLIORER")
 
 if __name__ == '__main__':
-    file_path = Path(__file__).parent.parent / 'data' / 'seed' / 'initial-actions.json'
-    actions = load_actions(file_path)
-    stats, issues = analyze_actions(actions)
+    parser = argparse.ArgumentParser(description="Audit des commandes TwinShell")
+    parser.add_argument('path', nargs='?', type=Path, default=seed_corpus.ACTIONS_DIR,
+                        help="Dossier data/seed/actions ou export JSON monolithique")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args, 'audit_commands.py').start()
+    # Results kept by corpus_daemon.py, unless the run is profiled
+    served = None if profiler.enabled or not args.path.is_dir() else corpus_client.audit(args.path)
+    if served is not None:
+        stats, issues = served
+    else:
+        with profiler.stage('load'):
+            actions = load_actions(args.path)
+        with profiler.stage('analyze', items=len(actions)):
+            stats, issues = analyze_actions(actions, profiler)
     print_report(stats, issues)
+    finish_profile(profiler, args)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the seed tooling.
+
+Each benchmark runs against the real corpus replicated N times (--scale),
+so the numbers reflect the shape of data/seed/actions at 1x, 10x or 100x.
+
+Usage:
+    python scripts/benchmark_corpus.py memory --scale 100
+    python scripts/benchmark_corpus.py search --scale 100
+    python scripts/benchmark_corpus.py bundle --scale 10
+    python scripts/benchmark_corpus.py templates --scale 100
+    python scripts/benchmark_corpus.py related --scale 200
+    python scripts/benchmark_corpus.py shared --scale 100
+    python scripts/benchmark_corpus.py all --scale 10 --output bench.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import command_templates
+import related_actions
+import search_seed_db
+import seed_bundle
+import seed_corpus
+import shared_corpus
+from build_seed_db import build_seed_db
+from seed_models import Action
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, Any]]] = {}
+
+
+def benchmark(name: str):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def read_corpus_texts(actions_dir: Path = seed_corpus.ACTIONS_DIR) -> List[str]:
+    return [p.read_text(encoding='utf-8') for p in seed_corpus.iter_action_files(actions_dir)]
+
+
+def replicate_corpus(texts: List[str], scale: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (file name, action) for scale copies of the corpus, with unique ids."""
+    for copy in range(scale):
+        for text in texts:
+            action = json.loads(text)
+            if copy:
+                suffix = f"-x{copy}"
+                action['id'] += suffix
+                for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+                    if action.get(key):
+                        action[key]['id'] += suffix
+                        action[key + 'Id'] = action[key]['id']
+            yield f"{action['id']}.json", action
+
+
+def time_query(run: Callable[[], Any], repeat: int = 20) -> float:
+    """Median duration of run() in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        durations.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(durations), 3)
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, Any]:
+    """Return the memory retained by build()'s result and the time it took."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'bytes': retained, 'seconds': round(elapsed, 4)}
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@benchmark('memory')
+def bench_memory(args) -> Dict[str, Any]:
+    """Retained size of the corpus held as dicts vs slotted seed_models."""
+    texts = read_corpus_texts(args.actions_dir)
+
+    def as_dicts():
+        return [json.loads(t) for _ in range(args.scale) for t in texts]
+
+    def as_models():
+        return [Action.from_dict(json.loads(t)) for _ in range(args.scale) for t in texts]
+
+    dicts = measure(as_dicts)
+    models = measure(as_models)
+    result = {
+        'actions': len(texts) * args.scale,
+        'dicts': dicts,
+        'models': models,
+        'reduction': round(1 - models['bytes'] / dicts['bytes'], 3) if dicts['bytes'] else None,
+    }
+    print(f"📦 Mémoire ({result['actions']} actions)")
+    print(f"   dicts  : {format_bytes(dicts['bytes'])} en {dicts['seconds']}s")
+    print(f"   models : {format_bytes(models['bytes'])} en {models['seconds']}s")
+    print(f"   gain   : {result['reduction'] * 100:.1f}%")
+    return result
+
+
+SEARCH_QUERIES = ['dns', 'réseau', 'get-process', 'netadapter', 'utilisateur mot de passe', 'systemctl restart']
+
+
+@benchmark('search')
+def bench_search(args) -> Dict[str, Any]:
+    """FTS5 ranked search vs LIKE scans, on the real corpus and at --scale."""
+    texts = read_corpus_texts(args.actions_dir)
+    result = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in sorted({1, args.scale}):
+            db_path = Path(tmp) / f"seed-{scale}.db"
+            summary = build_seed_db(db_path, replicate_corpus(texts, scale), batches=[])
+            connection = sqlite3.connect(db_path)
+            queries = {}
+            for query in SEARCH_QUERIES:
+                queries[query] = {
+                    'ftsActions': time_query(lambda: search_seed_db.search_actions(connection, query)),
+                    'likeActions': time_query(lambda: search_seed_db.like_search_actions(connection, query)),
+                    'ftsExamples': time_query(lambda: search_seed_db.search_examples(connection, query)),
+                    'likeExamples': time_query(lambda: search_seed_db.like_search_examples(connection, query)),
+                }
+            connection.close()
+            result[f"{scale}x"] = {
+                'actions': summary['rows']['Actions'],
+                'examples': summary['rows']['ActionExamples'],
+                'buildSeconds': summary['seconds'],
+                'bytes': summary['bytes'],
+                'queries': queries,
+            }
+            print(f"🔍 Recherche {scale}x ({summary['rows']['Actions']} actions, "
+                  f"{summary['rows']['ActionExamples']} exemples, {format_bytes(summary['bytes'])})")
+            print(f"   {'requête':<26} {'FTS act.':>9} {'LIKE act.':>10} {'FTS ex.':>9} {'LIKE ex.':>10}  (ms)")
+            for query, timings in queries.items():
+                print(f"   {query:<26} {timings['ftsActions']:>9} {timings['likeActions']:>10} "
+                      f"{timings['ftsExamples']:>9} {timings['likeExamples']:>10}")
+    return result
+
+
+def write_replicated_corpus(texts: List[str], scale: int, out_dir: Path) -> List[str]:
+    """Write scale copies of the corpus (with _index.json) to out_dir; return the ids."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ids = []
+    for name, action in replicate_corpus(texts, scale):
+        (out_dir / name).write_text(seed_corpus.dumps_action(action), encoding='utf-8')
+        ids.append(action['id'])
+    index = {'version': '2.0', 'format': 'individual-files', 'totalActions': len(ids), 'actions': ids}
+    (out_dir / seed_corpus.INDEX_FILE_NAME).write_text(seed_corpus.dumps_action(index), encoding='utf-8')
+    return ids
+
+
+@benchmark('bundle')
+def bench_bundle(args) -> Dict[str, Any]:
+    """Directory layout vs single-file bundles: size, full load, single-action load."""
+    texts = read_corpus_texts(args.actions_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        actions_dir = Path(tmp) / 'actions'
+        ids = write_replicated_corpus(texts, args.scale, actions_dir)
+        sample = random.Random(0).sample(ids, min(200, len(ids)))
+        files = seed_corpus.iter_action_files(actions_dir)
+
+        def load_one_file(action_id):
+            return seed_corpus.load_action(actions_dir / f"{action_id}.json")
+
+        layouts = {
+            'directory': {
+                'bytes': sum(p.stat().st_size for p in files),
+                'diskBytes': sum(p.stat().st_blocks * 512 for p in files),
+                'fullLoadMs': time_query(lambda: seed_corpus.load_actions(actions_dir), repeat=3),
+                'singleLoadMs': time_query(lambda: [load_one_file(i) for i in sample], repeat=3) / len(sample),
+            },
+        }
+        for codec in sorted(seed_bundle.CODECS):
+            bundle_path = Path(tmp) / f"seed-{codec}.bundle"
+            started = time.perf_counter()
+            stats = seed_bundle.pack(actions_dir, bundle_path, codec)
+            pack_seconds = time.perf_counter() - started
+
+            def full_load():
+                with seed_bundle.SeedBundle(bundle_path) as bundle:
+                    return list(bundle)
+
+            def single_loads():
+                # Cold reads: every lookup opens the bundle, like a fresh process would
+                for action_id in sample:
+                    with seed_bundle.SeedBundle(bundle_path) as bundle:
+                        bundle.get(action_id)
+
+            layouts[f"bundle-{codec}"] = {
+                'bytes': stats['bundleBytes'],
+                'diskBytes': bundle_path.stat().st_blocks * 512,
+                'packSeconds': round(pack_seconds, 3),
+                'fullLoadMs': time_query(full_load, repeat=3),
+                'singleLoadMs': time_query(single_loads, repeat=3) / len(sample),
+                'identical': not seed_bundle.verify(bundle_path, actions_dir),
+            }
+
+    print(f"🗜️  Bundle ({len(ids)} actions)")
+    print(f"   {'format':<14} {'taille':>10} {'sur disque':>11} {'chargement':>11} {'1 action':>10}")
+    for name, layout in layouts.items():
+        print(f"   {name:<14} {format_bytes(layout['bytes']):>10} {format_bytes(layout['diskBytes']):>11} "
+              f"{layout['fullLoadMs']:>9.1f}ms {layout['singleLoadMs']:>8.3f}ms")
+    return {'actions': len(ids), 'layouts': layouts}
+
+
+@benchmark('templates')
+def bench_templates(args) -> Dict[str, Any]:
+    """Rendering templates: str.replace per parameter vs parsed segments.
+
+    Measured on the corpus templates (short patterns, 0-3 parameters) and on
+    wide synthetic templates, where the per-parameter rescans dominate.
+    """
+    corpus = [t for _, _, t in command_templates.iter_templates(
+        json.loads(t) for t in read_corpus_texts(args.actions_dir))]
+    wide = []
+    for width in (10, 50, 200):
+        names = [f"p{i}" for i in range(width)]
+        wide.append({
+            'commandPattern': ' '.join(f"-Option{i} {{{name}}} | Where-Object {{ $_.Value -ne 0 }}"
+                                       for i, name in enumerate(names)),
+            'parameters': [{'name': name, 'defaultValue': f"value-{name}"} for name in names],
+        })
+
+    def replace_loop(templates):
+        for template in templates:
+            command = template['commandPattern']
+            for param in template.get('parameters') or []:
+                command = command.replace(f"{{{param['name']}}}", param.get('defaultValue') or '')
+
+    def engine(templates):
+        command_templates.parse.cache_clear()
+        for template in templates:
+            command_templates.render_template(template)
+
+    result = {}
+    for name, templates in (('corpus', corpus * args.scale), ('wide', wide * args.scale)):
+        result[name] = {
+            'templates': len(templates),
+            'replaceMs': time_query(lambda: replace_loop(templates), repeat=3),
+            'engineMs': time_query(lambda: engine(templates), repeat=3),
+        }
+    print("🧩 Templates")
+    for name, timings in result.items():
+        print(f"   {name:<7} ({timings['templates']} rendus) str.replace: {timings['replaceMs']:.1f} ms, "
+              f"moteur: {timings['engineMs']:.1f} ms")
+    return result
+
+
+@benchmark('related')
+def bench_related(args) -> Dict[str, Any]:
+    """Top-k related actions on the replicated corpus (every action has scale - 1 exact copies)."""
+    actions = [action for _, action in replicate_corpus(read_corpus_texts(args.actions_dir), args.scale)]
+    started = time.perf_counter()
+    matrix = related_actions.FeatureMatrix(actions)
+    built = time.perf_counter()
+    tracemalloc.start()
+    related_actions.top_k_neighbours(matrix)
+    finished = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result = {
+        'actions': len(matrix),
+        'features': len(matrix.features),
+        'entries': int(len(matrix.indices)),
+        'matrixMs': round((built - started) * 1000, 1),
+        'neighboursMs': round((finished - built) * 1000, 1),
+        'peakBytes': peak,
+    }
+    print("🔗 Actions liées")
+    print(f"   {result['actions']} actions, {result['features']} caractéristiques, {result['entries']} entrées")
+    print(f"   matrice: {result['matrixMs']:.0f} ms, voisins: {result['neighboursMs']:.0f} ms, "
+          f"pic mémoire du calcul {format_bytes(peak)} (matrice dense: {format_bytes(4 * result['actions'] ** 2)})")
+    return result
+
+
+SHARED_WORKERS = (1, 2, 4, 8, 16)
+
+
+@benchmark('shared')
+def bench_shared(args) -> Dict[str, Any]:
+    """A small per-action job on a process pool: actions pickled to the workers vs read from shared memory."""
+    actions = [action for _, action in replicate_corpus(read_corpus_texts(args.actions_dir), args.scale)]
+    expected = [shared_corpus.command_summary(a) for a in actions]
+    pickled = len(pickle.dumps(actions, protocol=pickle.HIGHEST_PROTOCOL))
+    started = time.perf_counter()
+    corpus = shared_corpus.SharedCorpus.create(actions)
+    encode_ms = round((time.perf_counter() - started) * 1000, 1)
+    runs = []
+    try:
+        for workers in SHARED_WORKERS:
+            started = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                by_pickle = list(pool.map(shared_corpus.command_summary, actions,
+                                          chunksize=shared_corpus.DEFAULT_CHUNK))
+            pickle_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            by_shared = shared_corpus.map_actions(shared_corpus.command_summary, corpus, workers)
+            shared_ms = (time.perf_counter() - started) * 1000
+            if by_pickle != expected or by_shared != expected:
+                raise RuntimeError(f"Résultats différents avec {workers} worker(s)")
+            runs.append({'workers': workers, 'pickleMs': round(pickle_ms, 1), 'sharedMs': round(shared_ms, 1)})
+    finally:
+        shared_bytes = corpus.nbytes
+        corpus.close()
+    result = {
+        'actions': len(actions),
+        'pickledBytes': pickled,
+        'sharedBytes': shared_bytes,
+        'encodeMs': encode_ms,
+        'runs': runs,
+    }
+    print(f"🧵 Pool de processus ({result['actions']} actions, {os.cpu_count()} CPU)")
+    print(f"   pickle du corpus: {format_bytes(pickled)}, bloc partagé: {format_bytes(shared_bytes)} "
+          f"(encodé en {encode_ms:.0f} ms)")
+    for run in runs:
+        print(f"   {run['workers']:2d} worker(s): pickle {run['pickleMs']:8.0f} ms, "
+              f"mémoire partagée {run['sharedMs']:8.0f} ms (x{run['pickleMs'] / run['sharedMs']:.1f})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de l'outillage du corpus")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--scale', type=int, default=100,
+                        help="Nombre de réplications du corpus réel (défaut: 100)")
+    parser.add_argument('--actions-dir', type=Path, default=seed_corpus.ACTIONS_DIR)
+    parser.add_argument('--output', type=Path, help="Écrit les résultats au format JSON")
+    args = parser.parse_args()
+
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    results = {'scale': args.scale}
+    for name in names:
+        results[name] = BENCHMARKS[name](args)
+        print()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Résultats écrits dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Compile the seed corpus into a ready-to-ship SQLite database.
+
+data/seed/actions/*.json and initial-batches.json are validated with the
+same rules as JsonSeedService and written in a single transaction:
+
+- Actions, CommandTemplates and CommandBatches use the column layout of the
+  app's EF Core entities (JSON columns included), so the app can copy rows
+  from the prebuilt file instead of importing JSON at first launch;
+- ActionTags, ActionPlatforms, ActionExamples, ActionLinks,
+  TemplateParameters and BatchCommands hold the same data normalized, for
+  tag / platform queries and for the tooling;
+- ActionSearch and ExampleSearch are FTS5 tables over titles, descriptions,
+  tags, notes and example commands (see search_seed_db.py to query them).
+
+Indexes are created after the bulk insert. The build reports its duration
+and the resulting file size.
+
+Usage:
+    python scripts/build_seed_db.py --output data/seed/twinshell-seed.db
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lazy_corpus import platform_mask
+from seed_corpus import ACTIONS_DIR, BATCHES_FILE, SEED_DIR, iter_action_files, load_batches
+
+DEFAULT_OUTPUT = SEED_DIR / 'twinshell-seed.db'
+SCHEMA_VERSION = 2
+INSERT_BATCH_SIZE = 1000
+
+# Mirrors JsonSeedService.ValidateAction / ValidationConstants
+MAX_FILE_SIZE = 100 * 1024
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_LENGTH = 2000
+MAX_CATEGORY_LENGTH = 100
+MAX_NOTES_LENGTH = 5000
+MAX_TAGS = 20
+MAX_EXAMPLES = 50
+MAX_LINKS = 10
+
+# Namespace for deterministic PublicId values (uuid5 of the record id)
+PUBLIC_ID_NAMESPACE = uuid.UUID('6f1d7b0e-8a4c-4f3e-9a51-2c7e0d5b9e11')
+
+EXAMPLE_KINDS = ('examples', 'windowsExamples', 'linuxExamples')
+
+SCHEMA = """
+CREATE TABLE CommandTemplates (
+    Id TEXT NOT NULL PRIMARY KEY,
+    PublicId TEXT NOT NULL,
+    Platform INTEGER NOT NULL,
+    Name TEXT NOT NULL,
+    CommandPattern TEXT NOT NULL,
+    ParametersJson TEXT NOT NULL
+);
+
+CREATE TABLE Actions (
+    Id TEXT NOT NULL PRIMARY KEY,
+    PublicId TEXT NOT NULL,
+    Title TEXT NOT NULL,
+    Description TEXT NOT NULL,
+    Category TEXT NOT NULL,
+    Platform INTEGER NOT NULL,
+    Level INTEGER NOT NULL,
+    TagsJson TEXT NOT NULL,
+    WindowsCommandTemplateId TEXT NULL REFERENCES CommandTemplates (Id) ON DELETE SET NULL,
+    LinuxCommandTemplateId TEXT NULL REFERENCES CommandTemplates (Id) ON DELETE SET NULL,
+    ExamplesJson TEXT NOT NULL,
+    WindowsExamplesJson TEXT NOT NULL,
+    LinuxExamplesJson TEXT NOT NULL,
+    Notes TEXT NULL,
+    LinksJson TEXT NOT NULL,
+    CreatedAt TEXT NOT NULL,
+    UpdatedAt TEXT NOT NULL,
+    IsUserCreated INTEGER NOT NULL
+);
+
+CREATE TABLE CommandBatches (
+    Id TEXT NOT NULL PRIMARY KEY,
+    PublicId TEXT NOT NULL,
+    Name TEXT NOT NULL,
+    Description TEXT NULL,
+    ExecutionMode INTEGER NOT NULL,
+    CommandsJson TEXT NOT NULL,
+    TagsJson TEXT NOT NULL,
+    CreatedAt TEXT NOT NULL,
+    UpdatedAt TEXT NOT NULL,
+    LastExecutedAt TEXT NULL,
+    IsUserCreated INTEGER NOT NULL
+);
+
+CREATE TABLE ActionTags (
+    ActionId TEXT NOT NULL REFERENCES Actions (Id) ON DELETE CASCADE,
+    Tag TEXT NOT NULL,
+    PRIMARY KEY (ActionId, Tag)
+) WITHOUT ROWID;
+
+CREATE TABLE ActionPlatforms (
+    ActionId TEXT NOT NULL REFERENCES Actions (Id) ON DELETE CASCADE,
+    Platform INTEGER NOT NULL,
+    PRIMARY KEY (ActionId, Platform)
+) WITHOUT ROWID;
+
+CREATE TABLE ActionExamples (
+    ActionId TEXT NOT NULL REFERENCES Actions (Id) ON DELETE CASCADE,
+    Kind TEXT NOT NULL,
+    Position INTEGER NOT NULL,
+    Command TEXT NOT NULL,
+    Description TEXT NOT NULL,
+    Platform INTEGER NULL,
+    PRIMARY KEY (ActionId, Kind, Position)
+);
+
+CREATE TABLE ActionLinks (
+    ActionId TEXT NOT NULL REFERENCES Actions (Id) ON DELETE CASCADE,
+    Position INTEGER NOT NULL,
+    Title TEXT NOT NULL,
+    Url TEXT NOT NULL,
+    PRIMARY KEY (ActionId, Position)
+) WITHOUT ROWID;
+
+CREATE TABLE TemplateParameters (
+    TemplateId TEXT NOT NULL REFERENCES CommandTemplates (Id) ON DELETE CASCADE,
+    Position INTEGER NOT NULL,
+    Name TEXT NOT NULL,
+    Label TEXT NULL,
+    Type TEXT NULL,
+    DefaultValue TEXT NULL,
+    Required INTEGER NOT NULL,
+    Description TEXT NULL,
+    PRIMARY KEY (TemplateId, Position)
+) WITHOUT ROWID;
+
+CREATE TABLE BatchCommands (
+    BatchId TEXT NOT NULL REFERENCES CommandBatches (Id) ON DELETE CASCADE,
+    Position INTEGER NOT NULL,
+    ActionId TEXT NOT NULL,
+    "Order" INTEGER NOT NULL,
+    IsExecuted INTEGER NOT NULL,
+    Description TEXT NULL,
+    PRIMARY KEY (BatchId, Position)
+) WITHOUT ROWID;
+
+CREATE TABLE SeedInfo (
+    Key TEXT NOT NULL PRIMARY KEY,
+    Value TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX IX_Actions_PublicId ON Actions (PublicId);
+CREATE INDEX IX_Actions_Title ON Actions (Title);
+CREATE INDEX IX_Actions_Category ON Actions (Category);
+CREATE INDEX IX_Actions_Platform ON Actions (Platform);
+CREATE INDEX IX_Actions_Level ON Actions (Level);
+CREATE INDEX IX_Actions_IsUserCreated ON Actions (IsUserCreated);
+CREATE INDEX IX_Actions_WindowsCommandTemplateId ON Actions (WindowsCommandTemplateId);
+CREATE INDEX IX_Actions_LinuxCommandTemplateId ON Actions (LinuxCommandTemplateId);
+CREATE UNIQUE INDEX IX_CommandTemplates_PublicId ON CommandTemplates (PublicId);
+CREATE UNIQUE INDEX IX_CommandBatches_PublicId ON CommandBatches (PublicId);
+CREATE INDEX IX_CommandBatches_Name ON CommandBatches (Name);
+CREATE INDEX IX_ActionTags_Tag ON ActionTags (Tag, ActionId);
+CREATE INDEX IX_ActionPlatforms_Platform ON ActionPlatforms (Platform, ActionId);
+CREATE INDEX IX_BatchCommands_ActionId ON BatchCommands (ActionId COLLATE NOCASE);
+"""
+
+
+# unicode61 folds case and strips accents ("réseau" matches "reseau"); "-" is
+# a token character so cmdlets such as Get-NetAdapter stay one token. The
+# Keywords column repeats the parts of hyphenated words ("Get", "NetAdapter",
+# "Name" for -Name) so they can be found on their own as well.
+SEARCH_TOKENIZER = "unicode61 remove_diacritics 2 tokenchars '-'"
+
+SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE ActionSearch USING fts5(
+    ActionId UNINDEXED, Title, Description, Tags, Notes, Commands, Keywords,
+    tokenize = "{SEARCH_TOKENIZER}"
+);
+
+CREATE VIRTUAL TABLE ExampleSearch USING fts5(
+    ActionId UNINDEXED, Kind UNINDEXED, Position UNINDEXED, Command, Description, Keywords,
+    tokenize = "{SEARCH_TOKENIZER}"
+);
+"""
+
+SEARCH_FILL = [
+    """
+    INSERT INTO ActionSearch (rowid, ActionId, Title, Description, Tags, Notes, Commands, Keywords)
+    SELECT a.rowid, a.Id, a.Title, a.Description,
+           coalesce((SELECT group_concat(Tag, ' ') FROM ActionTags t WHERE t.ActionId = a.Id), ''),
+           coalesce(a.Notes, ''), c.Commands, hyphen_parts(a.Title || ' ' || c.Commands)
+    FROM Actions a
+    JOIN (
+        SELECT a2.Id AS Id, coalesce(wt.CommandPattern, '') || char(10) || coalesce(lt.CommandPattern, '')
+               || char(10) || coalesce((SELECT group_concat(Command, char(10)) FROM ActionExamples e
+                                        WHERE e.ActionId = a2.Id), '') AS Commands
+        FROM Actions a2
+        LEFT JOIN CommandTemplates wt ON wt.Id = a2.WindowsCommandTemplateId
+        LEFT JOIN CommandTemplates lt ON lt.Id = a2.LinuxCommandTemplateId
+    ) c ON c.Id = a.Id
+    """,
+    """
+    INSERT INTO ExampleSearch (rowid, ActionId, Kind, Position, Command, Description, Keywords)
+    SELECT rowid, ActionId, Kind, Position, Command, Description, hyphen_parts(Command)
+    FROM ActionExamples
+    """,
+    "INSERT INTO ActionSearch (ActionSearch) VALUES ('optimize')",
+    "INSERT INTO ExampleSearch (ExampleSearch) VALUES ('optimize')",
+]
+
+_HYPHENATED = re.compile(r"[\w-]*\w-[\w-]*|-\w[\w-]*")
+
+
+def hyphen_parts(text: Optional[str]) -> str:
+    """Split the hyphenated words of text: "Get-Item -Path" -> "Get Item Path"."""
+    if not text:
+        return ''
+    return ' '.join(part for word in _HYPHENATED.findall(text) for part in word.split('-') if part)
+
+
+def validate_for_import(action: Dict[str, Any]) -> bool:
+    """Same acceptance rules as JsonSeedService.ValidateAction."""
+    title = action.get('title') or ''
+    category = action.get('category') or ''
+    if not title.strip() or not category.strip():
+        return False
+    if (len(title) > MAX_TITLE_LENGTH or len(category) > MAX_CATEGORY_LENGTH
+            or len(action.get('description') or '') > MAX_DESCRIPTION_LENGTH
+            or len(action.get('notes') or '') > MAX_NOTES_LENGTH):
+        return False
+    if len(action.get('tags') or []) > MAX_TAGS or len(action.get('links') or []) > MAX_LINKS:
+        return False
+    return all(len(action.get(kind) or []) <= MAX_EXAMPLES for kind in EXAMPLE_KINDS)
+
+
+def iter_seed_files(actions_dir: Path = ACTIONS_DIR) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Yield (file name, action) pairs; action is None for unreadable or oversized files."""
+    for path in iter_action_files(actions_dir):
+        text = path.read_text(encoding='utf-8')
+        if len(text) > MAX_FILE_SIZE:
+            yield path.name, None
+            continue
+        try:
+            yield path.name, json.loads(text)
+        except ValueError:
+            yield path.name, None
+
+
+def public_id(kind: str, record_id: str) -> str:
+    # EF Core stores Guid values as upper-case TEXT on SQLite
+    return str(uuid.uuid5(PUBLIC_ID_NAMESPACE, f"{kind}:{record_id}")).upper()
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def ef_timestamp(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class SeedDatabaseWriter:
+    """Buffers rows per table and flushes them with executemany()."""
+
+    INSERTS = {
+        'CommandTemplates': 'INSERT OR IGNORE INTO CommandTemplates VALUES (?, ?, ?, ?, ?, ?)',
+        'Actions': 'INSERT INTO Actions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        'CommandBatches': 'INSERT INTO CommandBatches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        'ActionTags': 'INSERT OR IGNORE INTO ActionTags VALUES (?, ?)',
+        'ActionPlatforms': 'INSERT INTO ActionPlatforms VALUES (?, ?)',
+        'ActionExamples': 'INSERT INTO ActionExamples VALUES (?, ?, ?, ?, ?, ?)',
+        'ActionLinks': 'INSERT INTO ActionLinks VALUES (?, ?, ?, ?)',
+        'TemplateParameters': 'INSERT OR IGNORE INTO TemplateParameters VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        'BatchCommands': 'INSERT INTO BatchCommands VALUES (?, ?, ?, ?, ?, ?)',
+    }
+
+    def __init__(self, connection: sqlite3.Connection, timestamp: str, batch_size: int = INSERT_BATCH_SIZE):
+        self.connection = connection
+        self.timestamp = timestamp
+        self.batch_size = batch_size
+        self.rows: Dict[str, List[tuple]] = {table: [] for table in self.INSERTS}
+        self.counts: Dict[str, int] = {table: 0 for table in self.INSERTS}
+
+    def add(self, table: str, row: tuple):
+        rows = self.rows[table]
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table: Optional[str] = None):
+        for name in [table] if table else self.INSERTS:
+            rows = self.rows[name]
+            if rows:
+                self.connection.executemany(self.INSERTS[name], rows)
+                self.counts[name] += len(rows)
+                rows.clear()
+
+    def add_template(self, template: Dict[str, Any]):
+        template_id = template.get('id', '')
+        parameters = template.get('parameters') or []
+        self.add('CommandTemplates', (
+            template_id,
+            public_id('template', template_id),
+            template.get('platform', 0),
+            template.get('name') or '',
+            template.get('commandPattern') or '',
+            compact_json(parameters),
+        ))
+        for position, param in enumerate(parameters):
+            self.add('TemplateParameters', (
+                template_id, position, param.get('name', ''), param.get('label'), param.get('type'),
+                param.get('defaultValue'), int(bool(param.get('required'))), param.get('description'),
+            ))
+
+    def add_action(self, action: Dict[str, Any]):
+        action_id = action['id']
+        for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+            if action.get(key):
+                self.add_template(action[key])
+        tags = action.get('tags') or []
+        self.add('Actions', (
+            action_id,
+            public_id('action', action_id),
+            action.get('title', ''),
+            action.get('description') or '',
+            action.get('category', ''),
+            action.get('platform', 0),
+            action.get('level', 0),
+            compact_json(tags),
+            action.get('windowsCommandTemplateId') if action.get('windowsCommandTemplate') else None,
+            action.get('linuxCommandTemplateId') if action.get('linuxCommandTemplate') else None,
+            compact_json(action.get('examples') or []),
+            compact_json(action.get('windowsExamples') or []),
+            compact_json(action.get('linuxExamples') or []),
+            action.get('notes'),
+            compact_json(action.get('links') or []),
+            self.timestamp,
+            self.timestamp,
+            0,
+        ))
+        for tag in tags:
+            self.add('ActionTags', (action_id, tag))
+        mask = platform_mask(action)
+        for platform in (0, 1):
+            if mask & (1 << platform):
+                self.add('ActionPlatforms', (action_id, platform))
+        for kind in EXAMPLE_KINDS:
+            for position, example in enumerate(action.get(kind) or []):
+                self.add('ActionExamples', (
+                    action_id, kind, position, example.get('command', ''),
+                    example.get('description', ''), example.get('platform'),
+                ))
+        for position, link in enumerate(action.get('links') or []):
+            self.add('ActionLinks', (action_id, position, link.get('title', ''), link.get('url', '')))
+
+    def add_batch(self, batch: Dict[str, Any]):
+        batch_id = batch['id']
+        commands = batch.get('commands') or []
+        self.add('CommandBatches', (
+            batch_id,
+            public_id('batch', batch_id),
+            batch.get('name', ''),
+            batch.get('description'),
+            batch.get('executionMode', 0),
+            compact_json(commands),
+            compact_json(batch.get('tags') or []),
+            self.timestamp,
+            self.timestamp,
+            None,
+            0,
+        ))
+        for position, command in enumerate(commands):
+            self.add('BatchCommands', (
+                batch_id, position, command.get('actionId', ''), command.get('order', position + 1),
+                int(bool(command.get('isExecuted'))), command.get('description'),
+            ))
+
+
+def build_seed_db(output: Path = DEFAULT_OUTPUT,
+                  seed_files: Optional[Iterable[Tuple[str, Optional[Dict[str, Any]]]]] = None,
+                  batches: Optional[List[Dict[str, Any]]] = None,
+                  timestamp: Optional[datetime] = None,
+                  search: bool = True) -> Dict[str, Any]:
+    """Build the database into a temporary file, then move it over output.
+
+    search=False skips the FTS5 tables.
+    """
+    started = time.perf_counter()
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if seed_files is None:
+        seed_files = iter_seed_files()
+    if batches is None:
+        batches = load_batches(BATCHES_FILE) if BATCHES_FILE.exists() else []
+    moment = timestamp or datetime.now(timezone.utc)
+
+    tmp_path = output.with_name(output.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    connection = sqlite3.connect(tmp_path, isolation_level=None)
+    skipped = []
+    try:
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        connection.executescript(SCHEMA)
+        if search:
+            connection.executescript(SEARCH_SCHEMA)
+            connection.create_function('hyphen_parts', 1, hyphen_parts, deterministic=True)
+
+        connection.execute('BEGIN')
+        writer = SeedDatabaseWriter(connection, ef_timestamp(moment))
+        seen_ids = set()
+        for file_name, action in seed_files:
+            if action is None or not validate_for_import(action) or action.get('id') in seen_ids:
+                skipped.append(file_name)
+                continue
+            seen_ids.add(action['id'])
+            writer.add_action(action)
+        for batch in batches:
+            writer.add_batch(batch)
+        writer.flush()
+        for statement in INDEXES.strip().split(';'):
+            if statement.strip():
+                connection.execute(statement)
+        if search:
+            for statement in SEARCH_FILL:
+                connection.execute(statement)
+        info = {
+            'schemaVersion': SCHEMA_VERSION,
+            'builtAt': moment.isoformat(timespec='seconds'),
+            'actions': writer.counts['Actions'],
+            'batches': writer.counts['CommandBatches'],
+        }
+        connection.executemany('INSERT INTO SeedInfo VALUES (?, ?)', [(k, str(v)) for k, v in info.items()])
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        connection.execute('VACUUM')
+    except BaseException:
+        connection.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    connection.close()
+    os.replace(tmp_path, output)
+
+    return {
+        'output': str(output),
+        'rows': writer.counts,
+        'skipped': skipped,
+        'seconds': round(time.perf_counter() - started, 3),
+        'bytes': output.stat().st_size,
+    }
+
+
+def print_summary(summary: Dict[str, Any]):
+    rows = summary['rows']
+    print(f"✅ Base générée : {summary['output']}")
+    print(f"   Actions   : {rows['Actions']} ({len(summary['skipped'])} ignorées)")
+    print(f"   Templates : {rows['CommandTemplates']}")
+    print(f"   Exemples  : {rows['ActionExamples']}")
+    print(f"   Lots      : {rows['CommandBatches']}")
+    print(f"   Durée     : {summary['seconds']:.3f}s")
+    print(f"   Taille    : {summary['bytes'] / 1024:.1f} KB")
+    for file_name in summary['skipped'][:10]:
+        print(f"   ⚠️  Ignoré : {file_name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile le corpus en base SQLite prête à livrer")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--batches', type=Path, default=BATCHES_FILE)
+    parser.add_argument('--no-search', action='store_true', help="Sans les tables de recherche FTS5")
+    args = parser.parse_args()
+
+    batches = load_batches(args.batches) if args.batches.exists() else []
+    summary = build_seed_db(args.output, iter_seed_files(args.actions_dir), batches, search=not args.no_search)
+    print_summary(summary)
+
+
+if __name__ == '__main__':
+    main()
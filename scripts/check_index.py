@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Consistency check for data/seed/actions and its _index.json.
+
+One incremental scan (through the lazy_corpus catalog) checks that:
+- every index entry has a file and every file is listed, with the same case;
+- the index has no duplicates and totalActions matches;
+- each file is named after its action id, and ids are unique;
+- windowsCommandTemplateId / linuxCommandTemplateId match the id of the
+  embedded template.
+
+--fix rewrites _index.json when needed: existing entries keep their
+position (with the file's id casing), entries without a file are dropped
+and unlisted files are appended. The manifest (seed_manifest.py) is
+refreshed afterwards if there is one. File names and template ids are
+never changed automatically.
+
+Usage:
+    python scripts/check_index.py
+    python scripts/check_index.py --fix
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from lazy_corpus import ENTRY_ID, ENTRY_TEMPLATES, ActionCatalog
+from seed_corpus import ACTIONS_DIR, INDEX_FILE_NAME, dumps_action, write_text_atomic
+from seed_manifest import MANIFEST_FILE_NAME, update_manifest
+
+TEMPLATE_FIELDS = ('windowsCommandTemplateId', 'linuxCommandTemplateId')
+
+
+def check_corpus(actions_dir: Path = ACTIONS_DIR) -> Tuple[List[str], List[str], Dict[str, Any]]:
+    """Return (errors fixed by --fix, other errors, index as it should be)."""
+    actions_dir = Path(actions_dir)
+    catalog = ActionCatalog.load(actions_dir, refresh=True)
+    with open(actions_dir / INDEX_FILE_NAME, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    fixable, errors = [], []
+    by_id: Dict[str, str] = {}
+    by_casefold: Dict[str, str] = {}
+    for stem in sorted(catalog.entries):
+        entry = catalog.entries[stem]
+        action_id = entry[ENTRY_ID]
+        if action_id != stem:
+            errors.append(f"{stem}.json: le nom du fichier ne correspond pas à l'id '{action_id}'")
+        if action_id in by_id:
+            errors.append(f"{stem}.json: id '{action_id}' déjà utilisé par {by_id[action_id]}.json")
+            continue
+        by_id[action_id] = stem
+        by_casefold.setdefault(action_id.casefold(), action_id)
+        templates = entry[ENTRY_TEMPLATES]
+        for field, (declared, embedded) in zip(TEMPLATE_FIELDS, (templates[0:2], templates[2:4])):
+            if declared != embedded:
+                errors.append(f"{stem}.json: {field} = {declared!r} mais le template a l'id {embedded!r}")
+
+    ordered: List[str] = []
+    listed = set()
+    for position, listed_id in enumerate(index.get('actions', [])):
+        action_id = listed_id if listed_id in by_id else by_casefold.get(listed_id.casefold())
+        if action_id is None:
+            fixable.append(f"index[{position}]: '{listed_id}' n'a pas de fichier")
+            continue
+        if action_id != listed_id:
+            fixable.append(f"index[{position}]: '{listed_id}' au lieu de '{action_id}'")
+        if action_id in listed:
+            fixable.append(f"index[{position}]: '{action_id}' en double")
+            continue
+        listed.add(action_id)
+        ordered.append(action_id)
+    for action_id in sorted(set(by_id) - listed):
+        fixable.append(f"{by_id[action_id]}.json: absent de l'index")
+        ordered.append(action_id)
+
+    if index.get('totalActions') != len(ordered):
+        fixable.append(f"totalActions = {index.get('totalActions')} au lieu de {len(ordered)}")
+
+    expected = dict(index)
+    expected['totalActions'] = len(ordered)
+    expected['actions'] = ordered
+    return fixable, errors, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie la cohérence de _index.json et des fichiers d'actions")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--fix', action='store_true', help="Réécrit _index.json si nécessaire")
+    parser.add_argument('--quiet', action='store_true', help="N'affiche que le résumé")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fixable, errors, expected = check_corpus(args.actions_dir)
+
+    if args.fix and fixable:
+        write_text_atomic(args.actions_dir / INDEX_FILE_NAME, dumps_action(expected))
+        if (args.actions_dir / MANIFEST_FILE_NAME).exists():
+            update_manifest(args.actions_dir)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if not args.quiet:
+        prefix = "🔧" if args.fix else "❌"
+        for problem in fixable:
+            print(f"{prefix} {problem}")
+        for problem in errors:
+            print(f"❌ {problem}")
+
+    if args.fix and fixable:
+        print(f"💾 {INDEX_FILE_NAME} réécrit ({len(fixable)} corrections, {expected['totalActions']} actions)")
+    remaining = len(errors) + (0 if args.fix else len(fixable))
+    if remaining:
+        print(f"❌ {remaining} problème(s) ({elapsed:.1f} ms)")
+        sys.exit(1)
+    print(f"✅ Index cohérent: {expected['totalActions']} actions ({elapsed:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Asynchronous check of the documentation links of the corpus.
+
+Collects the unique URLs of every action's links, then checks them with
+asyncio over a small HTTP/1.1 client (standard library only):
+- HEAD first, GET when the server refuses HEAD (403, 405, 501), redirects
+  followed up to MAX_REDIRECTS;
+- keep-alive connections pooled per scheme/host/port and reused across
+  requests, at most --per-host requests in flight per host and
+  --concurrency overall;
+- a timeout per attempt and --retries retries with exponential backoff on
+  network errors, timeouts, 429 and 5xx.
+
+Results are cached in data/seed/_link_cache.json with a TTL (--ttl hours
+for working links, FAILURE_TTL for the others), so a re-run only checks
+new or expired URLs. A link is dead on 404 / 410, or when its host is
+unknown while other host names did resolve during the same run (offline,
+every lookup fails). Other failures (timeouts, 403, 5xx, TLS errors...) are
+reported as errors, since they are often transient or caused by bot
+protection; DNS failures are never cached. Dead links are listed per
+action; the exit code is 1 when there is any.
+
+--self-test checks the client against an in-process http.server (200, 404,
+410, redirects, a redirect loop, a server refusing HEAD, a flaky 503) and
+its connection reuse, without network access.
+
+Usage:
+    python scripts/check_links.py
+    python scripts/check_links.py --per-host 2 --timeout 5 --json links.json
+    python scripts/check_links.py --self-test
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import socket
+import ssl
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+from corpus_client import load_actions
+from seed_corpus import ACTIONS_DIR, SEED_DIR, write_text_atomic
+
+CACHE_FILE = SEED_DIR / '_link_cache.json'
+CACHE_VERSION = 2
+DEFAULT_TTL_HOURS = 7 * 24
+FAILURE_TTL = 24 * 3600
+CONCURRENCY = 32
+PER_HOST = 4
+TIMEOUT = 10.0
+RETRIES = 2
+BACKOFF = 0.5
+MAX_REDIRECTS = 5
+USER_AGENT = 'TwinShell-LinkChecker/1.0'
+
+DEAD_STATUSES = {404, 410}
+# Servers that do not implement HEAD, or forbid it, are asked again with GET
+HEAD_FALLBACK = {403, 405, 501}
+REDIRECTS = {301, 302, 303, 307, 308}
+# GET bodies up to this size are read so the connection can be reused
+MAX_DRAINED_BODY = 256 * 1024
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class HttpError(Exception):
+    """Malformed or unexpected HTTP response."""
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def collect_links(actions: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """{url: [action ids]} in first-seen order."""
+    links: Dict[str, List[str]] = {}
+    for action in actions:
+        for link in action.get('links') or []:
+            url = (link.get('url') or '').strip() if isinstance(link, dict) else ''
+            if url:
+                ids = links.setdefault(url, [])
+                if action.get('id', '') not in ids:
+                    ids.append(action.get('id', ''))
+    return links
+
+
+class ConnectionPool:
+    """Idle keep-alive connections and a concurrency limit per (scheme, host, port)."""
+
+    def __init__(self, per_host: int = PER_HOST, ssl_context: Optional[ssl.SSLContext] = None):
+        self.per_host = per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = defaultdict(list)
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self.opened = 0
+        self.reused = 0
+        # Host names (not IP literals) connected to: proof that name resolution works
+        self.resolved: Set[str] = set()
+
+    def limit(self, key: Tuple[str, str, int]) -> asyncio.Semaphore:
+        semaphore = self._limits.get(key)
+        if semaphore is None:
+            semaphore = self._limits[key] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def acquire(self, key: Tuple[str, str, int]) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """(reader, writer, reused) for key: an idle connection, else a new one."""
+        idle = self._idle[key]
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                self.reused += 1
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self.ssl_context if scheme == 'https' else None,
+            server_hostname=host if scheme == 'https' else None)
+        self.opened += 1
+        if not is_ip_address(host):
+            self.resolved.add(host)
+        return reader, writer, False
+
+    def release(self, key: Tuple[str, str, int], reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                reusable: bool):
+        if reusable and len(self._idle[key]) < self.per_host:
+            self._idle[key].append((reader, writer))
+        else:
+            writer.close()
+
+    async def close(self):
+        writers = [writer for idle in self._idle.values() for _, writer in idle]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bool]:
+    """(status, headers, keep-alive) of the next final response, its body left unread."""
+    while True:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connexion fermée avant la réponse")
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+            raise HttpError(f"ligne de statut invalide: {status_line[:80]!r}")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        status = int(parts[1])
+        if 100 <= status < 200:
+            continue
+        keep_alive = parts[0] == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        return status, headers, keep_alive
+
+
+async def _drain_body(reader: asyncio.StreamReader, method: str, status: int, headers: Dict[str, str]) -> bool:
+    """Skip the response body; False when the connection cannot be reused."""
+    if method == 'HEAD' or status in (204, 304):
+        return True
+    length = headers.get('content-length')
+    if 'chunked' in headers.get('transfer-encoding', '').lower() or length is None or not length.isdigit():
+        return False
+    if int(length) > MAX_DRAINED_BODY:
+        return False
+    await reader.readexactly(int(length))
+    return True
+
+
+class LinkChecker:
+    """Checks URLs concurrently, with pooled connections, retries and a TTL cache."""
+
+    def __init__(self, concurrency: int = CONCURRENCY, per_host: int = PER_HOST, timeout: float = TIMEOUT,
+                 retries: int = RETRIES, ttl: float = DEFAULT_TTL_HOURS * 3600,
+                 cache: Optional[Dict[str, Dict[str, Any]]] = None, backoff: float = BACKOFF):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.ttl = ttl
+        self.backoff = backoff
+        self.cache = cache if cache is not None else {}
+        self.requests = 0
+        self.from_cache = 0
+        self.pool: Optional[ConnectionPool] = None
+
+    def cached(self, url: str, now: float) -> Optional[Dict[str, Any]]:
+        result = self.cache.get(url)
+        if result is None:
+            return None
+        ttl = self.ttl if result.get('ok') else min(self.ttl, FAILURE_TTL)
+        return result if now - result.get('checkedAt', 0) < ttl else None
+
+    async def _request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise HttpError(f"URL non prise en charge: {url}")
+        host = parts.hostname.encode('idna').decode('ascii')
+        port = parts.port or DEFAULT_PORTS[scheme]
+        key = (scheme, host, port)
+        path = quote(parts.path or '/', safe="/%:@!$&'()*+,;=~-._")
+        if parts.query:
+            path += '?' + quote(parts.query, safe="/%:@!$&'()*+,;=~-._?")
+        host_header = host if port == DEFAULT_PORTS[scheme] else f"{host}:{port}"
+        request = (f"{method} {path} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nConnection: keep-alive\r\n\r\n").encode('ascii')
+
+        async with self.pool.limit(key):
+            while True:
+                reader, writer, reused = await self.pool.acquire(key)
+                self.requests += 1
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers, keep_alive = await _read_response(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        # The server closed the idle connection: not a failure of the link
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                try:
+                    reusable = keep_alive and await _drain_body(reader, method, status, headers)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    reusable = False
+                except BaseException:
+                    writer.close()
+                    raise
+                self.pool.release(key, reader, writer, reusable)
+                return status, headers
+
+    async def _follow(self, url: str) -> Dict[str, Any]:
+        method = 'HEAD'
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await self._request(method, url)
+            if status in REDIRECTS and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            if method == 'HEAD' and status in HEAD_FALLBACK:
+                method = 'GET'
+                status, headers = await self._request(method, url)
+                if status in REDIRECTS and headers.get('location'):
+                    url = urljoin(url, headers['location'])
+                    continue
+            return {'status': status, 'finalUrl': url}
+        raise HttpError(f"plus de {MAX_REDIRECTS} redirections")
+
+    async def check(self, url: str) -> Dict[str, Any]:
+        """Result for url: status, final URL, ok / dead flags, error and attempts."""
+        now = time.time()
+        cached = self.cached(url, now)
+        if cached is not None:
+            self.from_cache += 1
+            return cached
+        result: Dict[str, Any] = {}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = await asyncio.wait_for(self._follow(url), self.timeout)
+                status = response['status']
+                result = {'status': status, 'finalUrl': response['finalUrl'], 'error': None,
+                          'ok': status < 400, 'dead': status in DEAD_STATUSES}
+                if status != 429 and status < 500:
+                    break
+            except asyncio.TimeoutError:
+                result = {'status': None, 'error': f"délai dépassé ({self.timeout:g}s)", 'ok': False, 'dead': False}
+            except socket.gaierror as e:
+                # Offline, every lookup fails with EAI_NONAME too: check_all() only
+                # calls the link dead once another host name has resolved.
+                unknown = e.errno == socket.EAI_NONAME
+                error = f"hôte inconnu ({e.strerror})" if unknown else f"résolution DNS impossible ({e.strerror})"
+                result = {'status': None, 'error': error, 'ok': False, 'dead': False, 'dns': True,
+                          'unknownHost': unknown}
+            except HttpError as e:
+                result = {'status': None, 'error': str(e), 'ok': False, 'dead': False}
+                break
+            except (OSError, ssl.SSLError, asyncio.IncompleteReadError) as e:
+                result = {'status': None, 'error': f"{type(e).__name__}: {e}", 'ok': False, 'dead': False}
+        result['attempts'] = attempt + 1
+        result['checkedAt'] = time.time()
+        if not result.get('dns'):
+            self.cache[url] = result
+        return result
+
+    async def check_all(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        self.pool = ConnectionPool(self.per_host)
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with limit:
+                return url, await self.check(url)
+
+        try:
+            results = dict(await asyncio.gather(*(bounded(url) for url in urls)))
+        finally:
+            await self.pool.close()
+        if self.pool.resolved:
+            for result in results.values():
+                if result.get('unknownHost'):
+                    result['dead'] = True
+        return results
+
+    def run(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return asyncio.run(self.check_all(urls))
+
+
+def load_cache(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('results', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(path: Path, results: Dict[str, Dict[str, Any]]):
+    write_text_atomic(path, json.dumps({'version': CACHE_VERSION, 'results': results},
+                                       ensure_ascii=False, separators=(',', ':')))
+
+
+def report_by_action(links: Dict[str, List[str]], results: Dict[str, Dict[str, Any]]
+                     ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """{action id: {'dead': [...], 'errors': [...]}} for the actions with failing links."""
+    by_action: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for url, action_ids in links.items():
+        result = results[url]
+        if result['ok']:
+            continue
+        kind = 'dead' if result['dead'] else 'errors'
+        entry = {'url': url, 'status': result['status'], 'error': result['error']}
+        for action_id in action_ids:
+            by_action.setdefault(action_id, {'dead': [], 'errors': []})[kind].append(entry)
+    return dict(sorted(by_action.items()))
+
+
+class _TestHandler(BaseHTTPRequestHandler):
+    """Routes of the --self-test server; every response keeps the connection alive."""
+
+    protocol_version = 'HTTP/1.1'
+    flaky_calls = 0
+    lock = threading.Lock()
+
+    def _respond(self, status: int, location: Optional[str] = None):
+        body = f"{status}\n".encode('ascii')
+        self.send_response(status)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self.path == '/no-head' and self.command == 'HEAD':
+            self._respond(405)
+        elif self.path == '/flaky':
+            with self.lock:
+                type(self).flaky_calls += 1
+                first = type(self).flaky_calls == 1
+            self._respond(503 if first else 200)
+        elif self.path == '/redirect':
+            self._respond(301, '/ok')
+        elif self.path == '/loop':
+            self._respond(302, '/loop')
+        else:
+            self._respond({'/missing': 404, '/gone': 410}.get(self.path, 200))
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+def self_test() -> List[str]:
+    """Check the client against a local server; return the failed expectations."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _TestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://localhost:{server.server_address[1]}"
+    unknown = 'http://twinshell-link-check.invalid/'
+    problems = []
+
+    def expect(condition: bool, message: str):
+        if not condition:
+            problems.append(message)
+
+    try:
+        # Alone, an unknown host says nothing about the link: no name resolved at all
+        checker = LinkChecker(concurrency=1, per_host=1, timeout=5, retries=1, backoff=0.01)
+        result = checker.run([unknown])[unknown]
+        expect(not result['ok'] and not result['dead'] and result['attempts'] == 2,
+               f"hôte inconnu seul: {result}")
+        expect(unknown not in checker.cache, "échec DNS mis en cache")
+
+        checker = LinkChecker(concurrency=1, per_host=1, timeout=5, retries=1, backoff=0.01)
+        routes = ['/ok', '/missing', '/gone', '/redirect', '/loop', '/no-head', '/flaky']
+        results = checker.run([base + route for route in routes] + [unknown])
+        expected = {
+            '/ok': (200, True, False),
+            '/missing': (404, False, True),
+            '/gone': (410, False, True),
+            '/redirect': (200, True, False),
+            '/loop': (None, False, False),
+            '/no-head': (200, True, False),
+            '/flaky': (200, True, False),
+        }
+        for route, (status, ok, dead) in expected.items():
+            result = results[base + route]
+            expect((result['status'], result['ok'], result['dead']) == (status, ok, dead), f"{route}: {result}")
+        expect(results[base + '/redirect']['finalUrl'] == base + '/ok', f"/redirect: {results[base + '/redirect']}")
+        expect('redirections' in (results[base + '/loop']['error'] or ''), f"/loop: {results[base + '/loop']}")
+        expect(results[base + '/flaky']['attempts'] == 2, f"/flaky: {results[base + '/flaky']}")
+        expect(results[unknown]['dead'], f"hôte inconnu avec un autre hôte résolu: {results[unknown]}")
+        expect(unknown not in checker.cache, "échec DNS mis en cache")
+        # 1 + 1 + 1 + 2 (redirect) + 6 (loop) + 2 (HEAD, GET) + 2 (503, retry), all on one connection
+        expect(checker.requests == 15, f"{checker.requests} requêtes au lieu de 15")
+        expect((checker.pool.opened, checker.pool.reused) == (1, 14),
+               f"{checker.pool.opened} connexion(s) ouverte(s), {checker.pool.reused} réutilisée(s) au lieu de 1 et 14")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie les liens de documentation des actions")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help="Requêtes simultanées au total")
+    parser.add_argument('--per-host', type=int, default=PER_HOST, help="Requêtes simultanées par hôte")
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help="Délai par tentative, en secondes")
+    parser.add_argument('--retries', type=int, default=RETRIES)
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL_HOURS,
+                        help="Durée de validité du cache pour les liens valides, en heures")
+    parser.add_argument('--cache', type=Path, default=CACHE_FILE, metavar='FICHIER')
+    parser.add_argument('--no-cache', action='store_true', help="Ignore et ne met pas à jour le cache")
+    parser.add_argument('--errors', action='store_true', help="Liste aussi les liens en erreur (non morts)")
+    parser.add_argument('--json', type=Path, metavar='FICHIER', help="Écrit le rapport par action en JSON")
+    parser.add_argument('--self-test', action='store_true', help="Vérifie le client contre un serveur HTTP local")
+    args = parser.parse_args()
+
+    if args.self_test:
+        problems = self_test()
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ Auto-test réussi")
+        return
+
+    links = collect_links(load_actions(args.actions_dir))
+    cache = {} if args.no_cache else load_cache(args.cache)
+    checker = LinkChecker(args.concurrency, args.per_host, args.timeout, args.retries, args.ttl * 3600, cache)
+
+    started = time.perf_counter()
+    results = checker.run(links)
+    elapsed = time.perf_counter() - started
+    if not args.no_cache:
+        save_cache(args.cache, {url: result for url, result in cache.items() if url in links})
+
+    by_action = report_by_action(links, results)
+    for action_id, failures in by_action.items():
+        shown = failures['dead'] + (failures['errors'] if args.errors else [])
+        if not shown:
+            continue
+        print(f"{'❌' if failures['dead'] else '⚠️ '} {action_id}")
+        for entry in shown:
+            print(f"   {entry['status'] or entry['error']}  {entry['url']}")
+
+    dead = sum(1 for r in results.values() if r['dead'])
+    errors = sum(1 for r in results.values() if not r['ok'] and not r['dead'])
+    print(f"🔗 {sum(len(ids) for ids in links.values())} liens, {len(links)} URLs distinctes "
+          f"({checker.from_cache} depuis le cache) vérifiées en {elapsed:.2f}s")
+    print(f"   {len(links) - dead - errors} valides, {dead} morts, {errors} en erreur; "
+          f"{checker.requests} requêtes, {checker.pool.opened} connexions ouvertes, "
+          f"{checker.pool.reused} réutilisées")
+    if args.json:
+        write_text_atomic(args.json, json.dumps({'elapsedSeconds': round(elapsed, 3), 'actions': by_action},
+                                                ensure_ascii=False, indent=2))
+        print(f"💾 Rapport: {args.json}")
+    if dead:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shell syntax check for the Linux commands of the corpus.
+
+Collects every Linux command: linuxExamples, examples marked platform 1
+(or unmarked examples of Linux-only actions), linuxCommandTemplate patterns
+and the Linux entries of EMERGENCY_KITS. Placeholders ("<name>" in
+examples, "{name}" in templates) are replaced by plain dummy words, then
+each command is checked with `bash -n` on a bounded pool of worker threads,
+each running its own bash subprocess.
+
+Results are cached by SHA-256 of the checked text (and bash version) in
+data/seed/_shell_syntax_cache.json, so only new or edited commands are
+re-checked.
+
+Usage:
+    python scripts/check_shell_syntax.py
+    python scripts/check_shell_syntax.py --workers 16 --no-cache
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from command_templates import parse
+from enrich_emergency_context import EMERGENCY_KITS
+from corpus_client import load_actions
+from seed_corpus import ACTIONS_DIR, SEED_DIR, write_text_atomic
+
+CACHE_FILE = SEED_DIR / '_shell_syntax_cache.json'
+BASH = 'bash'
+LINUX = 1
+
+# "<name>" placeholders used in examples; "< file" (redirection), "<<EOF" and "<(...)" do not match
+_ANGLE_PLACEHOLDER = re.compile(r"<([^\W\d][\w.:/-]*)>")
+_NON_WORD = re.compile(r"\W+")
+
+# (source, location, original command)
+Command = Tuple[str, str, str]
+
+
+def dummy(name: str) -> str:
+    return 'dummy_' + _NON_WORD.sub('_', name).strip('_')
+
+
+def substitute_placeholders(command: str) -> str:
+    command = _ANGLE_PLACEHOLDER.sub(lambda m: dummy(m.group(1)), command)
+    parsed = parse(command)
+    return parsed.render({}, missing='dummy_{name}') if parsed.slots else command
+
+
+def iter_linux_commands(actions: Iterable[Dict[str, Any]]) -> Iterator[Command]:
+    for action in actions:
+        action_id = action.get('id', '')
+        linux_only = action.get('platform') == LINUX
+        for position, example in enumerate(action.get('examples') or []):
+            platform = example.get('platform')
+            if platform == LINUX or (platform is None and linux_only):
+                yield action_id, f"examples[{position}]", example.get('command', '')
+        for position, example in enumerate(action.get('linuxExamples') or []):
+            yield action_id, f"linuxExamples[{position}]", example.get('command', '')
+        template = action.get('linuxCommandTemplate')
+        if isinstance(template, dict) and template.get('commandPattern'):
+            yield action_id, 'linuxCommandTemplate.commandPattern', template['commandPattern']
+
+
+def iter_kit_commands() -> Iterator[Command]:
+    for kit, examples in EMERGENCY_KITS.items():
+        for position, example in enumerate(examples):
+            if example.get('platform') == LINUX:
+                yield f"EMERGENCY_KITS[{kit!r}]", f"[{position}]", example.get('command', '')
+
+
+def bash_version() -> str:
+    result = subprocess.run([BASH, '-c', 'echo "$BASH_VERSION"'], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def check_syntax(script: str) -> Optional[str]:
+    """Run `bash -n` on script; return the error message, or None when it parses."""
+    result = subprocess.run([BASH, '-n'], input=script, capture_output=True, text=True)
+    if result.returncode == 0:
+        return None
+    # bash echoes the offending line after the message; the report prints the command itself
+    message = result.stderr.strip().splitlines()
+    return message[0].replace('bash: ', '', 1) if message else f"code de sortie {result.returncode}"
+
+
+def load_cache(path: Path, version: str) -> Dict[str, Optional[str]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('results', {}) if data.get('bash') == version else {}
+
+
+def save_cache(path: Path, version: str, results: Dict[str, Optional[str]]):
+    write_text_atomic(path, json.dumps({'bash': version, 'results': results}, separators=(',', ':')))
+
+
+def check_commands(commands: List[Command], workers: int = 0, cache_path: Optional[Path] = CACHE_FILE
+                   ) -> Tuple[List[Tuple[Command, str]], Dict[str, int]]:
+    """Return ([(command, error)], stats) for the commands that do not parse."""
+    version = bash_version()
+    cache = load_cache(cache_path, version) if cache_path else {}
+    scripts = {}
+    keys = []
+    for _, _, command in commands:
+        script = substitute_placeholders(command)
+        key = hashlib.sha256(script.encode('utf-8')).hexdigest()
+        keys.append(key)
+        if key not in cache:
+            scripts[key] = script
+
+    workers = workers or min(32, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, error in zip(scripts, pool.map(check_syntax, scripts.values())):
+            cache[key] = error
+
+    if cache_path and scripts:
+        used = set(keys)
+        save_cache(cache_path, version, {k: v for k, v in cache.items() if k in used})
+
+    failures = [(command, cache[key]) for command, key in zip(commands, keys) if cache[key] is not None]
+    stats = {'commands': len(commands), 'unique': len(set(keys)), 'checked': len(scripts)}
+    return failures, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie la syntaxe bash des commandes Linux du corpus")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--workers', type=int, default=0, help="Processus bash simultanés (0 = automatique)")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore et ne met pas à jour le cache")
+    parser.add_argument('--no-kits', action='store_true', help="Ne vérifie pas EMERGENCY_KITS")
+    args = parser.parse_args()
+
+    commands = list(iter_linux_commands(load_actions(args.actions_dir)))
+    if not args.no_kits:
+        commands.extend(iter_kit_commands())
+
+    started = time.perf_counter()
+    failures, stats = check_commands(commands, args.workers, None if args.no_cache else CACHE_FILE)
+    elapsed = time.perf_counter() - started
+
+    current = None
+    for (source, location, command), error in failures:
+        if source != current:
+            print(f"❌ {source}")
+            current = source
+        print(f"   {location}: {error}")
+        print(f"      {command}")
+
+    print(f"📊 {stats['commands']} commandes Linux ({stats['unique']} distinctes, {stats['checked']} vérifiées) "
+          f"en {elapsed:.2f}s: {len(failures)} erreur(s) de syntaxe")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal making long enrichment / migration runs resumable.
+
+Scripts expose it through add_checkpoint_arguments() / journal_from_args():
+
+    python enrich_examples_v2.py                    # journals as it goes
+    python enrich_examples_v2.py --resume           # after a crash: skips finished actions
+    python migrate_to_unified.py --resume --checkpoint-every 20
+
+Each finished unit of work (an action, a pair of actions) is recorded in
+<output>.journal, one JSON line per unit: its key, its output and a few
+counters needed to rebuild the run's statistics. Lines are kept in memory
+and appended in one write, then fsynced, every --checkpoint-every units
+and when the run stops, even on an exception: a run adds one file and one
+write per checkpoint, whatever the number of units. A unit whose line was
+lost, cut by a crash or is unreadable is simply done again.
+
+The journal starts with the script name and the SHA-256 of the input file:
+--resume refuses a journal written for another input. Once the final
+output has been written atomically, the journal is removed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+JOURNAL_VERSION = 2
+DEFAULT_EVERY = 100
+
+
+class CheckpointError(Exception):
+    pass
+
+
+class JournalEntry(NamedTuple):
+    output: Any
+    data: Dict[str, Any]
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunJournal:
+    """Journal of the finished units of one run, and their outputs."""
+
+    def __init__(self, output: Path, run: Dict[str, Any], every: int = DEFAULT_EVERY):
+        output = Path(output)
+        self.path = output.with_name(output.name + '.journal')
+        self.run = run
+        self.every = max(1, every)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.restored = 0
+        self.redone = 0
+        self._pending: List[str] = []
+        self._file = None
+
+    @classmethod
+    def open(cls, output: Path, run: Dict[str, Any], resume: bool = False,
+             every: int = DEFAULT_EVERY) -> 'RunJournal':
+        """Journal for output; with resume, the finished units of the previous run are kept."""
+        journal = cls(output, run, every)
+        resumed = resume and journal.path.exists()
+        if resumed:
+            journal._load()
+        else:
+            journal.discard()
+        journal._file = open(journal.path, 'a', encoding='utf-8')
+        if not resumed:
+            journal._file.write(json.dumps({'journal': JOURNAL_VERSION, **run}, ensure_ascii=False) + '\n')
+            journal._sync()
+        return journal
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        # Drop a line cut by the crash, so that new lines start on their own
+        complete = content.rfind(b'\n') + 1
+        if complete < len(content):
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+        lines = content[:complete].decode('utf-8', errors='replace').split('\n')[:-1]
+        try:
+            header = json.loads(lines[0])
+        except (ValueError, IndexError):
+            raise CheckpointError(f"{self.path}: en-tête illisible") from None
+        if header != {'journal': JOURNAL_VERSION, **self.run}:
+            raise CheckpointError(f"{self.path}: journal d'une autre exécution ou d'une autre entrée "
+                                  f"(relancer sans --resume)")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                self.entries[entry['key']] = entry
+            except (ValueError, KeyError, TypeError):
+                # Its unit is not restored, so it is done again
+                self.redone += 1
+
+    def restore(self, key: str) -> Optional[JournalEntry]:
+        """Output and data of a unit finished by a previous run, or None when it must be done."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.restored += 1
+        return JournalEntry(entry.get('output'), entry.get('data', {}))
+
+    def record(self, key: str, output: Any = None, **data):
+        """Journal the output of a finished unit (None when it has none)."""
+        entry = {'key': key}
+        if output is not None:
+            entry['output'] = output
+        if data:
+            entry['data'] = data
+        self._pending.append(json.dumps(entry, ensure_ascii=False))
+        if len(self._pending) >= self.every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write and fsync the journal lines of the units finished since the last checkpoint."""
+        if self._file is None or not self._pending:
+            return
+        self._file.write('\n'.join(self._pending) + '\n')
+        self._pending.clear()
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Remove the journal (after the final output has been written)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._pending.clear()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'RunJournal':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def add_checkpoint_arguments(parser):
+    group = parser.add_argument_group('reprise')
+    group.add_argument('--resume', action='store_true',
+                       help="Reprend l'exécution interrompue à partir de son journal")
+    group.add_argument('--checkpoint-every', type=int, default=DEFAULT_EVERY, metavar='N',
+                       help=f"Écrit le journal toutes les N unités terminées (défaut: {DEFAULT_EVERY})")
+    return parser
+
+
+def journal_from_args(args, script: str, input_path: Path, output_path: Path) -> RunJournal:
+    """Journal of output_path, resumed with --resume when it was written for the same input."""
+    run = {'script': script, 'input': file_sha256(input_path)}
+    journal = RunJournal.open(output_path, run, resume=args.resume, every=args.checkpoint_every)
+    if args.resume:
+        print(f"🔄 Reprise: {len(journal.entries)} unité(s) terminée(s) dans {journal.path}"
+              + (f", {journal.redone} ligne(s) illisible(s) à refaire" if journal.redone else ''))
+    return journal
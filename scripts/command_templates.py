@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Command template engine for the seed corpus.
+
+A commandPattern such as "Get-ADUser -Identity {userName} -Properties *"
+is split once into literal and placeholder segments; rendering fills the
+placeholder slots and joins the segments in a single pass. Parsed patterns
+are cached, so rendering every template of the corpus parses each distinct
+pattern once.
+
+Value resolution follows CommandGeneratorService.GenerateCommand: a
+supplied value, else the parameter's defaultValue, else an empty string
+(or the `missing` format, e.g. "<{name}>" for previews, when a value is
+empty). Placeholders that
+are not declared parameters are left as-is. Values are not shell-quoted:
+the app quotes string and path values at execution time.
+
+Usage:
+    python scripts/command_templates.py ad-search-user
+    python scripts/command_templates.py --check
+"""
+
+import argparse
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from corpus_client import load_actions
+from seed_corpus import ACTIONS_DIR
+
+PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+TEMPLATE_KEYS = ('windowsCommandTemplate', 'linuxCommandTemplate')
+
+
+class ParsedTemplate:
+    """A commandPattern split into literal segments and placeholder slots."""
+
+    __slots__ = ('pattern', 'parts', 'slots', 'names')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        # re.split with a capturing group: literals at even indexes, names at odd ones
+        self.parts: List[str] = PLACEHOLDER.split(pattern)
+        self.slots: Tuple[Tuple[int, str], ...] = tuple((i, self.parts[i]) for i in range(1, len(self.parts), 2))
+        self.names = frozenset(name for _, name in self.slots)
+
+    def render(self, values: Mapping[str, str], missing: Optional[str] = None) -> str:
+        """Fill the placeholders found in values.
+
+        Other placeholders are kept verbatim, or replaced by missing (a format
+        string receiving {name}) when it is given.
+        """
+        out = self.parts.copy()
+        for index, name in self.slots:
+            value = values.get(name)
+            if value is not None:
+                out[index] = value
+            elif missing is None:
+                out[index] = '{' + name + '}'
+            else:
+                out[index] = missing.format(name=name)
+        return ''.join(out)
+
+    def __repr__(self):
+        return f"ParsedTemplate({self.pattern!r})"
+
+
+@lru_cache(maxsize=4096)
+def parse(pattern: str) -> ParsedTemplate:
+    return ParsedTemplate(pattern)
+
+
+def _parameters(template: Any) -> List[Dict[str, Any]]:
+    params = template.get('parameters') if isinstance(template, dict) else None
+    return [p for p in params or [] if isinstance(p, dict) and p.get('name')]
+
+
+def default_values(template: Dict[str, Any]) -> Dict[str, str]:
+    """Same as CommandGeneratorService.GetDefaultParameterValues."""
+    return {p['name']: p['defaultValue'] for p in _parameters(template) if p.get('defaultValue')}
+
+
+def render_template(template: Dict[str, Any], values: Optional[Mapping[str, str]] = None,
+                    missing: str = '') -> str:
+    """Render a template the way the app does, defaults included."""
+    parsed = parse(template.get('commandPattern') or '')
+    if not parsed.slots:
+        return parsed.pattern
+    bound = {}
+    for param in template.get('parameters') or ():
+        name = param.get('name')
+        value = values.get(name) if values else None
+        if value is None:
+            value = param.get('defaultValue')
+        # The app substitutes '' for a parameter without value; previews show missing instead
+        bound[name] = value if value else missing.format(name=name)
+    return parsed.render(bound)
+
+
+def unbound_required(template: Dict[str, Any], values: Optional[Mapping[str, str]] = None) -> List[str]:
+    """Required parameters with neither a supplied value nor a default (ValidateParameters)."""
+    result = []
+    for param in _parameters(template):
+        if not param.get('required'):
+            continue
+        value = values.get(param['name']) if values else None
+        if value is None:
+            value = param.get('defaultValue')
+        if value is None or not str(value).strip():
+            result.append(param['name'])
+    return result
+
+
+def undeclared_placeholders(template: Dict[str, Any]) -> List[str]:
+    declared = {p['name'] for p in _parameters(template)}
+    return sorted(parse(template.get('commandPattern') or '').names - declared)
+
+
+def iter_templates(actions: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """(action id, template key, template) for every template of the corpus."""
+    for action in actions:
+        for key in TEMPLATE_KEYS:
+            template = action.get(key)
+            if isinstance(template, dict):
+                yield action.get('id', ''), key, template
+
+
+def render_all(actions: Iterable[Dict[str, Any]], values: Optional[Mapping[str, str]] = None,
+               missing: str = '<{name}>') -> Iterator[Tuple[str, str, str, List[str]]]:
+    """Bulk preview: (action id, template key, command, unbound required parameters)."""
+    for action_id, key, template in iter_templates(actions):
+        yield action_id, key, render_template(template, values, missing), unbound_required(template, values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendu des templates de commandes du corpus")
+    parser.add_argument('ids', nargs='*', help="Actions à afficher (toutes par défaut)")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--set', action='append', default=[], metavar='NOM=VALEUR',
+                        help="Valeur de paramètre (répétable)")
+    parser.add_argument('--check', action='store_true',
+                        help="Signale les paramètres requis sans valeur et les placeholders non déclarés")
+    args = parser.parse_args()
+
+    values = dict(item.split('=', 1) for item in args.set)
+    actions = load_actions(args.actions_dir)
+    if args.ids:
+        wanted = {i.casefold() for i in args.ids}
+        actions = [a for a in actions if a.get('id', '').casefold() in wanted]
+
+    started = time.perf_counter()
+    rendered = list(render_all(actions, values))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    problems = 0
+    for (action_id, key, command, unbound), (_, _, template) in zip(rendered, iter_templates(actions)):
+        if not args.check:
+            print(f"{action_id:<40} {command}")
+            continue
+        undeclared = undeclared_placeholders(template)
+        if unbound:
+            print(f"❌ {action_id} ({key}): paramètres requis sans valeur: {', '.join(unbound)}")
+        if undeclared:
+            print(f"❌ {action_id} ({key}): placeholders non déclarés: {', '.join(undeclared)}")
+        problems += bool(unbound) + bool(undeclared)
+
+    print(f"📊 {len(rendered)} templates rendus en {elapsed:.1f} ms ({parse.cache_info().currsize} motifs distincts)")
+    if args.check and problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
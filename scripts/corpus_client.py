@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Client of corpus_daemon.py, with fallback to direct loading.
+
+Scripts call load_actions() (and audit() for audit_commands.py) instead of
+seed_corpus.load_actions(): when a daemon serves the same actions
+directory, the parsed corpus comes from its memory over the Unix socket;
+otherwise, or when TWINSHELL_NO_DAEMON is set, the files are read as
+before. A daemon found through TWINSHELL_CORPUS_SOCKET may serve another
+directory: its status is checked on connection and such a daemon is not
+used. The daemon checks file signatures before answering, so results are
+never older than the files on disk.
+
+Protocol: one JSON object per line each way,
+{"op": "...", "args": {...}} -> {"ok": true, "result": ...} or
+{"ok": false, "error": "..."}.
+
+Usage:
+    python scripts/corpus_client.py status
+    python scripts/corpus_client.py search '{"query": "ad user"}'
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import seed_corpus
+from seed_corpus import ACTIONS_DIR
+from seed_models import Action
+
+SOCKET_ENV = 'TWINSHELL_CORPUS_SOCKET'
+DISABLE_ENV = 'TWINSHELL_NO_DAEMON'
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 120.0
+
+
+class DaemonError(Exception):
+    """The daemon answered with an error."""
+
+
+def socket_path(actions_dir: Path = ACTIONS_DIR) -> Path:
+    """Socket of the daemon serving actions_dir: $TWINSHELL_CORPUS_SOCKET, or one per user and directory."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    digest = hashlib.sha1(str(Path(actions_dir).resolve()).encode('utf-8')).hexdigest()[:12]
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return Path(tempfile.gettempdir()) / f"twinshell-corpus-{uid}-{digest}.sock"
+
+
+class CorpusClient:
+    """Connection to a running corpus daemon."""
+
+    def __init__(self, path: Path, timeout: float = REQUEST_TIMEOUT):
+        self.path = Path(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            self.sock.connect(str(self.path))
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.settimeout(timeout)
+        self._buffer = bytearray()
+
+    @classmethod
+    def connect(cls, actions_dir: Path = ACTIONS_DIR) -> Optional['CorpusClient']:
+        """Client of the daemon serving actions_dir, or None when there is none (or it is disabled)."""
+        if os.environ.get(DISABLE_ENV) or not hasattr(socket, 'AF_UNIX'):
+            return None
+        path = socket_path(actions_dir)
+        if not path.exists():
+            return None
+        try:
+            client = cls(path)
+        except OSError:
+            return None
+        try:
+            served = Path(client.request('status')['actionsDir']).resolve()
+        except (OSError, ValueError, KeyError, TypeError, DaemonError):
+            client.close()
+            return None
+        if served != Path(actions_dir).resolve():
+            print(f"⚠️  Le démon de {path} sert {served}, pas {Path(actions_dir).resolve()}: chargement direct",
+                  file=sys.stderr)
+            client.close()
+            return None
+        return client
+
+    def request(self, op: str, **args) -> Any:
+        self.sock.sendall(json.dumps({'op': op, 'args': args}).encode('utf-8') + b'\n')
+        while True:
+            end = self._buffer.find(b'\n')
+            if end >= 0:
+                break
+            chunk = self.sock.recv(1 << 20)
+            if not chunk:
+                raise ConnectionError("Connexion fermée par le démon")
+            self._buffer += chunk
+        response = json.loads(self._buffer[:end])
+        del self._buffer[:end + 1]
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'erreur inconnue'))
+        return response.get('result')
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self) -> 'CorpusClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _from_daemon(actions_dir: Path, op: str, **args) -> Tuple[bool, Any]:
+    client = CorpusClient.connect(actions_dir)
+    if client is None:
+        return False, None
+    try:
+        with client:
+            return True, client.request(op, **args)
+    except (OSError, ValueError, DaemonError) as e:
+        print(f"⚠️  Démon du corpus indisponible ({e}), chargement direct", file=sys.stderr)
+        return False, None
+
+
+def load_actions(actions_dir: Path = ACTIONS_DIR, models: bool = False) -> List[Any]:
+    """seed_corpus.load_actions, served by the daemon when one is running."""
+    served, actions = _from_daemon(actions_dir, 'actions')
+    if not served:
+        return seed_corpus.load_actions(actions_dir, models)
+    return [Action.from_dict(a) for a in actions] if models else actions
+
+
+def audit(actions_dir: Path = ACTIONS_DIR) -> Optional[Tuple[Dict[str, Any], Dict[str, List[str]]]]:
+    """(stats, issues) of audit_commands.analyze_actions kept by the daemon, or None without daemon."""
+    served, result = _from_daemon(actions_dir, 'audit')
+    return (result['stats'], result['issues']) if served else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interroge le démon du corpus")
+    parser.add_argument('op', help="status, ids, action, actions, normalized, search, suggest, cooccur, with, audit, stop")
+    parser.add_argument('args', nargs='?', default='{}', help="Arguments JSON, ex. '{\"id\": \"ad-create-user\"}'")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    args = parser.parse_args()
+
+    client = CorpusClient.connect(args.actions_dir)
+    if client is None:
+        print(f"❌ Aucun démon pour {args.actions_dir} sur {socket_path(args.actions_dir)}")
+        sys.exit(1)
+    with client:
+        try:
+            result = client.request(args.op, **json.loads(args.args))
+        except DaemonError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Long-lived daemon keeping the parsed corpus and its derived data in memory.
+
+The daemon parses data/seed/actions once and serves it, with the data the
+tools otherwise rebuild on every run, over a Unix domain socket (asyncio):
+- the actions themselves (and their JSON encoding, reused across clients);
+- the normalized search fields (text_normalizer.normalize_action);
+- the tag index (tag_index.TagIndex);
+- the audit results (audit_commands.analyze_actions).
+
+A watcher task polls the file signatures (size, mtime) every --interval
+seconds, re-parses only the files that changed and rebuilds the derived
+data in the background. Every request also re-checks the signatures
+first (a scandir, a few milliseconds), so a script that just rewrote
+files never sees the previous version. Derived data is built on demand
+and kept until the next change.
+
+Requests are handled one at a time on a worker thread, so the event loop
+only does I/O. corpus_client.py is the client side and describes the
+protocol; the socket is created with owner-only permissions.
+
+Usage:
+    python scripts/corpus_daemon.py &
+    python scripts/corpus_daemon.py --interval 2 --socket /tmp/corpus.sock
+    python scripts/corpus_client.py stop
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from audit_commands import analyze_actions
+from corpus_client import CorpusClient, socket_path
+from seed_corpus import ACTIONS_DIR, is_action_file
+from tag_index import TagIndex
+from text_normalizer import SEARCH_FIELDS, contains_all_tokens, get_search_tokens, normalize_action, normalize_for_search
+
+WATCH_INTERVAL = 1.0
+# Requests are single lines; the default StreamReader limit is 64 KiB
+REQUEST_LIMIT = 1 << 20
+
+
+class CorpusState:
+    """Parsed action files plus derived data rebuilt lazily after each change."""
+
+    def __init__(self, actions_dir: Path = ACTIONS_DIR):
+        self.actions_dir = Path(actions_dir)
+        # stem -> (size, mtime_ns, action)
+        self.files: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+        self.generation = 0
+        self.refreshes = 0
+        self._actions: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # name -> (generation, value)
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+
+    def refresh(self) -> int:
+        """Re-parse new or modified files and drop removed ones; return the change count."""
+        changes = 0
+        seen = set()
+        with os.scandir(self.actions_dir) as it:
+            for entry in it:
+                if not is_action_file(Path(entry.name)):
+                    continue
+                stem = entry.name[:-5]
+                seen.add(stem)
+                st = entry.stat()
+                current = self.files.get(stem)
+                if current and current[0] == st.st_size and current[1] == st.st_mtime_ns:
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        action = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Being written: keep the previous version, retried on the next pass
+                    print(f"⚠️  {entry.name}: {e}", file=sys.stderr, flush=True)
+                    continue
+                self.files[stem] = (st.st_size, st.st_mtime_ns, action)
+                changes += 1
+        for stem in [s for s in self.files if s not in seen]:
+            del self.files[stem]
+            changes += 1
+        if changes:
+            self.generation += 1
+            # File name order, as seed_corpus.iter_action_files ('.' sorts after '-')
+            self._actions = [self.files[stem][2] for stem in sorted(self.files, key=lambda stem: stem + '.json')]
+            self._by_id = {a.get('id', '').casefold(): a for a in self._actions}
+        self.refreshes += 1
+        return changes
+
+    def derived(self, name: str, build: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        value = build(self._actions)
+        self._derived[name] = (self.generation, value)
+        return value
+
+    @property
+    def actions(self) -> List[Dict[str, Any]]:
+        return self._actions
+
+    def action(self, action_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(action_id.casefold())
+
+    def actions_json(self) -> bytes:
+        return self.derived('actions_json', lambda actions: json.dumps(actions, ensure_ascii=False).encode('utf-8'))
+
+    def normalized(self) -> Dict[str, Dict[str, str]]:
+        return self.derived('normalized', lambda actions: {a.get('id', ''): normalize_action(a) for a in actions})
+
+    def tag_index(self) -> TagIndex:
+        return self.derived('tags', TagIndex)
+
+    def audit(self) -> Dict[str, Any]:
+        def build(actions):
+            stats, issues = analyze_actions(actions)
+            return {'stats': stats, 'issues': issues}
+        return self.derived('audit', build)
+
+    def warm(self):
+        """Build every derived value for the current generation."""
+        self.actions_json()
+        self.normalized()
+        self.tag_index()
+        self.audit()
+
+
+class CorpusDaemon:
+    """asyncio Unix socket server over a CorpusState."""
+
+    def __init__(self, state: CorpusState, path: Path, interval: float = WATCH_INTERVAL):
+        self.state = state
+        self.path = Path(path)
+        self.interval = interval
+        self.started = time.time()
+        self.requests = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.stopping: Optional[asyncio.Event] = None
+        self.handlers: Dict[str, Callable[..., Any]] = {
+            'status': self.op_status,
+            'ids': lambda: [a.get('id', '') for a in self.state.actions],
+            'action': self.op_action,
+            'normalized': self.op_normalized,
+            'search': self.op_search,
+            'suggest': self.op_suggest,
+            'cooccur': lambda tag, top=10: self.state.tag_index().cooccurring(tag, top),
+            'with': lambda tags: self.state.tag_index().actions_with(*tags),
+            'audit': self.state.audit,
+        }
+
+    # ------------------------------------------------------------------
+    # Operations (run on the worker thread, after a refresh)
+    # ------------------------------------------------------------------
+
+    def op_status(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'actionsDir': str(self.state.actions_dir),
+            'actions': len(self.state.actions),
+            'generation': self.state.generation,
+            'refreshes': self.state.refreshes,
+            'requests': self.requests,
+            'uptime': round(time.time() - self.started, 1),
+        }
+
+    def op_action(self, id: str) -> Dict[str, Any]:
+        action = self.state.action(id)
+        if action is None:
+            raise KeyError(f"Action introuvable: {id}")
+        return action
+
+    def op_normalized(self, id: Optional[str] = None) -> Any:
+        normalized = self.state.normalized()
+        if id is None:
+            return normalized
+        action = self.op_action(id)
+        return normalized[action.get('id', '')]
+
+    def op_search(self, query: str) -> List[str]:
+        tokens = get_search_tokens(normalize_for_search(query))
+        return sorted(action_id for action_id, fields in self.state.normalized().items()
+                      if any(contains_all_tokens(fields[f], tokens) for f in SEARCH_FIELDS))
+
+    def op_suggest(self, title: str = '', command: str = '', category: str = '', top: int = 8,
+                   method: str = 'pmi', exclude: Tuple[str, ...] = ()) -> List[Tuple[str, float]]:
+        return self.state.tag_index().suggest(title, command, category, top, method, exclude)
+
+    def handle(self, op: str, args: Dict[str, Any]) -> bytes:
+        self.requests += 1
+        try:
+            self.state.refresh()
+            if op == 'actions':
+                return b'{"ok":true,"result":' + self.state.actions_json() + b'}'
+            handler = self.handlers.get(op)
+            if handler is None:
+                raise ValueError(f"Opération inconnue: {op}")
+            response = {'ok': True, 'result': handler(**args)}
+        except Exception as e:
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        return json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+    # ------------------------------------------------------------------
+    # Server
+    # ------------------------------------------------------------------
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op, args = request['op'], request.get('args') or {}
+                except (ValueError, KeyError, TypeError) as e:
+                    writer.write(json.dumps({'ok': False, 'error': f"Requête invalide: {e}"}).encode('utf-8') + b'\n')
+                    await writer.drain()
+                    continue
+                if op == 'stop':
+                    writer.write(b'{"ok":true,"result":"stopping"}\n')
+                    await writer.drain()
+                    self.stopping.set()
+                    break
+                response = await loop.run_in_executor(self.executor, self.handle, op, args)
+                writer.write(response + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def watch(self):
+        loop = asyncio.get_running_loop()
+        warmed = self.state.generation
+        while True:
+            await asyncio.sleep(self.interval)
+            changes = await loop.run_in_executor(self.executor, self.state.refresh)
+            if changes:
+                print(f"🔄 {changes} fichier(s) modifié(s), génération {self.state.generation}", flush=True)
+            # Also after changes first seen by a request's own refresh
+            if self.state.generation != warmed:
+                await loop.run_in_executor(self.executor, self.state.warm)
+                warmed = self.state.generation
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        started = time.perf_counter()
+        await loop.run_in_executor(self.executor, self.state.refresh)
+        await loop.run_in_executor(self.executor, self.state.warm)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        old_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.serve_client, path=str(self.path), limit=REQUEST_LIMIT)
+        finally:
+            os.umask(old_umask)
+        print(f"✅ {len(self.state.actions)} actions chargées et indexées en {elapsed:.0f} ms, écoute sur {self.path}", flush=True)
+
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await self.stopping.wait()
+        finally:
+            watcher.cancel()
+            server.close()
+            self.path.unlink(missing_ok=True)
+            self.executor.shutdown(wait=False)
+        print("👋 Démon arrêté")
+
+
+def claim_socket(path: Path) -> bool:
+    """Remove a stale socket file; False when a daemon already answers on it."""
+    if not path.exists():
+        return True
+    try:
+        CorpusClient(path).close()
+        return False
+    except OSError:
+        path.unlink(missing_ok=True)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Démon gardant le corpus analysé et indexé en mémoire")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--socket', type=Path, help="Chemin du socket (défaut: un par utilisateur et dossier); "
+                             "les clients le lisent dans TWINSHELL_CORPUS_SOCKET")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                        help="Intervalle de surveillance des fichiers, en secondes")
+    args = parser.parse_args()
+
+    actions_dir = args.actions_dir.resolve()
+    path = args.socket or socket_path(actions_dir)
+    if not claim_socket(path):
+        print(f"❌ Un démon écoute déjà sur {path}")
+        sys.exit(1)
+    asyncio.run(CorpusDaemon(CorpusState(actions_dir), path, args.interval).run())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
+import argparse
 import json
 import shutil
 from pathlib import Path
 
+from profiling import NULL_PROFILER, add_profile_arguments, finish_profile, profiler_from_args
+
 # Configuration
 INPUT_FILE = 'data/seed/initial-actions.json'
 OUTPUT_FILE = 'data/seed/initial-actions.json' # On écrase directement pour appliquer les changements
@@ -172,17 +175,18 @@ def clean_robotic_examples(examples):
         clean_list.append(ex)
     return clean_list
 
-def enrich_database():
+def enrich_database(profiler=NULL_PROFILER):
     print(f"Chargement de {INPUT_FILE}...")
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with profiler.stage('load'):
+        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     actions = data.get('actions', [])
     updates_count = 0
     
     print("Application des kits d'urgence...")
     
-    for action in actions:
+    for action in profiler.track(actions):
         # On doit vérifier les DEUX templates (Windows et Linux) car une action peut être hybride
         # et avoir besoin d'enrichissement sur les deux volets, ou l'un des deux.
         
@@ -262,13 +266,20 @@ def enrich_database():
 
     print(f"Sauvegarde... ({updates_count} actions mises à jour)")
     
-    # Backup
-    shutil.copy(INPUT_FILE, BACKUP_FILE)
-    
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with profiler.stage('save'):
+        # Backup
+        shutil.copy(INPUT_FILE, BACKUP_FILE)
+
+        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
     
     print("Terminé.")
 
 if __name__ == '__main__':
-    enrich_database()
+    parser = argparse.ArgumentParser(description="Applique les kits d'urgence aux actions")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args, 'enrich_emergency_context.py').start()
+    enrich_database(profiler)
+    finish_profile(profiler, args)
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Streaming analytics over exported execution records.
+
+Reads, one record at a time:
+- the CSV written by AuditLogService.ExportToCsvAsync (Timestamp,
+  ActionTitle, Category, Command, Platform, ExitCode, Success, Duration in
+  seconds, WasDangerous; it has no ActionId, so rows are matched on the
+  title). A culture with a decimal comma splits Duration into two fields;
+  such rows are put back together.
+- JSON Lines (.jsonl / .ndjson, optionally gzipped) of AuditLog or
+  CommandHistory records, PascalCase or camelCase: Duration /
+  ExecutionDuration as TimeSpan strings ("00:00:01.5000000"), seconds or
+  *Ticks fields.
+- the app's SQLite database (AuditLogs and executed CommandHistories).
+
+Memory is bounded by the number of actions and categories, not by the
+number of records: each key keeps counters and a log-bucketed latency
+histogram (HDR-style, 1% relative error by default) from which p50 / p95 /
+p99 are read. Histograms merge by adding bucket counts.
+
+Results are joined back to data/seed/actions (by id, else by title) to
+list the slowest and the flakiest seed actions, and executions flagged
+dangerous on actions whose seed level is not Dangerous.
+
+Usage:
+    python scripts/execution_stats.py audit.csv
+    python scripts/execution_stats.py history.jsonl.gz twinshell.db --min-count 50 --output stats.json
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corpus_client import load_actions
+from seed_corpus import ACTIONS_DIR
+
+LEVEL_MAP = {0: 'Info', 1: 'Run', 2: 'Dangerous'}
+DANGEROUS = 2
+TICKS_PER_SECOND = 10_000_000
+DEFAULT_RELATIVE_ERROR = 0.01
+QUANTILES = (0.5, 0.95, 0.99)
+AUDIT_CSV_HEADER = ['Timestamp', 'ActionTitle', 'Category', 'Command', 'Platform',
+                    'ExitCode', 'Success', 'Duration', 'WasDangerous']
+
+_TIMESPAN = re.compile(r"^(-)?(?:(\d+)\.)?(\d+):(\d+):(\d+(?:\.\d+)?)$")
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram: quantiles within relative_error of the true value."""
+
+    __slots__ = ('gamma', 'log_gamma', 'buckets', 'zeros', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self, relative_error: float = DEFAULT_RELATIVE_ERROR):
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        if seconds <= 0:
+            self.zeros += 1
+            return
+        bucket = math.ceil(math.log(seconds) / self.log_gamma)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: 'LatencyHistogram'):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                # Middle of the bucket (gamma^(b-1), gamma^b], clamped to the observed range
+                value = 2 * self.gamma ** bucket / (self.gamma + 1)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class ExecutionStats:
+    """Counters and latency histogram of one action or category."""
+
+    __slots__ = ('executions', 'failures', 'dangerous', 'exit_codes', 'latency', 'title', 'category')
+
+    def __init__(self, relative_error: float = DEFAULT_RELATIVE_ERROR):
+        self.executions = 0
+        self.failures = 0
+        self.dangerous = 0
+        self.exit_codes: Counter = Counter()
+        self.latency = LatencyHistogram(relative_error)
+        self.title = ''
+        self.category = ''
+
+    def add(self, record: Dict[str, Any]):
+        self.executions += 1
+        if not record['success']:
+            self.failures += 1
+            if record['exitCode'] is not None:
+                self.exit_codes[record['exitCode']] += 1
+        if record['dangerous']:
+            self.dangerous += 1
+        if record['duration'] is not None:
+            self.latency.add(record['duration'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'executions': self.executions,
+            'failures': self.failures,
+            'failureRate': round(self.failures / self.executions, 4) if self.executions else None,
+            'dangerous': self.dangerous,
+            'timed': self.latency.count,
+            'meanSeconds': _round(self.latency.mean),
+            'maxSeconds': _round(self.latency.maximum if self.latency.count else None),
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}Seconds"] = _round(self.latency.quantile(q))
+        result['topExitCodes'] = [[code, count] for code, count in self.exit_codes.most_common(3)]
+        return result
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+# Record parsing
+
+def parse_bool(value: Any) -> Optional[bool]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, (bool, int)):
+        return bool(value)
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+
+def parse_seconds(value: Any, ticks: bool = False) -> Optional[float]:
+    """Seconds from a TimeSpan string ("1.02:03:04.5"), a number of seconds, or ticks."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return value / TICKS_PER_SECOND if ticks else float(value)
+    text = str(value).strip()
+    match = _TIMESPAN.match(text)
+    if match:
+        sign, days, hours, minutes, seconds = match.groups()
+        total = int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        return -total if sign else total
+    number = float(text.replace(',', '.'))
+    return number / TICKS_PER_SECOND if ticks else number
+
+
+def _field(record: Dict[str, Any], *names: str) -> Any:
+    for name in names:
+        for key in (name, name[0].lower() + name[1:]):
+            if key in record:
+                return record[key]
+    return None
+
+
+def normalize_record(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Common shape of an AuditLog / CommandHistory record, or None if it was never executed."""
+    if parse_bool(_field(raw, 'IsExecuted')) is False:
+        return None
+    duration = parse_seconds(_field(raw, 'Duration', 'ExecutionDuration'))
+    if duration is None:
+        duration = parse_seconds(_field(raw, 'DurationTicks', 'ExecutionDurationTicks'), ticks=True)
+    exit_code = _field(raw, 'ExitCode')
+    success = parse_bool(_field(raw, 'Success', 'ExecutionSuccess'))
+    exit_code = int(exit_code) if exit_code not in (None, '') else None
+    if success is None:
+        if exit_code is None:
+            return None
+        success = exit_code == 0
+    return {
+        'actionId': _field(raw, 'ActionId') or '',
+        'title': _field(raw, 'ActionTitle') or '',
+        'category': _field(raw, 'Category') or '',
+        'exitCode': exit_code,
+        'success': success,
+        'dangerous': bool(parse_bool(_field(raw, 'WasDangerous'))),
+        'duration': duration,
+    }
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == '.gz':
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def _base_suffix(path: Path) -> str:
+    return Path(path.stem).suffix.lower() if path.suffix == '.gz' else path.suffix.lower()
+
+
+def iter_audit_csv(path: Path) -> Iterator[Dict[str, Any]]:
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header != AUDIT_CSV_HEADER:
+            raise ValueError(f"{path}: en-tête CSV inattendu {header}")
+        for row in reader:
+            if len(row) == len(AUDIT_CSV_HEADER) + 1:
+                # Duration written with a decimal comma ("1,50") spans two fields
+                row = row[:7] + [row[7] + '.' + row[8]] + row[9:]
+            if len(row) != len(AUDIT_CSV_HEADER):
+                continue
+            record = normalize_record(dict(zip(AUDIT_CSV_HEADER, row)))
+            if record:
+                yield record
+
+
+def iter_json_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                record = normalize_record(json.loads(line))
+                if record:
+                    yield record
+
+
+def iter_database(path: Path) -> Iterator[Dict[str, Any]]:
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        queries = []
+        if 'AuditLogs' in tables:
+            queries.append("SELECT ActionId, ActionTitle, Category, ExitCode, Success, DurationTicks, "
+                           "WasDangerous FROM AuditLogs")
+        if 'CommandHistories' in tables:
+            queries.append("SELECT ActionId, ActionTitle, Category, ExitCode, ExecutionSuccess, "
+                           "ExecutionDurationTicks FROM CommandHistories WHERE IsExecuted = 1")
+        for query in queries:
+            for row in connection.execute(query):
+                record = normalize_record(dict(row))
+                if record:
+                    yield record
+    finally:
+        connection.close()
+
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    path = Path(path)
+    suffix = _base_suffix(path)
+    if suffix == '.csv':
+        return iter_audit_csv(path)
+    if suffix in ('.jsonl', '.ndjson'):
+        return iter_json_lines(path)
+    if suffix in ('.db', '.sqlite', '.sqlite3'):
+        return iter_database(path)
+    raise ValueError(f"{path}: format non reconnu (csv, jsonl, ndjson ou base SQLite)")
+
+
+# Aggregation and join
+
+class SeedLookup:
+    """Seed actions by id and by title (the audit CSV has no ActionId)."""
+
+    def __init__(self, actions: Iterable[Dict[str, Any]]):
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_title: Dict[str, Dict[str, Any]] = {}
+        for action in actions:
+            self.by_id[action.get('id', '').casefold()] = action
+            self.by_title.setdefault(action.get('title', '').casefold(), action)
+
+    def find(self, action_id: str, title: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(action_id.casefold()) or self.by_title.get(title.casefold())
+
+
+def aggregate(records: Iterable[Dict[str, Any]], lookup: SeedLookup,
+              relative_error: float = DEFAULT_RELATIVE_ERROR
+              ) -> Tuple[Dict[str, ExecutionStats], Dict[str, ExecutionStats], int]:
+    """Return (stats by action key, stats by category, record count).
+
+    The action key is the seed id when the record matches a seed action,
+    else "?" + the record's id or title.
+    """
+    by_action: Dict[str, ExecutionStats] = {}
+    by_category: Dict[str, ExecutionStats] = {}
+    resolved: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+    count = 0
+    for record in records:
+        count += 1
+        key = (record['actionId'], record['title'])
+        target = resolved.get(key)
+        if target is None:
+            action = lookup.find(*key)
+            if action:
+                target = (action['id'], action.get('title', ''), action.get('category', ''))
+            else:
+                target = ('?' + (record['actionId'] or record['title']), record['title'], record['category'])
+            resolved[key] = target
+        action_key, title, category = target
+        stats = by_action.get(action_key)
+        if stats is None:
+            stats = by_action[action_key] = ExecutionStats(relative_error)
+            stats.title, stats.category = title, category
+        stats.add(record)
+        category = category or record['category']
+        stats = by_category.get(category)
+        if stats is None:
+            stats = by_category[category] = ExecutionStats(relative_error)
+            stats.category = category
+        stats.add(record)
+    return by_action, by_category, count
+
+
+def build_report(by_action: Dict[str, ExecutionStats], by_category: Dict[str, ExecutionStats],
+                 lookup: SeedLookup) -> Dict[str, Any]:
+    actions = {}
+    for key, stats in by_action.items():
+        entry = {'title': stats.title, 'category': stats.category, **stats.to_dict()}
+        seed = lookup.by_id.get(key.casefold())
+        entry['inSeed'] = seed is not None
+        if seed is not None:
+            entry['seedLevel'] = LEVEL_MAP.get(seed.get('level'), 'Unknown')
+        actions[key] = entry
+    categories = {name: stats.to_dict() for name, stats in by_category.items()}
+    return {'actions': actions, 'categories': categories}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistiques d'exécution (AuditLog / CommandHistory exportés)")
+    parser.add_argument('inputs', nargs='+', type=Path, help="Fichiers CSV, JSON Lines (.gz) ou bases SQLite")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--min-count', type=int, default=20,
+                        help="Exécutions minimales pour figurer dans les classements")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--relative-error', type=float, default=DEFAULT_RELATIVE_ERROR,
+                        help="Erreur relative des percentiles (défaut: 0.01)")
+    parser.add_argument('--output', type=Path, help="Écrit toutes les statistiques au format JSON")
+    args = parser.parse_args()
+
+    lookup = SeedLookup(load_actions(args.actions_dir))
+    started = time.perf_counter()
+
+    def all_records():
+        for path in args.inputs:
+            yield from iter_records(path)
+
+    by_action, by_category, count = aggregate(all_records(), lookup, args.relative_error)
+    elapsed = time.perf_counter() - started
+    report = build_report(by_action, by_category, lookup)
+    report['records'] = count
+
+    unmatched = [k for k, v in report['actions'].items() if not v['inSeed']]
+    print(f"📊 {count} exécutions lues en {elapsed:.1f}s ({count / elapsed if elapsed else 0:,.0f}/s): "
+          f"{len(by_action)} actions, {len(by_category)} catégories, {len(unmatched)} hors corpus")
+
+    ranked = [(k, v) for k, v in report['actions'].items() if v['executions'] >= args.min_count]
+
+    def show(title: str, rows: List[Tuple[str, Dict[str, Any]]], describe):
+        print(f"\n{title}")
+        for key, entry in rows[:args.top]:
+            print(f"   {key:<40} {describe(entry)}")
+        if not rows:
+            print("   (aucune)")
+
+    slow = sorted((r for r in ranked if r[1]['p95Seconds'] is not None), key=lambda r: -r[1]['p95Seconds'])
+    show(f"🐢 Les plus lentes (p95, ≥ {args.min_count} exécutions):", slow,
+         lambda e: f"p50 {e['p50Seconds']:.2f}s  p95 {e['p95Seconds']:.2f}s  p99 {e['p99Seconds']:.2f}s")
+    flaky = sorted((r for r in ranked if r[1]['failures']), key=lambda r: -r[1]['failureRate'])
+    show(f"❌ Les plus instables (taux d'échec, ≥ {args.min_count} exécutions):", flaky,
+         lambda e: f"{e['failureRate']:.1%} de {e['executions']}  codes {e['topExitCodes']}")
+    unflagged = sorted(((k, v) for k, v in report['actions'].items()
+                        if v['dangerous'] and v.get('seedLevel') not in (None, LEVEL_MAP[DANGEROUS])),
+                       key=lambda r: -r[1]['dangerous'])
+    show("⚠️  Exécutions dangereuses sur des actions non marquées Dangerous:", unflagged,
+         lambda e: f"{e['dangerous']} exécution(s), niveau {e['seedLevel']}")
+    categories = sorted(report['categories'].items(), key=lambda r: -r[1]['executions'])
+    show("📁 Par catégorie:", categories,
+         lambda e: f"{e['executions']} exécutions, échecs {e['failureRate']:.1%}, "
+                   f"p95 {e['p95Seconds'] if e['p95Seconds'] is not None else '-'}s, dangereuses {e['dangerous']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Statistiques écrites dans {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic corpus generator for stress-testing the seed tooling.
+
+Structure and vocabulary are sampled from statistics collected on the real
+data/seed/actions/*.json files: field layout (key order included), category /
+platform / level mix, tags, titles, template names, parameter definitions,
+examples and links. Actions are streamed to disk one file at a time, so memory
+stays bounded whatever the requested size (50k-500k actions).
+
+A matching initial-batches.json is generated too, mixing valid actionId
+references with deliberately broken ones. Action files left in OUT_DIR by
+an earlier run and not regenerated are deleted, so the directory always
+matches --count and its _index.json.
+
+Usage:
+    python scripts/generate_corpus.py OUT_DIR --count 50000 --seed 42
+"""
+
+import argparse
+import bisect
+import json
+import random
+import re
+import tempfile
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from profiling import NULL_PROFILER, Profiler, add_profile_arguments, finish_profile, profiler_from_args
+from seed_corpus import (ACTIONS_DIR, BATCHES_FILE, dumps_action, iter_action_files, iter_actions, load_batches,
+                         write_index)
+
+WORD_RE = re.compile(r"[\w'’-]+", re.UNICODE)
+PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+EXAMPLE_FIELDS = {
+    'examples': None,
+    'windowsExamples': 0,
+    'linuxExamples': 1,
+}
+
+
+class Distribution:
+    """Weighted categorical distribution with O(log n) sampling."""
+
+    def __init__(self, counts: Dict[Any, int]):
+        self.values = list(counts)
+        self.cum_weights = []
+        total = 0
+        for value in self.values:
+            total += counts[value]
+            self.cum_weights.append(total)
+        self.total = total
+
+    def __bool__(self):
+        return self.total > 0
+
+    def sample(self, rng: random.Random) -> Any:
+        return self.values[bisect.bisect_right(self.cum_weights, rng.random() * self.total)]
+
+    def sample_many(self, rng: random.Random, k: int) -> List[Any]:
+        return [self.sample(rng) for _ in range(k)]
+
+
+class CorpusStatistics:
+    """Field distributions and vocabularies extracted from a real corpus."""
+
+    def __init__(self):
+        self.shapes = Counter()
+        self.profile_by_shape = defaultdict(Counter)
+        self.id_prefix_by_category = defaultdict(Counter)
+        self.tags_by_category = defaultdict(Counter)
+        self.tag_counts = Counter()
+        self.title_first_words = defaultdict(Counter)
+        self.title_words = Counter()
+        self.title_lengths = Counter()
+        self.description_words = Counter()
+        self.description_lengths = Counter()
+        self.notes_words = Counter()
+        self.notes_lengths = Counter()
+        self.cross_platform_notes = defaultdict(Counter)
+        self.cross_platform_counts = defaultdict(Counter)
+        self.example_words = Counter()
+        self.example_lengths = Counter()
+        self.example_counts = defaultdict(Counter)
+        self.template_names = defaultdict(Counter)
+        self.parameter_pool = Counter()
+        self.parameter_counts = Counter()
+        self.links = Counter()
+        self.link_counts = Counter()
+        self.batch_tags = Counter()
+        self.batch_sizes = Counter()
+        self.batch_modes = Counter()
+        self.actions_seen = 0
+
+    @classmethod
+    def from_corpus(cls, actions: Iterable[Dict[str, Any]],
+                    batches: Sequence[Dict[str, Any]] = ()) -> 'CorpusStatistics':
+        stats = cls()
+        for action in actions:
+            stats.add_action(action)
+        for batch in batches:
+            stats.add_batch(batch)
+        return stats
+
+    def add_action(self, action: Dict[str, Any]):
+        self.actions_seen += 1
+        shape = tuple(action)
+        category = action.get('category', '')
+        self.shapes[shape] += 1
+        self.profile_by_shape[shape][(category, action.get('platform', 0), action.get('level', 0))] += 1
+        self.id_prefix_by_category[category][action.get('id', 'action').split('-')[0]] += 1
+
+        tags = action.get('tags') or []
+        self.tag_counts[len(tags)] += 1
+        self.tags_by_category[category].update(tags)
+
+        title_words = WORD_RE.findall(action.get('title', ''))
+        if title_words:
+            self.title_first_words[category][title_words[0]] += 1
+            self.title_words.update(title_words[1:])
+        self.title_lengths[len(title_words)] += 1
+        self._add_text(action.get('description', ''), self.description_words, self.description_lengths)
+        if action.get('notes'):
+            self._add_text(action['notes'], self.notes_words, self.notes_lengths)
+        for key, items in (action.get('crossPlatformNotes') or {}).items():
+            self.cross_platform_notes[key].update(items)
+            self.cross_platform_counts[key][len(items)] += 1
+
+        for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+            template = action.get(key)
+            if not template:
+                continue
+            if template.get('name'):
+                self.template_names[template.get('platform', 0)][template['name']] += 1
+            parameters = template.get('parameters') or []
+            self.parameter_counts[len(parameters)] += 1
+            for param in parameters:
+                self.parameter_pool[json.dumps(param, ensure_ascii=False, sort_keys=False)] += 1
+
+        for key in EXAMPLE_FIELDS:
+            if key not in action:
+                continue
+            examples = action.get(key) or []
+            self.example_counts[key][len(examples)] += 1
+            for example in examples:
+                self._add_text(example.get('description', ''), self.example_words, self.example_lengths)
+
+        links = action.get('links') or []
+        self.link_counts[len(links)] += 1
+        for link in links:
+            self.links[(link.get('title', ''), link.get('url', ''))] += 1
+
+    def add_batch(self, batch: Dict[str, Any]):
+        self.batch_tags.update(batch.get('tags') or [])
+        self.batch_sizes[len(batch.get('commands') or [])] += 1
+        self.batch_modes[batch.get('executionMode', 0)] += 1
+
+    @staticmethod
+    def _add_text(text: str, words: Counter, lengths: Counter):
+        tokens = WORD_RE.findall(text or '')
+        words.update(tokens)
+        lengths[len(tokens)] += 1
+
+
+class SyntheticCorpusGenerator:
+    """Samples synthetic actions and batches from CorpusStatistics."""
+
+    def __init__(self, stats: CorpusStatistics, seed: int = 0):
+        if not stats.actions_seen:
+            raise ValueError("Les statistiques sources sont vides")
+        self.rng = random.Random(seed)
+        self.shapes = Distribution(stats.shapes)
+        self.profiles = {shape: Distribution(c) for shape, c in stats.profile_by_shape.items()}
+        self.id_prefixes = {cat: Distribution(c) for cat, c in stats.id_prefix_by_category.items()}
+        self.tags = {cat: Distribution(c) for cat, c in stats.tags_by_category.items()}
+        self.tag_counts = Distribution(stats.tag_counts)
+        self.title_first_words = {cat: Distribution(c) for cat, c in stats.title_first_words.items()}
+        self.title_words = Distribution(stats.title_words)
+        self.title_lengths = Distribution(stats.title_lengths)
+        self.description_words = Distribution(stats.description_words)
+        self.description_lengths = Distribution(stats.description_lengths)
+        self.notes_words = Distribution(stats.notes_words or stats.description_words)
+        self.notes_lengths = Distribution(stats.notes_lengths or stats.description_lengths)
+        self.cross_platform_notes = {key: (Distribution(c), Distribution(stats.cross_platform_counts[key]))
+                                     for key, c in stats.cross_platform_notes.items()}
+        self.example_words = Distribution(stats.example_words or stats.description_words)
+        self.example_lengths = Distribution(stats.example_lengths or stats.description_lengths)
+        self.example_counts = {key: Distribution(c) for key, c in stats.example_counts.items()}
+        self.template_names = {platform: Distribution(c) for platform, c in stats.template_names.items()}
+        self.parameter_pool = Distribution(stats.parameter_pool)
+        self.parameter_counts = Distribution(stats.parameter_counts)
+        self.links = Distribution(stats.links)
+        self.link_counts = Distribution(stats.link_counts)
+        self.batch_tags = Distribution(stats.batch_tags or Counter(['preset']))
+        self.batch_sizes = Distribution(stats.batch_sizes or Counter([6]))
+        self.batch_modes = Distribution(stats.batch_modes or Counter([0]))
+        self.categories = sorted(stats.tags_by_category)
+
+    # ------------------------------------------------------------------
+    # Text helpers
+    # ------------------------------------------------------------------
+
+    def _text(self, words: Distribution, lengths: Distribution, minimum: int = 3) -> str:
+        count = max(minimum, lengths.sample(self.rng))
+        text = ' '.join(words.sample_many(self.rng, count))
+        return text[:1].upper() + text[1:] + '.'
+
+    def _title(self, category: str) -> str:
+        first = self.title_first_words.get(category)
+        head = first.sample(self.rng) if first else 'Afficher'
+        rest = self.title_words.sample_many(self.rng, max(1, self.title_lengths.sample(self.rng) - 1))
+        return ' '.join([head] + rest)[:200]
+
+    # ------------------------------------------------------------------
+    # Record builders
+    # ------------------------------------------------------------------
+
+    def _template(self, template_id: str, platform: int) -> Dict[str, Any]:
+        names = self.template_names.get(platform) or next(iter(self.template_names.values()))
+        name = names.sample(self.rng)
+        parameters = []
+        seen = set()
+        for _ in range(self.parameter_counts.sample(self.rng)):
+            param = json.loads(self.parameter_pool.sample(self.rng))
+            if param.get('name') in seen:
+                continue
+            seen.add(param.get('name'))
+            parameters.append(param)
+
+        parts = [name]
+        for param in parameters:
+            param_name = param.get('name', 'value')
+            if platform == 0:
+                parts.append(f"-{param_name[:1].upper()}{param_name[1:]} {{{param_name}}}")
+            else:
+                parts.append(f"{{{param_name}}}")
+        return {
+            'id': template_id,
+            'platform': platform,
+            'name': name,
+            'commandPattern': ' '.join(parts),
+            'parameters': parameters,
+        }
+
+    def _examples(self, field: str, templates: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        platform = EXAMPLE_FIELDS[field]
+        if platform is None:
+            platform = 0 if 0 in templates else 1
+        template = templates.get(platform)
+        counts = self.example_counts.get(field)
+        examples = []
+        for _ in range(counts.sample(self.rng) if counts else 1):
+            if template:
+                values = {p.get('name'): p.get('defaultValue') or f"<{p.get('name')}>"
+                          for p in template['parameters']}
+                command = PLACEHOLDER_RE.sub(lambda m: str(values.get(m.group(1), f"<{m.group(1)}>")),
+                                             template['commandPattern'])
+            else:
+                command = self.template_names[platform].sample(self.rng) if platform in self.template_names else 'echo'
+            examples.append({
+                'command': command,
+                'description': self._text(self.example_words, self.example_lengths),
+                'platform': platform,
+            })
+        return examples
+
+    def generate_action(self, index: int) -> Dict[str, Any]:
+        rng = self.rng
+        shape = self.shapes.sample(rng)
+        category, platform, level = self.profiles[shape].sample(rng)
+        prefix = self.id_prefixes[category].sample(rng) if category in self.id_prefixes else 'action'
+        action_id = f"{prefix}-synth-{index:06d}"
+
+        both = 'windowsCommandTemplate' in shape and 'linuxCommandTemplate' in shape
+        templates = {}
+        if 'windowsCommandTemplate' in shape:
+            templates[0] = self._template(f"{action_id}-{'win-' if both else ''}cmd", 0)
+        if 'linuxCommandTemplate' in shape:
+            templates[1] = self._template(f"{action_id}-{'linux-' if both else ''}cmd", 1)
+
+        tag_dist = self.tags.get(category)
+        tags = []
+        if tag_dist:
+            for tag in tag_dist.sample_many(rng, self.tag_counts.sample(rng)):
+                if tag not in tags:
+                    tags.append(tag)
+
+        builders = {
+            'id': lambda: action_id,
+            'title': lambda: self._title(category),
+            'description': lambda: self._text(self.description_words, self.description_lengths),
+            'category': lambda: category,
+            'platform': lambda: platform,
+            'level': lambda: level,
+            'tags': lambda: tags,
+            'windowsCommandTemplateId': lambda: templates[0]['id'],
+            'windowsCommandTemplate': lambda: templates[0],
+            'linuxCommandTemplateId': lambda: templates[1]['id'],
+            'linuxCommandTemplate': lambda: templates[1],
+            'notes': lambda: self._text(self.notes_words, self.notes_lengths),
+            'crossPlatformNotes': lambda: {key: list(dict.fromkeys(items.sample_many(rng, counts.sample(rng))))
+                                           for key, (items, counts) in self.cross_platform_notes.items()},
+            'supportedPlatforms': lambda: [0, 1],
+            'parameters': lambda: [],
+            'links': lambda: [{'title': t, 'url': u}
+                              for t, u in dict.fromkeys(self.links.sample_many(rng, self.link_counts.sample(rng)))],
+        }
+        action = {}
+        for key in shape:
+            if key in EXAMPLE_FIELDS:
+                action[key] = self._examples(key, templates)
+            else:
+                action[key] = builders[key]()
+        return action
+
+    def generate_batch(self, index: int, valid_ids: Sequence[str], broken_ratio: float) -> Dict[str, Any]:
+        rng = self.rng
+        commands = []
+        for order in range(1, self.batch_sizes.sample(rng) + 1):
+            if valid_ids and rng.random() >= broken_ratio:
+                action_id = rng.choice(valid_ids)
+            else:
+                action_id = f"MISSING-SYNTH-{rng.randrange(1_000_000):06d}"
+            commands.append({
+                'actionId': action_id,
+                'order': order,
+                'isExecuted': False,
+                'description': self._title(rng.choice(self.categories)),
+            })
+        tags = list(dict.fromkeys(self.batch_tags.sample_many(rng, rng.randint(3, 7))))
+        return {
+            'id': f"synth-batch-{index:04d}",
+            'name': f"{rng.choice(self.categories).split(' ')[0]} Lot synthétique {index}",
+            'description': self._text(self.description_words, self.description_lengths),
+            'executionMode': self.batch_modes.sample(rng),
+            'isUserCreated': False,
+            'tags': tags,
+            'commands': commands,
+        }
+
+
+def generate_corpus(out_dir: Path, count: int, seed: int = 0, batch_count: int = 6,
+                    broken_ratio: float = 0.1, source_dir: Path = ACTIONS_DIR,
+                    source_batches: Optional[Path] = BATCHES_FILE,
+                    stats: Optional[CorpusStatistics] = None,
+                    profiler: Profiler = NULL_PROFILER) -> Dict[str, Any]:
+    """Write a synthetic corpus under out_dir/actions and out_dir/initial-batches.json."""
+    if stats is None:
+        with profiler.stage('statistics'):
+            batches = load_batches(source_batches) if source_batches and Path(source_batches).exists() else []
+            stats = CorpusStatistics.from_corpus(iter_actions(source_dir), batches)
+    generator = SyntheticCorpusGenerator(stats, seed)
+
+    out_dir = Path(out_dir)
+    actions_dir = out_dir / 'actions'
+    actions_dir.mkdir(parents=True, exist_ok=True)
+
+    # Ids are spooled to disk and batch references come from a fixed-size
+    # reservoir, so nothing grows with the corpus size.
+    reservoir_size = 4096
+    reservoir = []
+    reservoir_rng = random.Random(seed ^ 0x5EED)
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as id_spool:
+        for index in range(count):
+            with profiler.stage('generate_action', items=1):
+                action = generator.generate_action(index)
+            with profiler.stage('write_action', items=1):
+                with open(actions_dir / f"{action['id']}.json", 'w', encoding='utf-8', newline='') as f:
+                    f.write(dumps_action(action))
+            id_spool.write(action['id'] + '\n')
+            if len(reservoir) < reservoir_size:
+                reservoir.append(action['id'])
+            else:
+                slot = reservoir_rng.randrange(index + 1)
+                if slot < reservoir_size:
+                    reservoir[slot] = action['id']
+
+        id_spool.seek(0)
+        write_index(actions_dir, (line.rstrip('\n') for line in id_spool), count)
+        id_spool.seek(0)
+        generated = {line.rstrip('\n') for line in id_spool}
+
+    with profiler.stage('prune'):
+        stale = [path for path in iter_action_files(actions_dir) if path.stem not in generated]
+        for path in stale:
+            path.unlink()
+
+    valid = set(reservoir)
+    batches = [generator.generate_batch(i, reservoir, broken_ratio) for i in range(batch_count)]
+    references = [c['actionId'] for b in batches for c in b['commands']]
+    broken = sum(1 for ref in references if ref not in valid)
+    with open(out_dir / 'initial-batches.json', 'w', encoding='utf-8', newline='') as f:
+        f.write(dumps_action({'schemaVersion': '1.0', 'batches': batches}))
+
+    return {
+        'actions': count,
+        'batches': batch_count,
+        'references': len(references),
+        'brokenReferences': broken,
+        'pruned': len(stale),
+        'seed': seed,
+        'outDir': str(out_dir),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un corpus synthétique réaliste")
+    parser.add_argument('out_dir', type=Path)
+    parser.add_argument('--count', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batches', type=int, default=6)
+    parser.add_argument('--broken-ratio', type=float, default=0.1,
+                        help="Proportion de références actionId volontairement cassées")
+    parser.add_argument('--source', type=Path, default=ACTIONS_DIR)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args, 'generate_corpus.py').start()
+    summary = generate_corpus(args.out_dir, args.count, seed=args.seed, batch_count=args.batches,
+                              broken_ratio=args.broken_ratio, source_dir=args.source, profiler=profiler)
+    print(f"✅ {summary['actions']} actions générées dans {summary['outDir']}")
+    print(f"   {summary['batches']} lots, {summary['references']} références "
+          f"dont {summary['brokenReferences']} cassées")
+    if summary['pruned']:
+        print(f"🗑️  {summary['pruned']} fichier(s) d'une génération précédente supprimé(s)")
+    finish_profile(profiler, args)
+
+
+if __name__ == '__main__':
+    main()
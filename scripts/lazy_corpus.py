@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Lazy, index-backed access to the seed corpus.
+
+LazyCorpus reads only actions/_index.json and a small catalog up front;
+individual action files are parsed on first access and kept in a bounded
+LRU. Id lookup, iteration order and category / platform / level filters
+are answered from the catalog without touching the action files.
+
+The catalog (_actions_catalog.json next to the actions directory, so the
+app never ships it with the action files) stores per file: action id, category, platform, level,
+a platform bitmask, the (size, mtime) signature used to refresh it
+incrementally, so only new or modified files are re-parsed, the file's
+SHA-256 and schemaVersion (None when the file does not declare one) for
+seed_manifest.py, and the command template ids checked by check_index.py.
+
+With upgrade=True, actions are upgraded to the current schema as they are
+loaded (seed_migrations.py), keyed by the catalog's SHA-256 so an action
+still in the upgrade cache is not read again.
+
+Ids are matched case-insensitively, like the Windows file system the app
+runs on: _index.json and initial-batches.json use ids such as
+"WIN-PRIVACY-002" for the file win-privacy-002.json.
+
+Usage:
+    python scripts/lazy_corpus.py --refresh
+    python scripts/lazy_corpus.py --category "🌐 Network & DNS" --platform linux
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from seed_corpus import ACTIONS_DIR, INDEX_FILE_NAME, is_action_file, load_action, sidecar_path, write_text_atomic
+from seed_migrations import ACTION, UPGRADE_CACHE, UpgradeCache
+from seed_models import Action
+
+CATALOG_SUFFIX = '_catalog.json'
+CATALOG_VERSION = 3
+
+WINDOWS = 0
+LINUX = 1
+BOTH = 2
+PLATFORM_NAMES = {'windows': WINDOWS, 'linux': LINUX, 'both': BOTH}
+
+# Catalog entry layout:
+# (id, category index, platform, level, platform mask, size, mtime_ns, sha256, schema version,
+#  [windowsCommandTemplateId, windowsCommandTemplate.id, linuxCommandTemplateId, linuxCommandTemplate.id])
+(ENTRY_ID, ENTRY_CATEGORY, ENTRY_PLATFORM, ENTRY_LEVEL, ENTRY_MASK,
+ ENTRY_SIZE, ENTRY_MTIME, ENTRY_SHA256, ENTRY_SCHEMA, ENTRY_TEMPLATES) = range(10)
+
+
+def template_ids(action: Dict[str, Any]) -> List[Optional[str]]:
+    """[windowsCommandTemplateId, its template's id, linuxCommandTemplateId, its template's id]."""
+    ids = []
+    for prefix in ('windows', 'linux'):
+        template = action.get(f'{prefix}CommandTemplate')
+        ids.append(action.get(f'{prefix}CommandTemplateId'))
+        ids.append(template.get('id') if isinstance(template, dict) else None)
+    return ids
+
+
+def platform_mask(action: Dict[str, Any]) -> int:
+    """Bit 0: runs on Windows, bit 1: runs on Linux."""
+    platform = action.get('platform', WINDOWS)
+    mask = 0b11 if platform == BOTH else 1 << platform if platform in (WINDOWS, LINUX) else 0
+    for supported in action.get('supportedPlatforms') or []:
+        if supported in (WINDOWS, LINUX):
+            mask |= 1 << supported
+    if action.get('windowsCommandTemplate'):
+        mask |= 1 << WINDOWS
+    if action.get('linuxCommandTemplate'):
+        mask |= 1 << LINUX
+    return mask
+
+
+class ActionCatalog:
+    """Per-file metadata for every action file, refreshed incrementally."""
+
+    def __init__(self, actions_dir: Path = ACTIONS_DIR):
+        self.actions_dir = Path(actions_dir)
+        self.path = sidecar_path(self.actions_dir, CATALOG_SUFFIX)
+        self.categories: List[str] = []
+        self.entries: Dict[str, tuple] = {}
+        self._category_index: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, actions_dir: Path = ACTIONS_DIR, refresh: bool = True) -> 'ActionCatalog':
+        catalog = cls(actions_dir)
+        try:
+            with open(catalog.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CATALOG_VERSION:
+                catalog.categories = data['categories']
+                catalog.entries = {stem: tuple(entry) for stem, entry in data['entries'].items()}
+                catalog._category_index = {c: i for i, c in enumerate(catalog.categories)}
+        except (OSError, ValueError, KeyError):
+            pass
+        if refresh and catalog.refresh():
+            catalog.save()
+        return catalog
+
+    def refresh(self) -> int:
+        """Re-read new or modified files and drop removed ones; return the change count."""
+        changes = 0
+        seen = set()
+        with os.scandir(self.actions_dir) as it:
+            for entry in it:
+                if not is_action_file(Path(entry.name)):
+                    continue
+                stem = entry.name[:-5]
+                seen.add(stem)
+                st = entry.stat()
+                current = self.entries.get(stem)
+                if current and current[ENTRY_SIZE] == st.st_size and current[ENTRY_MTIME] == st.st_mtime_ns:
+                    continue
+                with open(entry.path, 'rb') as f:
+                    raw = f.read()
+                action = json.loads(raw)
+                self.entries[stem] = (
+                    action.get('id', stem),
+                    self._category(action.get('category', '')),
+                    action.get('platform', WINDOWS),
+                    action.get('level', 0),
+                    platform_mask(action),
+                    st.st_size,
+                    st.st_mtime_ns,
+                    hashlib.sha256(raw).hexdigest(),
+                    action.get('schemaVersion'),
+                    template_ids(action),
+                )
+                changes += 1
+        for stem in [s for s in self.entries if s not in seen]:
+            del self.entries[stem]
+            changes += 1
+        return changes
+
+    def save(self):
+        data = {
+            'version': CATALOG_VERSION,
+            'categories': self.categories,
+            'entries': {stem: list(entry) for stem, entry in sorted(self.entries.items())},
+        }
+        write_text_atomic(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    def _category(self, category: str) -> int:
+        index = self._category_index.get(category)
+        if index is None:
+            index = self._category_index[category] = len(self.categories)
+            self.categories.append(category)
+        return index
+
+
+class LazyCorpus:
+    """Read-only view of the corpus that parses action files on demand."""
+
+    def __init__(self, actions_dir: Path = ACTIONS_DIR, cache_size: int = 128,
+                 models: bool = False, refresh_catalog: bool = True, upgrade: bool = False,
+                 upgrade_cache: UpgradeCache = UPGRADE_CACHE):
+        self.actions_dir = Path(actions_dir)
+        self.cache_size = cache_size
+        self.models = models
+        self.upgrade_cache = upgrade_cache if upgrade else None
+        with open(self.actions_dir / INDEX_FILE_NAME, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.catalog = ActionCatalog.load(self.actions_dir, refresh=refresh_catalog)
+        self._stems = {stem.casefold(): stem for stem in self.catalog.entries}
+        self._stems.update({entry[ENTRY_ID].casefold(): stem for stem, entry in self.catalog.entries.items()})
+        self._ids = self._ordered_ids()
+        self._cache: 'OrderedDict[str, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Index-only queries
+    # ------------------------------------------------------------------
+
+    def ids(self) -> List[str]:
+        """Action ids in _index.json order, followed by files missing from the index."""
+        return list(self._ids)
+
+    def _ordered_ids(self) -> List[str]:
+        ordered = []
+        seen = set()
+        for action_id in self.index.get('actions', []):
+            stem = self._stems.get(action_id.casefold())
+            if stem is not None and stem not in seen:
+                seen.add(stem)
+                ordered.append(self.catalog.entries[stem][ENTRY_ID])
+        for stem in sorted(set(self.catalog.entries) - seen):
+            ordered.append(self.catalog.entries[stem][ENTRY_ID])
+        return ordered
+
+    def resolve(self, action_id: str) -> Optional[str]:
+        """Return the canonical action id matching action_id, if any."""
+        stem = self._stems.get(action_id.casefold())
+        return self.catalog.entries[stem][ENTRY_ID] if stem is not None else None
+
+    def categories(self) -> List[str]:
+        used = {entry[ENTRY_CATEGORY] for entry in self.catalog.entries.values()}
+        return [c for i, c in enumerate(self.catalog.categories) if i in used]
+
+    def filter(self, category: Optional[str] = None, platform: Optional[int] = None,
+               level: Optional[int] = None) -> List[str]:
+        """Ids of the actions matching every given criterion, in index order.
+
+        platform selects actions runnable on that platform (Windows or Linux),
+        BOTH selects cross-platform actions only.
+        """
+        category_index = None
+        if category is not None:
+            category_index = self.catalog._category_index.get(category, -1)
+        wanted_mask = 0b11 if platform == BOTH else (1 << platform) if platform is not None else 0
+        result = []
+        for action_id in self._ids:
+            entry = self.catalog.entries[self._stems[action_id.casefold()]]
+            if category_index is not None and entry[ENTRY_CATEGORY] != category_index:
+                continue
+            if wanted_mask and entry[ENTRY_MASK] & wanted_mask != wanted_mask:
+                continue
+            if level is not None and entry[ENTRY_LEVEL] != level:
+                continue
+            result.append(action_id)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.catalog.entries)
+
+    def __contains__(self, action_id: str) -> bool:
+        return action_id.casefold() in self._stems
+
+    # ------------------------------------------------------------------
+    # Lazy access
+    # ------------------------------------------------------------------
+
+    def get(self, action_id: str, default: Any = None) -> Any:
+        stem = self._stems.get(action_id.casefold())
+        if stem is None:
+            return default
+        cached = self._cache.get(stem)
+        if cached is not None:
+            self._cache.move_to_end(stem)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        path = self.actions_dir / f"{stem}.json"
+        if self.upgrade_cache is not None:
+            digest = self.catalog.entries[stem][ENTRY_SHA256]
+            action = self.upgrade_cache.upgrade(ACTION, digest, lambda: load_action(path),
+                                                self.index.get('version'))
+        else:
+            action = load_action(path)
+        if self.models:
+            action = Action.from_dict(action)
+        self._cache[stem] = action
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return action
+
+    def __getitem__(self, action_id: str) -> Any:
+        action = self.get(action_id)
+        if action is None:
+            raise KeyError(action_id)
+        return action
+
+    def __iter__(self) -> Iterator[Any]:
+        for action_id in self._ids:
+            yield self.get(action_id)
+
+    def iter_filtered(self, **criteria) -> Iterator[Any]:
+        for action_id in self.filter(**criteria):
+            yield self.get(action_id)
+
+    def cache_info(self) -> Tuple[int, int, int, int]:
+        """(hits, misses, current size, max size), like functools.lru_cache."""
+        return self.hits, self.misses, len(self._cache), self.cache_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accès paresseux au corpus d'actions")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--refresh', action='store_true', help="Met à jour le catalogue et quitte")
+    parser.add_argument('--category')
+    parser.add_argument('--platform', choices=sorted(PLATFORM_NAMES))
+    parser.add_argument('--level', type=int, choices=[0, 1, 2])
+    parser.add_argument('--upgrade', action='store_true', help="Migre les actions affichées vers le schéma courant")
+    parser.add_argument('ids', nargs='*', help="Affiche ces actions")
+    args = parser.parse_args()
+
+    if args.refresh:
+        catalog = ActionCatalog.load(args.actions_dir, refresh=False)
+        changes = catalog.refresh()
+        catalog.save()
+        print(f"✅ Catalogue à jour: {len(catalog.entries)} actions ({changes} modifiées)")
+        return
+
+    corpus = LazyCorpus(args.actions_dir, upgrade=args.upgrade)
+    for action_id in args.ids:
+        action = corpus.get(action_id)
+        print(json.dumps(action, ensure_ascii=False, indent=2) if action else f"❌ Action introuvable: {action_id}")
+
+    if args.category or args.platform or args.level is not None or not args.ids:
+        matches = corpus.filter(category=args.category,
+                                platform=PLATFORM_NAMES.get(args.platform),
+                                level=args.level)
+        for action_id in matches:
+            print(action_id)
+        print(f"{len(matches)}/{len(corpus)} actions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Shared instrumentation layer for the seed tooling scripts.
+
+Scripts expose it through add_profile_arguments() / profiler_from_args():
+
+    python enrich_examples_v2.py --profile                # profile.json
+    python scripts/audit_commands.py --profile out.json --profile-top 20
+    python migrate_to_unified.py --profile --profile-cprofile migrate.pstats
+
+The JSON report contains per-stage wall/CPU time, tracemalloc peaks, the
+slowest N actions and the actions/s throughput. When profiling is disabled
+every hook is a cheap no-op, so instrumented code paths need no branching.
+"""
+
+import cProfile
+import heapq
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_REPORT = 'profile.json'
+
+
+class StageStats:
+    __slots__ = ('name', 'calls', 'wall', 'cpu', 'peak_bytes', 'items')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = 0
+        self.items = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wallSeconds': round(self.wall, 6),
+            'cpuSeconds': round(self.cpu, 6),
+            'peakBytes': self.peak_bytes,
+            'items': self.items,
+            'itemsPerSecond': round(self.items / self.wall, 1) if self.wall and self.items else None,
+        }
+
+
+class Profiler:
+    """Collects stage timings, memory peaks and per-action durations."""
+
+    def __init__(self, enabled: bool = False, script: str = '', top_n: int = 10,
+                 track_memory: bool = True, cprofile_path: Optional[Path] = None):
+        self.enabled = enabled
+        self.script = script or Path(sys.argv[0]).name
+        self.top_n = top_n
+        self.track_memory = track_memory and enabled
+        self.cprofile_path = Path(cprofile_path) if cprofile_path else None
+        self.stages: Dict[str, StageStats] = {}
+        self._stack: List[List[int]] = []
+        self._slowest: List[tuple] = []
+        self._actions = 0
+        self._action_wall = 0.0
+        self._started_wall = None
+        self._started_cpu = None
+        self._total_wall = 0.0
+        self._total_cpu = 0.0
+        self._peak_bytes = 0
+        self._cprofile = None
+        self._own_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> 'Profiler':
+        if not self.enabled or self._started_wall is not None:
+            return self
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        if self.cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+        return self
+
+    def stop(self):
+        if not self.enabled or self._started_wall is None:
+            return
+        self._total_wall = time.perf_counter() - self._started_wall
+        self._total_cpu = time.process_time() - self._started_cpu
+        if self._cprofile:
+            self._cprofile.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(str(self.cprofile_path))
+            self._cprofile = None
+        if self.track_memory and tracemalloc.is_tracing():
+            self._peak_bytes = max(self._peak_bytes, tracemalloc.get_traced_memory()[1])
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+        self._started_wall = None
+
+    def __enter__(self) -> 'Profiler':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+
+    def stage(self, name: str, items: int = 0):
+        """Time a named stage; repeated entries with the same name accumulate."""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, items)
+
+    @contextmanager
+    def _stage(self, name: str, items: int):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            # reset_peak() is global: remember the peak seen so far by the
+            # enclosing stages before measuring this one.
+            peak = tracemalloc.get_traced_memory()[1]
+            for frame in self._stack:
+                frame[0] = max(frame[0], peak)
+            tracemalloc.reset_peak()
+        frame = [0]
+        self._stack.append(frame)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield stats
+        finally:
+            stats.wall += time.perf_counter() - wall
+            stats.cpu += time.process_time() - cpu
+            stats.calls += 1
+            stats.items += items
+            self._stack.pop()
+            if tracing:
+                peak = max(frame[0], tracemalloc.get_traced_memory()[1])
+                stats.peak_bytes = max(stats.peak_bytes, peak)
+                self._peak_bytes = max(self._peak_bytes, peak)
+                for outer in self._stack:
+                    outer[0] = max(outer[0], peak)
+
+    def action(self, action_id: str):
+        """Time the processing of a single action for the slowest-N report."""
+        if not self.enabled:
+            return nullcontext()
+        return self._action(action_id)
+
+    @contextmanager
+    def _action(self, action_id: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._actions += 1
+            self._action_wall += elapsed
+            entry = (elapsed, self._actions, action_id)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, entry)
+            elif self.top_n and elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def track(self, actions: Iterable[Dict[str, Any]], key: str = 'id') -> Iterable[Dict[str, Any]]:
+        """Iterate over actions, timing the loop body run for each of them."""
+        if not self.enabled:
+            return actions
+        return self._track(actions, key)
+
+    def _track(self, actions, key):
+        for action in actions:
+            with self._action(action.get(key, '') if isinstance(action, dict) else str(action)):
+                yield action
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict[str, Any]:
+        wall = self._total_wall or (time.perf_counter() - self._started_wall if self._started_wall else 0.0)
+        return {
+            'script': self.script,
+            'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'wallSeconds': round(wall, 6),
+            'cpuSeconds': round(self._total_cpu, 6),
+            'peakBytes': self._peak_bytes,
+            'actions': self._actions,
+            'actionsPerSecond': round(self._actions / self._action_wall, 1) if self._action_wall else None,
+            'stages': [s.to_dict() for s in self.stages.values()],
+            'slowestActions': [
+                {'id': action_id, 'seconds': round(elapsed, 6)}
+                for elapsed, _, action_id in sorted(self._slowest, reverse=True)
+            ],
+            'cprofile': str(self.cprofile_path) if self.cprofile_path else None,
+        }
+
+    def write(self, path: Path) -> Dict[str, Any]:
+        report = self.report()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+NULL_PROFILER = Profiler(enabled=False)
+
+
+def add_profile_arguments(parser):
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, default=None, metavar='REPORT',
+                       help=f"Active l'instrumentation et écrit le rapport JSON (défaut: {DEFAULT_REPORT})")
+    group.add_argument('--profile-top', type=int, default=10, metavar='N',
+                       help="Nombre d'actions les plus lentes à conserver")
+    group.add_argument('--profile-cprofile', type=Path, default=None, metavar='PSTATS',
+                       help="Écrit aussi un dump cProfile/pstats")
+    group.add_argument('--profile-no-memory', action='store_true',
+                       help="Désactive tracemalloc (réduit le surcoût)")
+    return parser
+
+
+def profiler_from_args(args, script: str = '') -> Profiler:
+    if not getattr(args, 'profile', None):
+        return Profiler(enabled=False, script=script)
+    return Profiler(
+        enabled=True,
+        script=script,
+        top_n=args.profile_top,
+        track_memory=not args.profile_no_memory,
+        cprofile_path=args.profile_cprofile,
+    )
+
+
+def finish_profile(profiler: Profiler, args):
+    """Stop the profiler and write the report requested on the command line."""
+    if not profiler.enabled:
+        return
+    profiler.stop()
+    report = profiler.write(args.profile)
+    print(f"⏱️  Profil écrit dans {args.profile} "
+          f"({report['wallSeconds']:.3f}s, {report['actions']} actions)")
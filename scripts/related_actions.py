@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Offline "see also" links between actions.
+
+Each action becomes a sparse, L2-normalised TF-IDF row over its features:
+tags, tool / cmdlet names (template names and the first word of every
+command) and title words. Neighbours are the top-k rows by cosine
+similarity, plus a small bonus for sharing the category.
+
+The similarity is computed as sparse dot products with NumPy only: rows
+are processed in blocks; for each block the (row, feature) entries are
+expanded through the feature postings into (row, candidate, weight)
+triples, which are summed per pair with bincount. Only pairs sharing a
+feature are ever materialised, never the dense N x N matrix. Features
+present in more than --max-df actions (like stop words, or the "windows"
+tag) are not used to generate candidates; the category is
+applied as a bonus to the candidates found, for the same reason.
+
+The result is stored as a compressed .npz: the ids, an N x k int32
+neighbour matrix (-1 padded) and float16 scores.
+
+Usage:
+    python scripts/related_actions.py --top 8
+    python scripts/related_actions.py --show ad-search-user
+"""
+
+import argparse
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from corpus_client import load_actions
+from seed_corpus import ACTIONS_DIR, SEED_DIR
+
+DEFAULT_OUTPUT = SEED_DIR / 'related-actions.npz'
+DEFAULT_TOP_K = 8
+# Candidate features: df <= 5% of the actions, clamped to [MIN_MAX_DF, MAX_MAX_DF]
+DEFAULT_MAX_DF = 0.05
+MIN_MAX_DF = 20
+MAX_MAX_DF = 1000
+CATEGORY_BONUS = 0.1
+# Target number of (row, candidate) triples expanded per block
+BLOCK_TRIPLES = 2_000_000
+# Accumulate a block densely when block rows x N <= DENSE_RATIO x triples
+DENSE_RATIO = 8
+
+FEATURE_WEIGHTS = {'tag': 1.0, 'cmd': 1.5, 'word': 0.7}
+
+STOP_WORDS = frozenset("""
+les des une pour dans avec sur par aux du de la le un et ou en est sont tous toutes tout
+the and for with from into all
+""".split())
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9_.-]*[a-z0-9]")
+_COMMAND_HEAD = re.compile(r"^[\s$({]*(?:sudo\s+)?([A-Za-z][\w.-]*)")
+
+
+def fold(text: str) -> str:
+    """Lower-case and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def words(text: str) -> List[str]:
+    """Folded words of more than two characters, stop words excluded."""
+    return [w for w in _WORD.findall(fold(text)) if len(w) > 2 and w not in STOP_WORDS]
+
+
+def action_features(action: Dict[str, Any]) -> Dict[str, str]:
+    """{feature: kind} for one action (kind selects the weight in FEATURE_WEIGHTS)."""
+    features = {}
+    for tag in action.get('tags') or []:
+        features['tag:' + fold(tag)] = 'tag'
+    commands = []
+    for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+        template = action.get(key)
+        if isinstance(template, dict):
+            if template.get('name'):
+                features['cmd:' + fold(template['name'])] = 'cmd'
+            commands.append(template.get('commandPattern') or '')
+    for key in ('examples', 'windowsExamples', 'linuxExamples'):
+        commands.extend(e.get('command', '') for e in action.get(key) or [] if isinstance(e, dict))
+    for command in commands:
+        match = _COMMAND_HEAD.match(command)
+        if match:
+            features['cmd:' + fold(match.group(1))] = 'cmd'
+    for word in words(action.get('title') or ''):
+        features.setdefault('word:' + word, 'word')
+    return features
+
+
+class FeatureMatrix:
+    """CSR action x feature matrix with its CSC postings."""
+
+    def __init__(self, actions: Iterable[Dict[str, Any]]):
+        vocabulary: Dict[str, int] = {}
+        kinds: List[str] = []
+        categories: Dict[str, int] = {}
+        self.ids: List[str] = []
+        category_codes = []
+        indptr = [0]
+        indices: List[int] = []
+        for action in actions:
+            self.ids.append(action.get('id', ''))
+            category_codes.append(categories.setdefault(action.get('category', ''), len(categories)))
+            for feature, kind in action_features(action).items():
+                column = vocabulary.get(feature)
+                if column is None:
+                    column = vocabulary[feature] = len(kinds)
+                    kinds.append(kind)
+                indices.append(column)
+            indptr.append(len(indices))
+
+        self.features = list(vocabulary)
+        self.categories = np.asarray(category_codes, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        count = len(self.ids)
+        self.df = np.bincount(self.indices, minlength=len(kinds)).astype(np.int64)
+        kind_weight = np.asarray([FEATURE_WEIGHTS[k] for k in kinds], dtype=np.float32)
+        idf = np.log((1 + count) / (1 + self.df)).astype(np.float32) + 1
+        data = (kind_weight * idf)[self.indices]
+        # L2-normalise each row
+        row_of_entry = np.repeat(np.arange(count), np.diff(self.indptr))
+        norms = np.sqrt(np.bincount(row_of_entry, weights=data.astype(np.float64) ** 2, minlength=count))
+        norms[norms == 0] = 1
+        self.data = (data / norms[row_of_entry]).astype(np.float32)
+        self.rows = row_of_entry
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def postings(self, max_df: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSC (pointer, rows, weights) restricted to features with df <= max_df."""
+        keep = self.df[self.indices] <= max_df
+        columns = self.indices[keep]
+        order = np.argsort(columns, kind='stable')
+        rows = self.rows[keep][order].astype(np.int32)
+        weights = self.data[keep][order]
+        pointer = np.zeros(len(self.df) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(self.df)), out=pointer[1:])
+        return pointer, rows, weights
+
+
+def _expand(pointer: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Positions of all postings of the given columns, concatenated."""
+    starts = pointer[columns]
+    counts = pointer[columns + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(total, dtype=np.int64) + offsets
+
+
+def top_k_neighbours(matrix: FeatureMatrix, k: int = DEFAULT_TOP_K, max_df: Optional[int] = None,
+                     category_bonus: float = CATEGORY_BONUS) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (neighbours, scores), both N x k; missing neighbours are -1 / 0."""
+    count = len(matrix)
+    if max_df is None:
+        max_df = min(MAX_MAX_DF, max(MIN_MAX_DF, int(DEFAULT_MAX_DF * count)))
+    pointer, posting_rows, posting_weights = matrix.postings(max_df)
+    neighbours = np.full((count, k), -1, dtype=np.int32)
+    scores = np.zeros((count, k), dtype=np.float32)
+
+    selective = matrix.df[matrix.indices] <= max_df
+    expanded_per_row = np.bincount(matrix.rows[selective],
+                                   weights=(matrix.df[matrix.indices[selective]]).astype(np.float64),
+                                   minlength=count)
+    cumulative = np.concatenate([[0], np.cumsum(expanded_per_row)])
+
+    start = 0
+    while start < count:
+        # Grow the block until it would expand to about BLOCK_TRIPLES triples
+        end = int(np.searchsorted(cumulative, cumulative[start] + BLOCK_TRIPLES, side='right')) - 1
+        end = min(count, max(end, start + 1))
+        lo, hi = matrix.indptr[start], matrix.indptr[end]
+        entry_rows = matrix.rows[lo:hi]
+        entry_columns = matrix.indices[lo:hi]
+        entry_weights = matrix.data[lo:hi]
+        keep = matrix.df[entry_columns] <= max_df
+        entry_rows, entry_columns, entry_weights = entry_rows[keep], entry_columns[keep], entry_weights[keep]
+
+        positions = _expand(pointer, entry_columns)
+        repeats = pointer[entry_columns + 1] - pointer[entry_columns]
+        pair_rows = np.repeat(entry_rows, repeats).astype(np.int64)
+        candidates = posting_rows[positions].astype(np.int64)
+        weights = np.repeat(entry_weights, repeats) * posting_weights[positions]
+        not_self = candidates != pair_rows
+        pair_rows, candidates, weights = pair_rows[not_self], candidates[not_self], weights[not_self]
+
+        if len(pair_rows):
+            block = end - start
+            local = (pair_rows - start) * count + candidates
+            if block * count <= DENSE_RATIO * len(local):
+                # Summing into a dense (block rows x N) array is cheaper than sorting the keys
+                dense = np.bincount(local, weights=weights, minlength=block * count)
+                keys = np.flatnonzero(dense)
+                pair_scores = dense[keys].astype(np.float32)
+            else:
+                keys, inverse = np.unique(local, return_inverse=True)
+                pair_scores = np.bincount(inverse, weights=weights).astype(np.float32)
+            rows_of_key = start + keys // count
+            candidates_of_key = keys % count
+            pair_scores += category_bonus * (matrix.categories[rows_of_key] == matrix.categories[candidates_of_key])
+            # Sort by row, then by descending score; keys are in candidate order within a row,
+            # so the stable sort breaks ties by lower candidate index (scores are below 4)
+            order = np.argsort(rows_of_key * 4.0 - pair_scores, kind='stable')
+            rows_sorted = rows_of_key[order]
+            group_start = np.searchsorted(rows_sorted, rows_sorted, side='left')
+            rank = np.arange(len(order)) - group_start
+            top = rank < k
+            neighbours[rows_sorted[top], rank[top]] = candidates_of_key[order][top]
+            scores[rows_sorted[top], rank[top]] = pair_scores[order][top]
+        start = end
+
+    return neighbours, scores
+
+
+class RelatedActions:
+    """Neighbour lists loaded from the .npz artifact."""
+
+    def __init__(self, ids: List[str], neighbours: np.ndarray, scores: np.ndarray):
+        self.ids = ids
+        self.neighbours = neighbours
+        self.scores = scores
+        self._positions = {action_id.casefold(): i for i, action_id in enumerate(ids)}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_OUTPUT) -> 'RelatedActions':
+        with np.load(path) as data:
+            ids = bytes(data['ids']).decode('utf-8').split('\n')
+            return cls(ids, data['neighbours'], data['scores'].astype(np.float32))
+
+    def save(self, path: Path = DEFAULT_OUTPUT):
+        np.savez_compressed(
+            path,
+            ids=np.frombuffer('\n'.join(self.ids).encode('utf-8'), dtype=np.uint8),
+            neighbours=self.neighbours,
+            scores=self.scores.astype(np.float16),
+        )
+
+    def related(self, action_id: str) -> List[Tuple[str, float]]:
+        position = self._positions.get(action_id.casefold())
+        if position is None:
+            return []
+        return [(self.ids[n], float(s)) for n, s in zip(self.neighbours[position], self.scores[position]) if n >= 0]
+
+
+def build_related(actions: Iterable[Dict[str, Any]], k: int = DEFAULT_TOP_K,
+                  max_df: Optional[int] = None) -> RelatedActions:
+    matrix = FeatureMatrix(actions)
+    neighbours, scores = top_k_neighbours(matrix, k, max_df)
+    return RelatedActions(matrix.ids, neighbours, scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcule les actions liées (voir aussi)")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_K, help="Voisins par action")
+    parser.add_argument('--max-df', type=int, help="Fréquence documentaire maximale d'une caractéristique")
+    parser.add_argument('--show', nargs='*', metavar='ID', help="Affiche les voisins (sans recalculer)")
+    args = parser.parse_args()
+
+    if args.show is not None:
+        related = RelatedActions.load(args.output)
+        for action_id in args.show:
+            neighbours = related.related(action_id)
+            if not neighbours:
+                print(f"❌ {action_id}: aucune action liée")
+                continue
+            print(f"🔗 {action_id}")
+            for neighbour, score in neighbours:
+                print(f"   {score:.3f}  {neighbour}")
+        return
+
+    started = time.perf_counter()
+    actions = load_actions(args.actions_dir)
+    loaded = time.perf_counter()
+    related = build_related(actions, args.top, args.max_df)
+    computed = time.perf_counter()
+    related.save(args.output)
+    print(f"✅ {len(related.ids)} actions, {args.top} voisins chacune: chargement {loaded - started:.2f}s, "
+          f"calcul {computed - loaded:.2f}s ({args.output}, {args.output.stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the prebuilt seed database (see build_seed_db.py).
+
+Queries are free text: every word must match (accents and case are
+ignored), the last word is matched as a prefix, and hyphenated cmdlets can
+be searched whole ("Get-NetAdapter") or by part ("NetAdapter"). Results are
+ranked with BM25, titles and tags weighing more than notes.
+
+Usage:
+    python scripts/search_seed_db.py "réseau dns"
+    python scripts/search_seed_db.py get-process --examples --limit 5
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from build_seed_db import DEFAULT_OUTPUT
+
+# bm25() weights, one per column (ActionId, Title, Description, Tags, Notes, Commands, Keywords)
+ACTION_WEIGHTS = (0.0, 10.0, 4.0, 6.0, 1.0, 3.0, 2.0)
+# (ActionId, Kind, Position, Command, Description, Keywords)
+EXAMPLE_WEIGHTS = (0.0, 0.0, 0.0, 4.0, 2.0, 1.0)
+
+_TERM = re.compile(r"[\w-]*\w[\w-]*")
+
+
+def fts_query(text: str) -> str:
+    """Turn user input into a safe FTS5 query: quoted terms, last one as a prefix."""
+    terms = [term.strip('-') or term for term in _TERM.findall(text)]
+    if not terms:
+        return ''
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _weights(weights: Tuple[float, ...]) -> str:
+    return ', '.join(str(w) for w in weights)
+
+
+def search_actions(connection: sqlite3.Connection, text: str, limit: int = 20) -> List[Tuple]:
+    """(action id, title, score, snippet) tuples, best match first."""
+    query = fts_query(text)
+    if not query:
+        return []
+    return connection.execute(
+        f"SELECT ActionId, Title, bm25(ActionSearch, {_weights(ACTION_WEIGHTS)}) AS score,"
+        " snippet(ActionSearch, -1, '[', ']', '…', 10)"
+        " FROM ActionSearch WHERE ActionSearch MATCH ? ORDER BY score LIMIT ?",
+        (query, limit)).fetchall()
+
+
+def search_examples(connection: sqlite3.Connection, text: str, limit: int = 20) -> List[Tuple]:
+    """(action id, command, description, score) tuples, best match first."""
+    query = fts_query(text)
+    if not query:
+        return []
+    return connection.execute(
+        f"SELECT ActionId, Command, Description, bm25(ExampleSearch, {_weights(EXAMPLE_WEIGHTS)}) AS score"
+        " FROM ExampleSearch WHERE ExampleSearch MATCH ? ORDER BY score LIMIT ?",
+        (query, limit)).fetchall()
+
+
+def like_search_actions(connection: sqlite3.Connection, text: str) -> List[Tuple]:
+    """Naive LIKE scan equivalent to search_actions, kept as the benchmark baseline.
+
+    LIKE cannot rank, so every match is returned (ordering them is left to
+    the caller) and accents are not folded.
+    """
+    terms = _TERM.findall(text)
+    if not terms:
+        return []
+    clause = ' AND '.join(
+        "(Title LIKE ?1 OR Description LIKE ?1 OR TagsJson LIKE ?1 OR Notes LIKE ?1 OR ExamplesJson LIKE ?1"
+        " OR WindowsExamplesJson LIKE ?1 OR LinuxExamplesJson LIKE ?1)".replace('?1', f'?{i + 1}')
+        for i in range(len(terms)))
+    return connection.execute(
+        f"SELECT Id, Title FROM Actions WHERE {clause}",
+        [f'%{term}%' for term in terms]).fetchall()
+
+
+def like_search_examples(connection: sqlite3.Connection, text: str) -> List[Tuple]:
+    terms = _TERM.findall(text)
+    if not terms:
+        return []
+    clause = ' AND '.join(f"(Command LIKE ?{i + 1} OR Description LIKE ?{i + 1})" for i in range(len(terms)))
+    return connection.execute(
+        f"SELECT ActionId, Command, Description FROM ActionExamples WHERE {clause}",
+        [f'%{term}%' for term in terms]).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recherche plein texte dans la base de seed")
+    parser.add_argument('query', help="Texte recherché")
+    parser.add_argument('--db', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--examples', action='store_true', help="Cherche dans les exemples de commandes")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        parser.error(f"base introuvable: {args.db} (lancez scripts/build_seed_db.py)")
+    connection = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+
+    started = time.perf_counter()
+    if args.examples:
+        rows = search_examples(connection, args.query, args.limit)
+    else:
+        rows = search_actions(connection, args.query, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for row in rows:
+        if args.examples:
+            action_id, command, description, score = row
+            print(f"{score:7.2f}  {action_id:<40} {command}")
+            print(f"{'':49}{description}")
+        else:
+            action_id, title, score, snippet = row
+            print(f"{score:7.2f}  {action_id:<40} {title}")
+            print(f"{'':49}{snippet}")
+    print(f"🔍 {len(rows)} résultat(s) en {elapsed:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
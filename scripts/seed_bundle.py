@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Single-file compressed bundle of the seed corpus.
+
+Layout:
+    magic "TSBUNDLE" | format version (u16) | header length (u32)
+    header: zlib-compressed compact JSON
+        codec, blockSize,
+        blocks: [[offset after the header, compressed length, raw length], ...]
+        files:  [[name, action id, block, offset, length, raw], ...]
+    blocks: compressed (zlib or lzma) concatenations of records
+
+Action files are stored as compact JSON and re-expanded with
+seed_corpus.dumps_action(), which reproduces the source formatting. A file
+that does not round-trip that way (and _index.json, _manifest.json) is stored verbatim, so
+unpacking is always byte-for-byte identical to the packed directory.
+
+Readers decompress only the block holding the requested action.
+
+Usage:
+    python scripts/seed_bundle.py pack data/seed/actions seed.bundle --codec lzma
+    python scripts/seed_bundle.py verify seed.bundle data/seed/actions
+    python scripts/seed_bundle.py unpack seed.bundle out/actions
+"""
+
+import argparse
+import json
+import lzma
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from seed_corpus import ACTIONS_DIR, INDEX_FILE_NAME, dumps_action, iter_action_files, write_text_atomic
+from seed_manifest import MANIFEST_FILE_NAME
+
+MAGIC = b'TSBUNDLE'
+FORMAT_VERSION = 1
+PREFIX = struct.Struct('<8sHI')
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# Committed files of the actions directory besides the actions, stored verbatim
+META_FILE_NAMES = (INDEX_FILE_NAME, MANIFEST_FILE_NAME)
+
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 9), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=9 | lzma.PRESET_EXTREME), lzma.decompress),
+}
+
+# File entry layout: [name, action id, block, offset, length, raw]
+FILE_NAME, FILE_ID, FILE_BLOCK, FILE_OFFSET, FILE_LENGTH, FILE_RAW = range(6)
+
+
+class BundleError(Exception):
+    pass
+
+
+def _encode_record(name: str, text: str) -> Tuple[str, bytes, bool]:
+    """Return (action id, stored bytes, stored verbatim)."""
+    if name in META_FILE_NAMES:
+        return '', text.encode('utf-8'), True
+    data = json.loads(text)
+    action_id = data.get('id', name[:-5]) if isinstance(data, dict) else name[:-5]
+    if dumps_action(data) == text:
+        return action_id, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), False
+    return action_id, text.encode('utf-8'), True
+
+
+def _decode_record(payload: bytes, raw: bool) -> str:
+    text = payload.decode('utf-8')
+    return text if raw else dumps_action(json.loads(text))
+
+
+def bundle_sources(actions_dir: Path = ACTIONS_DIR) -> List[Path]:
+    """Files stored in a bundle: _index.json and _manifest.json followed by the action files."""
+    actions_dir = Path(actions_dir)
+    meta = [actions_dir / name for name in META_FILE_NAMES]
+    return [path for path in meta if path.exists()] + iter_action_files(actions_dir)
+
+
+def pack(actions_dir: Path, output: Path, codec: str = 'lzma',
+         block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[str, Any]:
+    """Write the bundle for actions_dir to output and return its statistics."""
+    compress = CODECS[codec][0]
+    files: List[list] = []
+    blocks: List[List[int]] = []
+    payloads: List[bytes] = []
+    pending = bytearray()
+    source_bytes = 0
+
+    def flush():
+        if pending:
+            compressed = compress(bytes(pending))
+            blocks.append([0, len(compressed), len(pending)])
+            payloads.append(compressed)
+            pending.clear()
+
+    for path in bundle_sources(actions_dir):
+        raw_bytes = path.read_bytes()
+        source_bytes += len(raw_bytes)
+        action_id, record, raw = _encode_record(path.name, raw_bytes.decode('utf-8'))
+        if pending and len(pending) + len(record) > block_size:
+            flush()
+        files.append([path.name, action_id, len(blocks), len(pending), len(record), int(raw)])
+        pending.extend(record)
+    flush()
+
+    offset = 0
+    for block, payload in zip(blocks, payloads):
+        block[0] = offset
+        offset += len(payload)
+    header = {'codec': codec, 'blockSize': block_size, 'blocks': blocks, 'files': files}
+    encoded = zlib.compress(json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 9)
+
+    output = Path(output)
+    tmp_path = output.with_name(output.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        for payload in payloads:
+            f.write(payload)
+    tmp_path.replace(output)
+
+    return {
+        'files': len(files),
+        'blocks': len(blocks),
+        'sourceBytes': source_bytes,
+        'bundleBytes': output.stat().st_size,
+    }
+
+
+class SeedBundle:
+    """Random and sequential access to a bundle; keeps the last decompressed block."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        magic, version, header_length = PREFIX.unpack(self._file.read(PREFIX.size))
+        if magic != MAGIC:
+            raise BundleError(f"{self.path}: ce fichier n'est pas un bundle de seed")
+        if version != FORMAT_VERSION:
+            raise BundleError(f"{self.path}: version de bundle non supportée ({version})")
+        header = json.loads(zlib.decompress(self._file.read(header_length)))
+        self._data_start = PREFIX.size + header_length
+        self.codec = header['codec']
+        self._decompress = CODECS[self.codec][1]
+        self.blocks: List[List[int]] = header['blocks']
+        self.files: List[list] = header['files']
+        self._by_name = {entry[FILE_NAME]: entry for entry in self.files}
+        self._by_id = {entry[FILE_ID].casefold(): entry for entry in self.files if entry[FILE_ID]}
+        self._block_index = -1
+        self._block = b''
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def names(self) -> List[str]:
+        return [entry[FILE_NAME] for entry in self.files]
+
+    def ids(self) -> List[str]:
+        return [entry[FILE_ID] for entry in self.files if entry[FILE_ID]]
+
+    def _read_block(self, index: int) -> bytes:
+        if index != self._block_index:
+            offset, length, _ = self.blocks[index]
+            self._file.seek(self._data_start + offset)
+            self._block = self._decompress(self._file.read(length))
+            self._block_index = index
+        return self._block
+
+    def _read(self, entry: list) -> str:
+        block = self._read_block(entry[FILE_BLOCK])
+        start = entry[FILE_OFFSET]
+        return _decode_record(block[start:start + entry[FILE_LENGTH]], bool(entry[FILE_RAW]))
+
+    def read_text(self, name: str) -> str:
+        """Original text of a file, e.g. read_text('_index.json')."""
+        entry = self._by_name.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return self._read(entry)
+
+    def get(self, action_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        entry = self._by_id.get(action_id.casefold())
+        if entry is None:
+            return default
+        block = self._read_block(entry[FILE_BLOCK])
+        start = entry[FILE_OFFSET]
+        return json.loads(block[start:start + entry[FILE_LENGTH]])
+
+    def iter_texts(self) -> Iterator[Tuple[str, str]]:
+        """(file name, original text) for every file, one decompression per block."""
+        for entry in self.files:
+            yield entry[FILE_NAME], self._read(entry)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for entry in self.files:
+            if entry[FILE_ID]:
+                block = self._read_block(entry[FILE_BLOCK])
+                start = entry[FILE_OFFSET]
+                yield json.loads(block[start:start + entry[FILE_LENGTH]])
+
+
+def unpack(bundle_path: Path, out_dir: Path) -> int:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with SeedBundle(bundle_path) as bundle:
+        for name, text in bundle.iter_texts():
+            write_text_atomic(out_dir / name, text)
+            count += 1
+    return count
+
+
+def verify(bundle_path: Path, actions_dir: Path = ACTIONS_DIR) -> List[str]:
+    """Compare the bundle with a directory byte for byte; return the differences."""
+    sources = {p.name: p for p in bundle_sources(actions_dir)}
+    problems = []
+    with SeedBundle(bundle_path) as bundle:
+        for name, text in bundle.iter_texts():
+            source = sources.pop(name, None)
+            if source is None:
+                problems.append(f"{name}: absent du répertoire")
+            elif source.read_bytes() != text.encode('utf-8'):
+                problems.append(f"{name}: contenu différent")
+    problems.extend(f"{name}: absent du bundle" for name in sorted(sources))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle compressé du corpus d'actions")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = commands.add_parser('pack', help="Crée un bundle à partir d'un répertoire d'actions")
+    pack_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+    pack_parser.add_argument('output', type=Path, nargs='?', default=Path('seed.bundle'))
+    pack_parser.add_argument('--codec', choices=sorted(CODECS), default='lzma')
+    pack_parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE)
+
+    unpack_parser = commands.add_parser('unpack', help="Extrait un bundle dans un répertoire")
+    unpack_parser.add_argument('bundle', type=Path)
+    unpack_parser.add_argument('out_dir', type=Path)
+
+    verify_parser = commands.add_parser('verify', help="Compare un bundle avec un répertoire")
+    verify_parser.add_argument('bundle', type=Path)
+    verify_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        stats = pack(args.actions_dir, args.output, args.codec, args.block_size)
+        ratio = stats['bundleBytes'] / stats['sourceBytes'] * 100
+        print(f"✅ {args.output}: {stats['files']} fichiers en {stats['blocks']} blocs "
+              f"({stats['sourceBytes'] / 1024:.1f} KB -> {stats['bundleBytes'] / 1024:.1f} KB, {ratio:.1f}%)")
+    elif args.command == 'unpack':
+        count = unpack(args.bundle, args.out_dir)
+        print(f"✅ {count} fichiers extraits dans {args.out_dir}")
+    else:
+        problems = verify(args.bundle, args.actions_dir)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("✅ Bundle identique au répertoire")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Compact string-table encoding of the seed corpus.
+
+The per-file JSON repeats a lot of text verbatim: AutoEnricher example
+descriptions, parameter definitions such as "domain" / "contoso.com",
+link targets, and the keys of every object. The compact file stores:
+
+    {
+      "format": "twinshell-compact", "version": 1,
+      "strings": [...],     every distinct string once, most used first
+      "shapes":  [[[key string indexes], "types"], ...]
+      "objects": [[shape, value, ...], ...]
+      "files":   [[name string index, object index or -1, raw text string index or -1], ...]
+    }
+
+A shape is the key order of an object plus one type code per key: "s"
+string index, "o" object index, "S" list of string indexes, "O" list of
+object indexes, "v" literal JSON value (numbers, booleans, null, anything
+else). Objects are hash-consed: identical parameters, examples, links or
+templates are stored once and referenced from every action using them.
+
+Files are rebuilt with seed_corpus.dumps_action(), which reproduces the
+source formatting; a file that does not round-trip that way (and
+_index.json, _manifest.json) is stored as raw text, so unpacking is byte-for-byte
+identical to the packed directory, like seed_bundle.py.
+
+Usage:
+    python scripts/seed_compact.py pack data/seed/actions seed.compact.json
+    python scripts/seed_compact.py verify seed.compact.json data/seed/actions
+    python scripts/seed_compact.py unpack seed.compact.json out/actions
+    python scripts/seed_compact.py report
+"""
+
+import argparse
+import gzip
+import json
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from seed_bundle import META_FILE_NAMES, bundle_sources
+from seed_corpus import ACTIONS_DIR, dumps_action, load_actions, write_text_atomic
+
+FORMAT = 'twinshell-compact'
+FORMAT_VERSION = 1
+
+# File entry layout: [name, object, raw text]
+FILE_NAME, FILE_OBJECT, FILE_RAW = range(3)
+
+
+class CompactError(Exception):
+    pass
+
+
+class _Encoder:
+    """Hash-conses objects and collects strings while walking the actions."""
+
+    def __init__(self):
+        self.string_ids: Dict[str, int] = {}
+        self.shape_ids: Dict[Tuple[Tuple[int, ...], str], int] = {}
+        self.object_ids: Dict[tuple, int] = {}
+        self.objects: List[list] = []
+        # kind -> [objects seen, distinct objects]
+        self.object_counts: Dict[str, List[int]] = {}
+
+    def string(self, text: str) -> int:
+        index = self.string_ids.get(text)
+        if index is None:
+            index = self.string_ids[text] = len(self.string_ids)
+        return index
+
+    def value(self, value: Any, kind: str) -> Tuple[str, Any]:
+        if type(value) is str:
+            return 's', self.string(value)
+        if isinstance(value, dict):
+            return 'o', self.object(value, kind)
+        if isinstance(value, list) and value:
+            if all(type(v) is str for v in value):
+                return 'S', [self.string(v) for v in value]
+            if all(isinstance(v, dict) for v in value):
+                return 'O', [self.object(v, kind) for v in value]
+        return 'v', value
+
+    def object(self, data: Dict[str, Any], kind: str) -> int:
+        """Index of data's object, added when no identical object was seen; kind names it in the statistics."""
+        types, values = [], []
+        for key, value in data.items():
+            code, encoded = self.value(value, key)
+            types.append(code)
+            values.append(encoded)
+        types = ''.join(types)
+        shape_key = (tuple(self.string(key) for key in data), types)
+        shape = self.shape_ids.setdefault(shape_key, len(self.shape_ids))
+        # Literals are keyed by their JSON text so that true and 1 stay distinct
+        identity = (shape,) + tuple(json.dumps(v) if c == 'v' else tuple(v) if c in 'SO' else v
+                                    for c, v in zip(types, values))
+        counts = self.object_counts.setdefault(kind, [0, 0])
+        counts[0] += 1
+        index = self.object_ids.get(identity)
+        if index is None:
+            index = self.object_ids[identity] = len(self.objects)
+            self.objects.append([shape] + values)
+            counts[1] += 1
+        return index
+
+    def string_uses(self, files: List[list]) -> Counter:
+        """References to each string index in the encoded document (keys counted once per shape)."""
+        uses: Counter = Counter()
+        types_of = {}
+        for (keys, types), index in self.shape_ids.items():
+            uses.update(keys)
+            types_of[index] = types
+        for shape, *values in self.objects:
+            for code, value in zip(types_of[shape], values):
+                if code == 's':
+                    uses[value] += 1
+                elif code == 'S':
+                    uses.update(value)
+        for name, _, raw in files:
+            uses[name] += 1
+            if raw >= 0:
+                uses[raw] += 1
+        return uses
+
+
+def _encode_file(encoder: _Encoder, name: str, text: str) -> list:
+    if name not in META_FILE_NAMES:
+        data = json.loads(text)
+        if isinstance(data, dict) and dumps_action(data) == text:
+            return [encoder.string(name), encoder.object(data, 'actions'), -1]
+    return [encoder.string(name), -1, encoder.string(text)]
+
+
+def encode(actions_dir: Path = ACTIONS_DIR) -> Tuple[Dict[str, Any], _Encoder]:
+    """Compact document for actions_dir, and the encoder holding its statistics."""
+    encoder = _Encoder()
+    files = [_encode_file(encoder, path.name, path.read_text(encoding='utf-8'))
+             for path in bundle_sources(actions_dir)]
+
+    # Most used strings first, so that frequent references are short numbers
+    uses = encoder.string_uses(files)
+    order = sorted(encoder.string_ids, key=lambda s: -uses[encoder.string_ids[s]])
+    remap = {encoder.string_ids[s]: i for i, s in enumerate(order)}
+    shapes = [None] * len(encoder.shape_ids)
+    for (keys, types), index in encoder.shape_ids.items():
+        shapes[index] = [[remap[k] for k in keys], types]
+    objects = []
+    for shape, *values in encoder.objects:
+        types = shapes[shape][1]
+        objects.append([shape] + [remap[v] if c == 's' else [remap[i] for i in v] if c == 'S' else v
+                                  for c, v in zip(types, values)])
+    files = [[remap[name], obj, remap[raw] if raw >= 0 else -1] for name, obj, raw in files]
+    document = {'format': FORMAT, 'version': FORMAT_VERSION, 'strings': order,
+                'shapes': shapes, 'objects': objects, 'files': files}
+    return document, encoder
+
+
+def dumps_compact(document: Dict[str, Any]) -> str:
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+
+
+def pack(actions_dir: Path, output: Path) -> Dict[str, Any]:
+    """Write the compact file for actions_dir to output and return its statistics."""
+    document, encoder = encode(actions_dir)
+    write_text_atomic(Path(output), dumps_compact(document))
+    return {
+        'files': len(document['files']),
+        'strings': len(document['strings']),
+        'objects': len(document['objects']),
+        'sourceBytes': sum(p.stat().st_size for p in bundle_sources(actions_dir)),
+        'compactBytes': Path(output).stat().st_size,
+    }
+
+
+class SeedCompact:
+    """Decoded access to a compact file; objects are rebuilt on demand."""
+
+    def __init__(self, document: Dict[str, Any]):
+        if document.get('format') != FORMAT:
+            raise CompactError("ce document n'est pas un seed compact")
+        if document.get('version') != FORMAT_VERSION:
+            raise CompactError(f"version non supportée ({document.get('version')})")
+        self.strings: List[str] = document['strings']
+        self.shapes = [([self.strings[k] for k in keys], types) for keys, types in document['shapes']]
+        self.objects: List[list] = document['objects']
+        self.files: List[list] = document['files']
+        self._shared: Optional[Dict[int, Dict[str, Any]]] = None
+
+    @classmethod
+    def load(cls, path: Path) -> 'SeedCompact':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def names(self) -> List[str]:
+        return [self.strings[entry[FILE_NAME]] for entry in self.files]
+
+    def object(self, index: int, shared: bool = False) -> Dict[str, Any]:
+        """Rebuild object index: a fresh dict, or with shared=True one instance per hash-consed object."""
+        if shared:
+            if self._shared is None:
+                self._shared = {}
+            cached = self._shared.get(index)
+            if cached is not None:
+                return cached
+        shape, *values = self.objects[index]
+        keys, types = self.shapes[shape]
+        strings = self.strings
+        result = {}
+        for key, code, value in zip(keys, types, values):
+            if code == 's':
+                result[key] = strings[value]
+            elif code == 'o':
+                result[key] = self.object(value, shared)
+            elif code == 'S':
+                result[key] = [strings[i] for i in value]
+            elif code == 'O':
+                result[key] = [self.object(i, shared) for i in value]
+            else:
+                result[key] = json.loads(json.dumps(value)) if isinstance(value, (list, dict)) else value
+        if shared:
+            self._shared[index] = result
+        return result
+
+    def read_text(self, entry: list) -> str:
+        if entry[FILE_OBJECT] >= 0:
+            return dumps_action(self.object(entry[FILE_OBJECT]))
+        return self.strings[entry[FILE_RAW]]
+
+    def iter_texts(self) -> Iterator[Tuple[str, str]]:
+        """(file name, original text) for every file."""
+        for entry in self.files:
+            yield self.strings[entry[FILE_NAME]], self.read_text(entry)
+
+    def actions(self, shared: bool = False) -> List[Dict[str, Any]]:
+        """The actions in file order. shared=True reuses identical sub-objects: treat them as read-only."""
+        actions = []
+        for entry in self.files:
+            if entry[FILE_OBJECT] >= 0:
+                actions.append(self.object(entry[FILE_OBJECT], shared))
+            elif self.strings[entry[FILE_NAME]] not in META_FILE_NAMES:
+                actions.append(json.loads(self.strings[entry[FILE_RAW]]))
+        return actions
+
+
+def unpack(compact_path: Path, out_dir: Path) -> int:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for name, text in SeedCompact.load(compact_path).iter_texts():
+        write_text_atomic(out_dir / name, text)
+        count += 1
+    return count
+
+
+def verify(compact_path: Path, actions_dir: Path = ACTIONS_DIR) -> List[str]:
+    """Compare the compact file with a directory byte for byte; return the differences."""
+    sources = {p.name: p for p in bundle_sources(actions_dir)}
+    problems = []
+    for name, text in SeedCompact.load(compact_path).iter_texts():
+        source = sources.pop(name, None)
+        if source is None:
+            problems.append(f"{name}: absent du répertoire")
+        elif source.read_bytes() != text.encode('utf-8'):
+            problems.append(f"{name}: contenu différent")
+    problems.extend(f"{name}: absent du fichier compact" for name in sorted(sources))
+    return problems
+
+
+def _median_ms(run, repeat: int = 5) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        durations.append((time.perf_counter() - started) * 1000)
+    return sorted(durations)[len(durations) // 2]
+
+
+def report(actions_dir: Path = ACTIONS_DIR, top: int = 8) -> Dict[str, Any]:
+    """Sizes, redundancy and load times of the per-file corpus vs its compact encoding."""
+    sources = bundle_sources(actions_dir)
+    texts = [p.read_bytes() for p in sources]
+    document, encoder = encode(actions_dir)
+    compact = dumps_compact(document).encode('utf-8')
+
+    # String occurrences in the source (keys included) vs the string table
+    occurrences: Counter = Counter()
+
+    def walk(value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                occurrences[key] += 1
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif type(value) is str:
+            occurrences[value] += 1
+
+    for path, text in zip(sources, texts):
+        if path.name not in META_FILE_NAMES:
+            walk(json.loads(text))
+    string_bytes = sum(len(s.encode('utf-8')) * n for s, n in occurrences.items())
+    distinct_bytes = sum(len(s.encode('utf-8')) for s in occurrences)
+    repeated = sorted(occurrences.items(), key=lambda item: -(item[1] - 1) * len(item[0].encode('utf-8')))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compact_path = Path(tmp) / 'seed.compact.json'
+        compact_path.write_bytes(compact)
+        load_times = {
+            'perFileMs': round(_median_ms(lambda: load_actions(actions_dir)), 1),
+            'compactMs': round(_median_ms(lambda: SeedCompact.load(compact_path).actions()), 1),
+            'compactSharedMs': round(_median_ms(lambda: SeedCompact.load(compact_path).actions(shared=True)), 1),
+        }
+
+    return {
+        'files': len(sources),
+        'sourceBytes': sum(len(t) for t in texts),
+        'compactBytes': len(compact),
+        'sourceGzipBytes': len(gzip.compress(b''.join(texts), 9)),
+        'compactGzipBytes': len(gzip.compress(compact, 9)),
+        'stringOccurrences': sum(occurrences.values()),
+        'distinctStrings': len(occurrences),
+        'stringBytes': string_bytes,
+        'redundantStringBytes': string_bytes - distinct_bytes,
+        'objects': {kind: {'total': total, 'distinct': distinct}
+                    for kind, (total, distinct) in sorted(encoder.object_counts.items())},
+        'topRepeated': [{'text': text, 'count': count, 'redundantBytes': (count - 1) * len(text.encode('utf-8'))}
+                        for text, count in repeated[:top]],
+        'load': load_times,
+    }
+
+
+def print_report(stats: Dict[str, Any]):
+    kb = lambda size: f"{size / 1024:.1f} KB"
+    print(f"📊 {stats['files']} fichiers: {kb(stats['sourceBytes'])} -> {kb(stats['compactBytes'])} compact "
+          f"({stats['compactBytes'] / stats['sourceBytes'] * 100:.1f}%)")
+    print(f"   gzip: {kb(stats['sourceGzipBytes'])} -> {kb(stats['compactGzipBytes'])}")
+    print(f"   chaînes: {stats['stringOccurrences']} occurrences, {stats['distinctStrings']} distinctes; "
+          f"{kb(stats['redundantStringBytes'])} répétées sur {kb(stats['stringBytes'])} "
+          f"({stats['redundantStringBytes'] / stats['stringBytes'] * 100:.1f}%)")
+    print("   objets (total -> distincts):")
+    for kind, counts in stats['objects'].items():
+        print(f"      {kind:<24} {counts['total']:6d} -> {counts['distinct']:6d}")
+    print("   chaînes les plus répétées:")
+    for entry in stats['topRepeated']:
+        text = entry['text'] if len(entry['text']) <= 60 else entry['text'][:57] + '...'
+        print(f"      {kb(entry['redundantBytes']):>9}  x{entry['count']:<5d} {text!r}")
+    load = stats['load']
+    print(f"⏱️  chargement: fichiers {load['perFileMs']:.0f} ms, compact {load['compactMs']:.0f} ms, "
+          f"compact partagé {load['compactSharedMs']:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encodage compact (table de chaînes) du corpus d'actions")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = commands.add_parser('pack', help="Crée le fichier compact d'un répertoire d'actions")
+    pack_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+    pack_parser.add_argument('output', type=Path, nargs='?', default=Path('seed.compact.json'))
+
+    unpack_parser = commands.add_parser('unpack', help="Extrait un fichier compact dans un répertoire")
+    unpack_parser.add_argument('compact', type=Path)
+    unpack_parser.add_argument('out_dir', type=Path)
+
+    verify_parser = commands.add_parser('verify', help="Compare un fichier compact avec un répertoire")
+    verify_parser.add_argument('compact', type=Path)
+    verify_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+
+    report_parser = commands.add_parser('report', help="Taille, redondance et temps de chargement")
+    report_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+    report_parser.add_argument('--output', type=Path, help="Écrit le rapport au format JSON")
+
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        stats = pack(args.actions_dir, args.output)
+        ratio = stats['compactBytes'] / stats['sourceBytes'] * 100
+        print(f"✅ {args.output}: {stats['files']} fichiers, {stats['strings']} chaînes, {stats['objects']} objets "
+              f"({stats['sourceBytes'] / 1024:.1f} KB -> {stats['compactBytes'] / 1024:.1f} KB, {ratio:.1f}%)")
+    elif args.command == 'unpack':
+        count = unpack(args.compact, args.out_dir)
+        print(f"✅ {count} fichiers extraits dans {args.out_dir}")
+    elif args.command == 'verify':
+        problems = verify(args.compact, args.actions_dir)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("✅ Fichier compact identique au répertoire")
+    else:
+        stats = report(args.actions_dir)
+        print_report(stats)
+        if args.output:
+            write_text_atomic(args.output, json.dumps(stats, ensure_ascii=False, indent=2))
+            print(f"💾 Rapport: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
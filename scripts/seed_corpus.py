@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Shared helpers to read and write the TwinShell seed corpus.
+
+The app seeds from one JSON file per action in data/seed/actions/ (files
+whose name starts with "_" such as _index.json are skipped by
+JsonSeedService) and from data/seed/initial-batches.json.
+"""
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+from seed_models import Action, Batch
+
+SEED_DIR = Path(__file__).resolve().parent.parent / 'data' / 'seed'
+ACTIONS_DIR = SEED_DIR / 'actions'
+BATCHES_FILE = SEED_DIR / 'initial-batches.json'
+INDEX_FILE_NAME = '_index.json'
+INDEX_VERSION = '2.0'
+INDEX_FORMAT = 'individual-files'
+
+_TAG_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def _read_umask() -> int:
+    # os.umask() can only be read by setting it; done once here, before any
+    # writer thread exists, since the temporary umask is process-wide.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Mode given to files created by open_atomic(), as open() would
+_NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def dumps_action(data: Any) -> str:
+    """Serialize a record exactly the way the seed files are formatted."""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def is_action_file(path: Path) -> bool:
+    return path.suffix == '.json' and not path.name.startswith('_')
+
+
+def iter_action_files(actions_dir: Path = ACTIONS_DIR) -> List[Path]:
+    """Return the action files in the order the app imports them."""
+    return sorted(p for p in Path(actions_dir).iterdir() if is_action_file(p))
+
+
+def sidecar_path(actions_dir: Path, suffix: str) -> Path:
+    """Generated file about an actions directory, stored next to it rather than shipped inside it.
+
+    data/seed/actions + '_catalog.json' -> data/seed/_actions_catalog.json
+    """
+    actions_dir = Path(actions_dir).resolve()
+    return actions_dir.with_name(f"_{actions_dir.name}{suffix}")
+
+
+def load_action(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_actions(actions_dir: Path = ACTIONS_DIR, models: bool = False) -> Iterator[Any]:
+    """Yield each action as a dict, or as a seed_models.Action when models=True."""
+    for path in iter_action_files(actions_dir):
+        action = load_action(path)
+        yield Action.from_dict(action) if models else action
+
+
+def load_actions(actions_dir: Path = ACTIONS_DIR, models: bool = False) -> List[Any]:
+    return list(iter_actions(actions_dir, models))
+
+
+def load_index(actions_dir: Path = ACTIONS_DIR) -> Dict[str, Any]:
+    with open(Path(actions_dir) / INDEX_FILE_NAME, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_batches(path: Path = BATCHES_FILE, models: bool = False) -> List[Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    batches = data.get('batches', [])
+    return [Batch.from_dict(b) for b in batches] if models else batches
+
+
+def normalize_tag(tag: str) -> str:
+    """Canonical tag: trimmed, lower-case, words joined by single hyphens ("Windows Update" -> "windows-update")."""
+    return _TAG_SEPARATORS.sub('-', tag.strip().lower()).strip('-')
+
+
+def merge_tags(*tag_lists: Iterable[str]) -> List[str]:
+    """Normalised union of tag lists, in first-seen order (empty tags are dropped)."""
+    merged = {}
+    for tags in tag_lists:
+        for tag in tags or ():
+            normalized = normalize_tag(tag)
+            if normalized:
+                merged.setdefault(normalized, None)
+    return list(merged)
+
+
+@contextmanager
+def open_atomic(path: Path) -> Iterator[TextIO]:
+    """Open path for writing through a temporary file, renamed over path only if the block succeeds."""
+    path = Path(path)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = _NEW_FILE_MODE
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.' + path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            yield f
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def write_text_atomic(path: Path, text: str):
+    """Write through a temporary file so readers never see a partial file."""
+    with open_atomic(path) as f:
+        f.write(text)
+
+
+def write_index(actions_dir: Path, ids: Iterable[str], count: int, version: str = INDEX_VERSION):
+    """Stream _index.json for count ids, formatted like dumps_action()."""
+    with open_atomic(Path(actions_dir) / INDEX_FILE_NAME) as f:
+        f.write(f'{{\n  "version": {json.dumps(version)},\n  "format": "{INDEX_FORMAT}",\n')
+        f.write(f'  "totalActions": {count},\n  "actions": [')
+        for position, action_id in enumerate(ids):
+            f.write(',' if position else '')
+            f.write('\n    ' + json.dumps(action_id, ensure_ascii=False))
+        f.write('\n  ]\n}' if count else ']\n}')
+
+
+def write_action(path: Path, action: Any):
+    if isinstance(action, Action):
+        action = action.to_dict()
+    write_text_atomic(path, dumps_action(action))
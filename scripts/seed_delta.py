@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Delta packages between two versions of the seed corpus.
+
+A seed directory is data/seed/: actions/*.json, actions/_index.json,
+actions/_manifest.json and initial-batches.json. Files are compared by SHA-256; the delta lists the
+added files (full text), the removed ones and, for changed files, a
+field-level JSON Patch (RFC 6902 add / remove / replace). When the patched
+document would not re-serialize to the exact target text (hand-formatted
+files such as initial-batches.json, or reordered keys) a line-level text
+patch is stored instead. Applying a delta therefore reproduces the target
+byte for byte; source and result hashes are checked on both sides.
+
+The delta also carries a readable summary of added / removed / changed
+action and batch ids.
+
+Usage:
+    python scripts/seed_delta.py diff old/data/seed data/seed -o seed-1.1.delta.json.gz
+    python scripts/seed_delta.py apply data/seed seed-1.1.delta.json.gz --output /tmp/seed-1.1
+"""
+
+import argparse
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from seed_corpus import INDEX_FILE_NAME, SEED_DIR, dumps_action, is_action_file, write_text_atomic
+from seed_manifest import MANIFEST_FILE_NAME
+
+DELTA_FORMAT = 'twinshell-seed-delta'
+DELTA_VERSION = 1
+BATCHES_PATH = 'initial-batches.json'
+# Committed files of the actions directory besides the actions themselves
+ACTIONS_META_FILES = (INDEX_FILE_NAME, MANIFEST_FILE_NAME)
+
+
+class DeltaError(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+# Corpus snapshot
+# ----------------------------------------------------------------------
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def seed_files(seed_dir: Path) -> List[str]:
+    """Paths (relative to seed_dir, '/'-separated) of the files a delta covers."""
+    seed_dir = Path(seed_dir)
+    paths = []
+    actions_dir = seed_dir / 'actions'
+    if actions_dir.is_dir():
+        for path in sorted(actions_dir.iterdir()):
+            if is_action_file(path) or path.name in ACTIONS_META_FILES:
+                paths.append(f"actions/{path.name}")
+    if (seed_dir / BATCHES_PATH).exists():
+        paths.append(BATCHES_PATH)
+    return paths
+
+
+def read_text(path: Path) -> str:
+    return Path(path).read_bytes().decode('utf-8')
+
+
+def snapshot(seed_dir: Path) -> Dict[str, str]:
+    """{relative path: sha256} for every file of a seed directory."""
+    seed_dir = Path(seed_dir)
+    return {rel: sha256_hex((seed_dir / rel).read_bytes()) for rel in seed_files(seed_dir)}
+
+
+def root_hash(hashes: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for rel in sorted(hashes):
+        digest.update(f"{rel}\0{hashes[rel]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# JSON Patch
+# ----------------------------------------------------------------------
+
+def _pointer(path: str, token: Any) -> str:
+    return f"{path}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+
+def _same(a: Any, b: Any) -> bool:
+    # True == 1 in Python but not in JSON
+    return type(a) is type(b) and a == b
+
+
+def json_diff(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """RFC 6902 operations turning old into new."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({'op': 'remove', 'path': _pointer(path, key)})
+            elif not _same(old[key], new[key]):
+                ops.extend(json_diff(old[key], new[key], _pointer(path, key)))
+        for key in new:
+            if key not in old:
+                ops.append({'op': 'add', 'path': _pointer(path, key), 'value': new[key]})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _list_diff(old, new, path)
+    if _same(old, new):
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _list_diff(old: list, new: list, path: str) -> List[Dict[str, Any]]:
+    start = 0
+    while start < len(old) and start < len(new) and _same(old[start], new[start]):
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and _same(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+    paired = min(old_end, new_end) - start
+    ops = []
+    for i in range(start, start + paired):
+        ops.extend(json_diff(old[i], new[i], _pointer(path, i)))
+    for i in reversed(range(start + paired, old_end)):
+        ops.append({'op': 'remove', 'path': _pointer(path, i)})
+    for i in range(start + paired, new_end):
+        ops.append({'op': 'add', 'path': _pointer(path, i), 'value': new[i]})
+    return ops
+
+
+def _resolve(doc: Any, pointer: str) -> Tuple[Any, Any]:
+    """Return (parent container, last token) for a JSON pointer."""
+    tokens = [t.replace('~1', '/').replace('~0', '~') for t in pointer.split('/')[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    last = tokens[-1]
+    return parent, int(last) if isinstance(parent, list) and last != '-' else last
+
+
+def apply_json_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply add / remove / replace operations in place and return the document."""
+    for op in ops:
+        if op['path'] == '':
+            if op['op'] == 'remove':
+                raise DeltaError("impossible de supprimer la racine du document")
+            doc = op['value']
+            continue
+        try:
+            parent, key = _resolve(doc, op['path'])
+            if op['op'] == 'add':
+                if isinstance(parent, list):
+                    parent.insert(len(parent) if key == '-' else key, op['value'])
+                else:
+                    parent[key] = op['value']
+            elif op['op'] == 'remove':
+                del parent[key]
+            elif op['op'] == 'replace':
+                parent[key] = op['value']
+            else:
+                raise DeltaError(f"opération non supportée: {op['op']}")
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise DeltaError(f"patch inapplicable en {op['path']}: {e}") from e
+    return doc
+
+
+# ----------------------------------------------------------------------
+# Text patch (fallback for hand-formatted files)
+# ----------------------------------------------------------------------
+
+def text_diff(old: str, new: str) -> List[list]:
+    """[[first old line, end old line, [new lines]], ...] for every changed hunk."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [[i1, i2, new_lines[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def apply_text_patch(old: str, hunks: List[list]) -> str:
+    lines = old.splitlines(keepends=True)
+    result = []
+    position = 0
+    for start, end, replacement in hunks:
+        result.extend(lines[position:start])
+        result.extend(replacement)
+        position = end
+    result.extend(lines[position:])
+    return ''.join(result)
+
+
+def file_patch(old_text: str, new_text: str) -> Dict[str, Any]:
+    """Smallest exact patch entry for one file: JSON Patch when it reproduces new_text."""
+    try:
+        old_doc, new_doc = json.loads(old_text), json.loads(new_text)
+    except ValueError:
+        old_doc = new_doc = None
+    if old_doc is not None and dumps_action(new_doc) == new_text:
+        ops = json_diff(old_doc, new_doc)
+        if dumps_action(apply_json_patch(json.loads(old_text), ops)) == new_text:
+            return {'jsonPatch': ops}
+    return {'textPatch': text_diff(old_text, new_text)}
+
+
+def apply_file_patch(old_text: str, entry: Dict[str, Any]) -> str:
+    if 'jsonPatch' in entry:
+        return dumps_action(apply_json_patch(json.loads(old_text), entry['jsonPatch']))
+    return apply_text_patch(old_text, entry['textPatch'])
+
+
+# ----------------------------------------------------------------------
+# Delta packages
+# ----------------------------------------------------------------------
+
+def _ids(text: str, rel: str) -> List[str]:
+    """Action or batch ids described by a file, for the summary."""
+    data = json.loads(text)
+    if rel == BATCHES_PATH:
+        return [b.get('id', '') for b in data.get('batches', [])]
+    return [data.get('id', rel)]
+
+
+def _batches_by_id(text: Optional[str]) -> Dict[str, Any]:
+    if text is None:
+        return {}
+    return {b.get('id'): b for b in json.loads(text).get('batches', [])}
+
+
+def create_delta(old_dir: Path, new_dir: Path) -> Dict[str, Any]:
+    old_dir, new_dir = Path(old_dir), Path(new_dir)
+    old_hashes, new_hashes = snapshot(old_dir), snapshot(new_dir)
+    added, removed, changed = {}, {}, {}
+    summary = {kind: {'added': [], 'removed': [], 'changed': []} for kind in ('actions', 'batches')}
+
+    for rel in sorted(set(old_hashes) | set(new_hashes)):
+        before, after = old_hashes.get(rel), new_hashes.get(rel)
+        if before == after:
+            continue
+        is_action = rel.startswith('actions/') and is_action_file(Path(rel))
+        if before is None:
+            text = read_text(new_dir / rel)
+            added[rel] = text
+            if is_action:
+                summary['actions']['added'].extend(_ids(text, rel))
+        elif after is None:
+            removed[rel] = before
+            if is_action:
+                summary['actions']['removed'].extend(_ids(read_text(old_dir / rel), rel))
+        else:
+            old_text, new_text = read_text(old_dir / rel), read_text(new_dir / rel)
+            changed[rel] = {'from': before, 'to': after, **file_patch(old_text, new_text)}
+            if is_action:
+                summary['actions']['changed'].extend(_ids(new_text, rel))
+
+    if BATCHES_PATH in added or BATCHES_PATH in removed or BATCHES_PATH in changed:
+        old_batches = _batches_by_id(read_text(old_dir / BATCHES_PATH) if BATCHES_PATH in old_hashes else None)
+        new_batches = _batches_by_id(read_text(new_dir / BATCHES_PATH) if BATCHES_PATH in new_hashes else None)
+        summary['batches']['added'] = [i for i in new_batches if i not in old_batches]
+        summary['batches']['removed'] = [i for i in old_batches if i not in new_batches]
+        summary['batches']['changed'] = [i for i in new_batches
+                                         if i in old_batches and old_batches[i] != new_batches[i]]
+
+    return {
+        'format': DELTA_FORMAT,
+        'version': DELTA_VERSION,
+        'baseHash': root_hash(old_hashes),
+        'targetHash': root_hash(new_hashes),
+        'summary': summary,
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+    }
+
+
+def apply_delta(seed_dir: Path, delta: Dict[str, Any], output_dir: Optional[Path] = None) -> Path:
+    """Apply delta to seed_dir (in place, or onto a copy in output_dir)."""
+    if delta.get('format') != DELTA_FORMAT or delta.get('version') != DELTA_VERSION:
+        raise DeltaError("format de delta non reconnu")
+    seed_dir = Path(seed_dir)
+    hashes = snapshot(seed_dir)
+    if root_hash(hashes) != delta['baseHash']:
+        mismatched = [rel for rel, h in {**delta['removed'],
+                                         **{r: e['from'] for r, e in delta['changed'].items()}}.items()
+                      if hashes.get(rel) != h]
+        raise DeltaError(f"le corpus ne correspond pas à la version de base du delta ({len(mismatched)} "
+                         f"fichier(s) modifié(s) localement, ex. {mismatched[:3]})")
+
+    # Compute every result before writing anything
+    results = {rel: text for rel, text in delta['added'].items()}
+    for rel, entry in delta['changed'].items():
+        text = apply_file_patch(read_text(seed_dir / rel), entry)
+        if sha256_hex(text.encode('utf-8')) != entry['to']:
+            raise DeltaError(f"{rel}: le résultat du patch ne correspond pas au hash attendu")
+        results[rel] = text
+
+    target = Path(output_dir) if output_dir else seed_dir
+    if output_dir:
+        for rel in hashes:
+            destination = target / rel
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(seed_dir / rel, destination)
+    for rel in delta['removed']:
+        os.remove(target / rel)
+    for rel, text in results.items():
+        (target / rel).parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(target / rel, text)
+
+    if root_hash(snapshot(target)) != delta['targetHash']:
+        raise DeltaError(f"{target}: le corpus obtenu ne correspond pas à la version cible")
+    return target
+
+
+def save_delta(delta: Dict[str, Any], path: Path):
+    data = json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if str(path).endswith('.gz'):
+        data = gzip.compress(data, 9, mtime=0)
+    Path(path).write_bytes(data)
+
+
+def load_delta(path: Path) -> Dict[str, Any]:
+    data = Path(path).read_bytes()
+    if str(path).endswith('.gz'):
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta entre deux versions du corpus de seed")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    diff_parser = commands.add_parser('diff', help="Crée un delta entre deux répertoires data/seed")
+    diff_parser.add_argument('old_dir', type=Path)
+    diff_parser.add_argument('new_dir', type=Path, nargs='?', default=SEED_DIR)
+    diff_parser.add_argument('-o', '--output', type=Path, default=Path('seed.delta.json.gz'),
+                             help="Fichier delta (compressé en gzip si le nom finit par .gz)")
+
+    apply_parser = commands.add_parser('apply', help="Applique un delta à un répertoire data/seed")
+    apply_parser.add_argument('seed_dir', type=Path)
+    apply_parser.add_argument('delta', type=Path)
+    apply_parser.add_argument('--output', type=Path, help="Écrit le résultat ailleurs (copie)")
+
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        delta = create_delta(args.old_dir, args.new_dir)
+        save_delta(delta, args.output)
+        for kind, changes in delta['summary'].items():
+            print(f"📊 {kind}: +{len(changes['added'])} -{len(changes['removed'])} ~{len(changes['changed'])}")
+        print(f"💾 Delta écrit dans {args.output} ({args.output.stat().st_size / 1024:.1f} KB)")
+    else:
+        try:
+            target = apply_delta(args.seed_dir, load_delta(args.delta), args.output)
+        except DeltaError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        print(f"✅ Delta appliqué: {target}")
+
+
+if __name__ == '__main__':
+    main()
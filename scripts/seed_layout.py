@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Convert between the monolithic and the per-file layouts of the corpus.
+
+Older tooling and backups keep every action in one document
+(initial-actions.json, the app's exports: {"schemaVersion": ..., "actions":
+[...]}), while the app reads one file per action from data/seed/actions.
+
+split streams the document with JSONDecoder.raw_decode over a sliding
+buffer: one action is decoded at a time, the other top-level keys are kept
+as metadata, and the files are written by a thread pool with a bounded
+queue through atomic renames. _index.json lists the actions in document
+order. join streams the other way, in _index.json order (then files
+missing from the index), one action in memory at a time. Memory stays flat
+whatever the input size, apart from the set of ids used to reject
+duplicates (a few dozen bytes per action).
+
+Both directions keep the seed formatting: join writes what
+json.dumps(document, ensure_ascii=False, indent=2) would, and splitting
+that output gives back the same action files and _index.json.
+
+Usage:
+    python scripts/seed_layout.py split data/seed/initial-actions.json data/seed/actions
+    python scripts/seed_layout.py join data/seed/actions initial-actions.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from seed_corpus import (ACTIONS_DIR, INDEX_FILE_NAME, INDEX_VERSION, dumps_action, iter_action_files,
+                         load_action, load_index, open_atomic, write_index, write_text_atomic)
+
+ACTIONS_KEY = 'actions'
+CHUNK_SIZE = 1 << 20
+# Action ids become file names
+INVALID_ID_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]|^[._]|^$')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class LayoutError(Exception):
+    pass
+
+
+class ArrayStream:
+    """Iterates the items of one array of a JSON document without loading the document.
+
+    The array is the top-level value itself, or the value of key in a
+    top-level object; the object's other members end up in metadata once
+    they have been read.
+    """
+
+    def __init__(self, f: TextIO, key: str = ACTIONS_KEY, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.key = key
+        self.chunk_size = chunk_size
+        self.metadata: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping the consumed text; False at end of file."""
+        if self._eof:
+            return False
+        # Items larger than the buffer need fewer retries when reads grow with them
+        chunk = self.f.read(max(self.chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str, pos: Optional[int] = None) -> LayoutError:
+        return LayoutError(f"{message} (caractère {self._offset + (self._pos if pos is None else pos)})")
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise self._error(f"'{char}' attendu")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise self._error(f"JSON invalide: {e.msg}", e.pos) from None
+            self._fill()
+
+    def _array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise self._error("',' ou ']' attendu", self._pos - 1)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._peek() == '[':
+            yield from self._array()
+        else:
+            self._expect('{')
+            if self._peek() == '}':
+                self._pos += 1
+            else:
+                while True:
+                    key = self._value()
+                    if not isinstance(key, str):
+                        raise self._error("clé attendue")
+                    self._expect(':')
+                    if key == self.key and self._peek() == '[':
+                        yield from self._array()
+                    else:
+                        self.metadata[key] = self._value()
+                    separator = self._peek()
+                    self._pos += 1
+                    if separator == '}':
+                        break
+                    if separator != ',':
+                        raise self._error("',' ou '}' attendu", self._pos - 1)
+        if self._peek():
+            raise self._error("contenu après la fin du document")
+
+
+def split(source: Path, actions_dir: Path, workers: int = 0, prune: bool = False,
+          key: str = ACTIONS_KEY) -> Dict[str, Any]:
+    """Write one file per action of the source document, then _index.json; return a summary.
+
+    Invalid ids and duplicates (case-insensitive, the first one wins) are
+    reported in problems. With prune, action files absent from the source
+    are deleted, otherwise they are counted in stale.
+    """
+    actions_dir = Path(actions_dir)
+    actions_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or min(8, (os.cpu_count() or 1) * 2)
+    problems: List[str] = []
+    seen = set()
+    count = 0
+    with open(source, 'r', encoding='utf-8') as f, \
+            tempfile.TemporaryFile('w+', encoding='utf-8') as id_spool, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        stream = ArrayStream(f, key)
+        pending = deque()
+        for position, action in enumerate(stream):
+            action_id = action.get('id') if isinstance(action, dict) else None
+            if not isinstance(action_id, str) or INVALID_ID_RE.search(action_id):
+                problems.append(f"action {position}: id invalide {action_id!r}")
+                continue
+            if action_id.casefold() in seen:
+                problems.append(f"action {position}: id en double {action_id}")
+                continue
+            seen.add(action_id.casefold())
+            id_spool.write(action_id + '\n')
+            count += 1
+            pending.append(pool.submit(write_text_atomic, actions_dir / f"{action_id}.json", dumps_action(action)))
+            while len(pending) >= workers * 4:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
+        id_spool.seek(0)
+        version = stream.metadata.get('schemaVersion') or stream.metadata.get('version') or INDEX_VERSION
+        write_index(actions_dir, (line.rstrip('\n') for line in id_spool), count, version)
+
+    stale = [p for p in iter_action_files(actions_dir) if p.stem.casefold() not in seen]
+    if prune:
+        for path in stale:
+            path.unlink()
+    return {
+        'actions': count,
+        'problems': problems,
+        'stale': len(stale),
+        'pruned': len(stale) if prune else 0,
+        'metadata': stream.metadata,
+    }
+
+
+def ordered_files(actions_dir: Path, index: Optional[Dict[str, Any]] = None) -> List[Path]:
+    """Action files in _index.json order, followed by the files missing from it (like LazyCorpus.ids)."""
+    files = {p.stem.casefold(): p for p in iter_action_files(actions_dir)}
+    ordered = []
+    for action_id in (index or {}).get('actions', []):
+        path = files.pop(action_id.casefold(), None)
+        if path is not None:
+            ordered.append(path)
+    return ordered + sorted(files.values())
+
+
+def join(actions_dir: Path, output: Path, key: str = ACTIONS_KEY) -> Dict[str, Any]:
+    """Stream every action file into one document at output; return a summary."""
+    actions_dir = Path(actions_dir)
+    index = load_index(actions_dir) if (actions_dir / INDEX_FILE_NAME).exists() else {}
+    paths = ordered_files(actions_dir, index)
+    version = index.get('version', INDEX_VERSION)
+    with open_atomic(output) as f:
+        f.write(f'{{\n  "schemaVersion": {json.dumps(version)},\n  "totalActions": {len(paths)},\n  "{key}": [')
+        for position, path in enumerate(paths):
+            f.write(',' if position else '')
+            f.write('\n    ' + dumps_action(load_action(path)).replace('\n', '\n    '))
+        f.write('\n  ]\n}' if paths else ']\n}')
+    return {'actions': len(paths), 'version': version}
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where the resource module is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def memory_note() -> str:
+    peak = peak_memory_mb()
+    return f", pic mémoire {peak:.0f} MB" if peak is not None else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversion entre fichier monolithique et un fichier par action")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    split_parser = commands.add_parser('split', help="Découpe un fichier monolithique en fichiers d'actions")
+    split_parser.add_argument('source', type=Path)
+    split_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+    split_parser.add_argument('--workers', type=int, default=0, help="Threads d'écriture (0 = automatique)")
+    split_parser.add_argument('--prune', action='store_true',
+                              help="Supprime les fichiers d'actions absents de la source")
+
+    join_parser = commands.add_parser('join', help="Assemble les fichiers d'actions en un fichier monolithique")
+    join_parser.add_argument('actions_dir', type=Path, nargs='?', default=ACTIONS_DIR)
+    join_parser.add_argument('output', type=Path)
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        if args.command == 'split':
+            summary = split(args.source, args.actions_dir, args.workers, args.prune)
+        else:
+            summary = join(args.actions_dir, args.output)
+    except LayoutError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    elapsed = time.perf_counter() - started
+
+    if args.command == 'split':
+        print(f"✅ {summary['actions']} actions écrites dans {args.actions_dir} + {INDEX_FILE_NAME} "
+              f"({elapsed:.1f} s{memory_note()})")
+        for problem in summary['problems']:
+            print(f"⚠️  {problem}")
+        if summary['pruned']:
+            print(f"🗑️  {summary['pruned']} fichier(s) absent(s) de la source supprimé(s)")
+        elif summary['stale']:
+            print(f"⚠️  {summary['stale']} fichier(s) absent(s) de la source conservé(s) (--prune pour les supprimer)")
+    else:
+        size = args.output.stat().st_size / (1024 * 1024)
+        print(f"✅ {summary['actions']} actions assemblées dans {args.output} ({size:.1f} MB, {elapsed:.1f} s"
+              f"{memory_note()})")
+
+
+if __name__ == '__main__':
+    main()
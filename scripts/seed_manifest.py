@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Integrity manifest for data/seed/actions (actions/_manifest.json).
+
+For every action file the manifest records its SHA-256, size and schema
+version (the file's own "schemaVersion", else the corpus version from
+_index.json), plus the hash of _index.json and a root hash over all of
+them. Comparing the root hash tells whether anything changed;
+changed_files() then lists the entries to re-import.
+
+Hashes come from the lazy_corpus catalog, which only re-reads files whose
+size or mtime changed, so regenerating an up-to-date manifest takes a few
+milliseconds. The manifest itself holds no timestamps and is rewritten only
+when its content changes.
+
+Usage:
+    python scripts/seed_manifest.py            # update the manifest
+    python scripts/seed_manifest.py --check    # exit 1 if it is out of date
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lazy_corpus import ENTRY_SCHEMA, ENTRY_SHA256, ENTRY_SIZE, ActionCatalog
+from seed_corpus import ACTIONS_DIR, INDEX_FILE_NAME, dumps_action, write_text_atomic
+
+MANIFEST_FILE_NAME = '_manifest.json'
+MANIFEST_VERSION = 1
+DEFAULT_SCHEMA_VERSION = '1.0'
+
+
+def compute_root_hash(index_sha256: str, files: Dict[str, Dict[str, Any]]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{INDEX_FILE_NAME}\0{index_sha256}\n".encode('utf-8'))
+    for name in sorted(files):
+        digest.update(f"{name}\0{files[name]['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_manifest(actions_dir: Path = ACTIONS_DIR) -> Dict[str, Any]:
+    actions_dir = Path(actions_dir)
+    catalog = ActionCatalog.load(actions_dir, refresh=True)
+    index_raw = (actions_dir / INDEX_FILE_NAME).read_bytes()
+    schema_version = json.loads(index_raw).get('version', DEFAULT_SCHEMA_VERSION)
+    index_sha256 = hashlib.sha256(index_raw).hexdigest()
+
+    files = {}
+    for stem in sorted(catalog.entries):
+        entry = catalog.entries[stem]
+        files[f"{stem}.json"] = {
+            'sha256': entry[ENTRY_SHA256],
+            'size': entry[ENTRY_SIZE],
+            'schemaVersion': entry[ENTRY_SCHEMA] or schema_version,
+        }
+    return {
+        'version': MANIFEST_VERSION,
+        'schemaVersion': schema_version,
+        'rootHash': compute_root_hash(index_sha256, files),
+        'totalFiles': len(files),
+        'index': {'sha256': index_sha256, 'size': len(index_raw)},
+        'files': files,
+    }
+
+
+def load_manifest(actions_dir: Path = ACTIONS_DIR) -> Optional[Dict[str, Any]]:
+    try:
+        with open(Path(actions_dir) / MANIFEST_FILE_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_manifest(actions_dir: Path = ACTIONS_DIR) -> Tuple[Dict[str, Any], bool]:
+    """Regenerate the manifest; return it and whether the file had to be rewritten."""
+    manifest = build_manifest(actions_dir)
+    path = Path(actions_dir) / MANIFEST_FILE_NAME
+    text = dumps_action(manifest)
+    try:
+        current = path.read_text(encoding='utf-8')
+    except OSError:
+        current = None
+    written = current != text
+    if written:
+        write_text_atomic(path, text)
+    return manifest, written
+
+
+def changed_files(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Files to re-import when going from manifest old to manifest new."""
+    if old and old.get('rootHash') == new['rootHash']:
+        return {'added': [], 'removed': [], 'changed': []}
+    old_files = old.get('files', {}) if old else {}
+    new_files = new['files']
+    return {
+        'added': sorted(n for n in new_files if n not in old_files),
+        'removed': sorted(n for n in old_files if n not in new_files),
+        'changed': sorted(n for n in new_files
+                          if n in old_files and old_files[n]['sha256'] != new_files[n]['sha256']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manifeste d'intégrité du corpus d'actions")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--check', action='store_true',
+                        help="Vérifie que le manifeste est à jour sans l'écrire (code 1 sinon)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.check:
+        current = load_manifest(args.actions_dir)
+        manifest = build_manifest(args.actions_dir)
+        elapsed = (time.perf_counter() - started) * 1000
+        diff = changed_files(current, manifest)
+        if current == manifest:
+            print(f"✅ Manifeste à jour ({manifest['rootHash'][:16]}…, {elapsed:.1f} ms)")
+            return
+        for kind, names in diff.items():
+            for name in names:
+                print(f"❌ {kind}: {name}")
+        print("❌ Manifeste obsolète (lancez scripts/seed_manifest.py)")
+        raise SystemExit(1)
+
+    manifest, written = update_manifest(args.actions_dir)
+    elapsed = (time.perf_counter() - started) * 1000
+    state = "mis à jour" if written else "inchangé"
+    print(f"✅ Manifeste {state}: {manifest['totalFiles']} fichiers, "
+          f"racine {manifest['rootHash'][:16]}… ({elapsed:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
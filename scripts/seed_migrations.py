@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Registry of per-record schema migrations, applied when records are loaded.
+
+migrate_to_unified.py rewrote the whole corpus to schema 2.0 in one pass;
+older user exports and the batch files (initial-batches.json) still hold
+1.0 records. Each migration upgrades one record (an action or a batch) by
+one version step and is registered with @migration(kind, source, target);
+upgrade() chains them (1.0 -> 2.0 -> ...) up to CURRENT_VERSION, leaving
+the input record untouched.
+
+A record's version is its own "schemaVersion" when it declares one, else
+the version of its file or directory (the document's "schemaVersion", the
+"version" of actions/_index.json). Only when neither says anything are
+actions recognized by their shape (supportedPlatforms only exists in 2.0)
+and batches taken as 1.0. Each step stamps its target version on the
+record it returns.
+
+UpgradeCache keeps upgraded records keyed by the SHA-256 of their content,
+so re-reading an unchanged file skips both parsing and migration.
+LazyCorpus(upgrade=True) uses the catalog's file hash as the key and does
+not even open the file on a hit. Cached records are shared: treat them as
+read-only.
+
+Usage:
+    python scripts/seed_migrations.py                       # versions of the seed corpus
+    python scripts/seed_migrations.py --upgrade export.json --output export-2.0.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from seed_corpus import (ACTIONS_DIR, BATCHES_FILE, INDEX_FILE_NAME, iter_action_files, load_index, merge_tags,
+                         write_text_atomic)
+
+CURRENT_VERSION = '2.0'
+BASE_VERSION = '1.0'
+ACTION = 'action'
+BATCH = 'batch'
+# Top-level list holding each kind of record in a seed or export file
+DOCUMENT_KEYS = {ACTION: 'actions', BATCH: 'batches'}
+
+WINDOWS = 0
+LINUX = 1
+BOTH = 2
+
+Migration = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# (kind, source version) -> (target version, function)
+MIGRATIONS: Dict[Tuple[str, str], Tuple[str, Migration]] = {}
+
+
+class MigrationError(Exception):
+    pass
+
+
+def migration(kind: str, source: str, target: str) -> Callable[[Migration], Migration]:
+    """Register func as the step from source to target for records of kind."""
+    def register(func: Migration) -> Migration:
+        if (kind, source) in MIGRATIONS:
+            raise ValueError(f"Migration {kind} {source} déjà enregistrée")
+        if version_key(target) <= version_key(source):
+            raise ValueError(f"Migration {kind} {source} -> {target}: la version doit augmenter")
+        MIGRATIONS[(kind, source)] = (target, func)
+        return func
+    return register
+
+
+def version_key(version: str) -> Tuple[int, ...]:
+    """'2' and '2.0' compare equal; raises MigrationError for anything but dotted numbers."""
+    try:
+        parts = [int(part) for part in str(version).split('.')]
+    except ValueError:
+        raise MigrationError(f"Version de schéma invalide: {version!r}") from None
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def normalize_version(version: str) -> str:
+    key = version_key(version)
+    return '.'.join(map(str, key + (0,) * (2 - len(key))))
+
+
+def record_version(kind: str, record: Dict[str, Any], default: Optional[str] = None) -> str:
+    """Schema version of a record: its own schemaVersion, else default (its file's), else its shape."""
+    declared = record.get('schemaVersion') or default
+    if declared is not None:
+        return normalize_version(declared)
+    if kind == ACTION:
+        return CURRENT_VERSION if 'supportedPlatforms' in record else BASE_VERSION
+    return BASE_VERSION
+
+
+def directory_version(actions_dir: Path = ACTIONS_DIR) -> Optional[str]:
+    """Corpus version declared by actions/_index.json, None without index."""
+    if not (Path(actions_dir) / INDEX_FILE_NAME).exists():
+        return None
+    return load_index(actions_dir).get('version')
+
+
+def migration_path(kind: str, source: str, target: str = CURRENT_VERSION) -> List[Tuple[str, str, Migration]]:
+    """The (source, target, function) steps from source to target."""
+    path = []
+    version, target = normalize_version(source), normalize_version(target)
+    while version_key(version) < version_key(target):
+        step = MIGRATIONS.get((kind, version))
+        if step is None:
+            raise MigrationError(f"Aucune migration {kind} depuis la version {version}")
+        path.append((version, step[0], step[1]))
+        version = step[0]
+    if version_key(version) > version_key(target):
+        raise MigrationError(f"{kind} en version {version}, plus récente que {target}")
+    return path
+
+
+def upgrade(kind: str, record: Dict[str, Any], default: Optional[str] = None,
+            target: str = CURRENT_VERSION) -> Dict[str, Any]:
+    """record upgraded to target; the record itself when it is already there."""
+    for _, _, func in migration_path(kind, record_version(kind, record, default), target):
+        record = func(record)
+    return record
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class UpgradeCache:
+    """Bounded LRU of upgraded records keyed by (kind, content hash, default version, target)."""
+
+    def __init__(self, maxsize: int = 4096, target: str = CURRENT_VERSION):
+        self.maxsize = maxsize
+        self.target = target
+        self._records: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def upgrade(self, kind: str, digest: str, read: Callable[[], Dict[str, Any]],
+                default: Optional[str] = None) -> Dict[str, Any]:
+        """Upgraded record whose content hashes to digest; read() is only called on a miss."""
+        key = (kind, digest, default, self.target)
+        cached = self._records.get(key)
+        if cached is not None:
+            self._records.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        record = upgrade(kind, read(), default, self.target)
+        self._records[key] = record
+        if len(self._records) > self.maxsize:
+            self._records.popitem(last=False)
+        return record
+
+    def clear(self):
+        self._records.clear()
+        self.hits = self.misses = 0
+
+    def cache_info(self) -> Tuple[int, int, int, int]:
+        """(hits, misses, current size, max size), like functools.lru_cache."""
+        return self.hits, self.misses, len(self._records), self.maxsize
+
+
+UPGRADE_CACHE = UpgradeCache()
+
+
+# ----------------------------------------------------------------------
+# Migrations
+# ----------------------------------------------------------------------
+
+def supported_platforms(action: Dict[str, Any]) -> List[int]:
+    """Platforms of an action: those with a command template, else its platform field."""
+    platforms = [p for p, key in ((WINDOWS, 'windowsCommandTemplate'), (LINUX, 'linuxCommandTemplate'))
+                 if action.get(key)]
+    if platforms:
+        return platforms
+    platform = action.get('platform', WINDOWS)
+    return [WINDOWS, LINUX] if platform == BOTH else [platform]
+
+
+@migration(ACTION, '1.0', '2.0')
+def _unified_action(action: Dict[str, Any]) -> Dict[str, Any]:
+    """Unified cross-platform fields: supportedPlatforms, per-platform examples, canonical tags.
+
+    examples is kept as is. A single-platform action lists all its examples
+    under its platform (some PowerShell examples are tagged Linux); a
+    cross-platform one splits them by their own platform.
+    """
+    upgraded = dict(action)
+    upgraded['schemaVersion'] = '2.0'
+    platforms = supported_platforms(action)
+    upgraded['supportedPlatforms'] = platforms
+    upgraded['tags'] = merge_tags(action.get('tags'))
+    examples = action.get('examples') or []
+    for platform, key in ((WINDOWS, 'windowsExamples'), (LINUX, 'linuxExamples')):
+        if key in action or platform not in platforms:
+            continue
+        if len(platforms) == 1:
+            upgraded[key] = list(examples)
+        else:
+            upgraded[key] = [e for e in examples if e.get('platform', BOTH) in (platform, BOTH)]
+    return upgraded
+
+
+@migration(BATCH, '1.0', '2.0')
+def _canonical_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Canonical tags, as 2.0 actions."""
+    upgraded = dict(batch)
+    upgraded['schemaVersion'] = '2.0'
+    upgraded['tags'] = merge_tags(batch.get('tags'))
+    return upgraded
+
+
+# ----------------------------------------------------------------------
+# Loading
+# ----------------------------------------------------------------------
+
+def iter_actions(actions_dir: Path = ACTIONS_DIR, cache: UpgradeCache = UPGRADE_CACHE) -> Iterator[Dict[str, Any]]:
+    """seed_corpus.iter_actions, each action upgraded as it is read."""
+    default = directory_version(actions_dir)
+    for path in iter_action_files(actions_dir):
+        raw = path.read_bytes()
+        yield cache.upgrade(ACTION, hashlib.sha256(raw).hexdigest(), lambda: json.loads(raw), default)
+
+
+def iter_document(data: Dict[str, Any], kind: str, cache: UpgradeCache = UPGRADE_CACHE) -> Iterator[Dict[str, Any]]:
+    """Records of kind in a seed or export document, upgraded one at a time."""
+    default = data.get('schemaVersion')
+    for record in data.get(DOCUMENT_KEYS[kind]) or []:
+        yield cache.upgrade(kind, content_hash(record), lambda: record, default)
+
+
+def load_batches(path: Path = BATCHES_FILE, cache: UpgradeCache = UPGRADE_CACHE) -> List[Dict[str, Any]]:
+    """seed_corpus.load_batches, upgraded."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(iter_document(json.load(f), BATCH, cache))
+
+
+def upgrade_document(data: Dict[str, Any], cache: UpgradeCache = UPGRADE_CACHE) -> Dict[str, Any]:
+    """Copy of a seed or export document with every record upgraded and schemaVersion set."""
+    upgraded = dict(data)
+    for kind, key in DOCUMENT_KEYS.items():
+        if key in data:
+            upgraded[key] = list(iter_document(data, kind, cache))
+    upgraded['schemaVersion'] = cache.target
+    return upgraded
+
+
+def version_counts(records: List[Dict[str, Any]], kind: str, default: Optional[str] = None) -> Counter:
+    return Counter(record_version(kind, record, default) for record in records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrations de schéma des actions et batches")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--batches', type=Path, default=BATCHES_FILE)
+    parser.add_argument('--upgrade', type=Path, metavar='FICHIER', help="Export ou fichier de seed à migrer")
+    parser.add_argument('--output', type=Path, help="Fichier migré (défaut: remplace --upgrade)")
+    args = parser.parse_args()
+
+    if args.upgrade:
+        with open(args.upgrade, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for kind, key in DOCUMENT_KEYS.items():
+            if key in data:
+                counts = version_counts(data[key], kind, data.get('schemaVersion'))
+                print(f"📊 {key}: " + ', '.join(f"{n} en {v}" for v, n in sorted(counts.items())))
+        try:
+            upgraded = upgrade_document(data)
+        except MigrationError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        output = args.output or args.upgrade
+        write_text_atomic(output, json.dumps(upgraded, ensure_ascii=False, indent=2))
+        print(f"✅ {output}: schéma {CURRENT_VERSION}")
+        return
+
+    raw = [json.loads(p.read_bytes()) for p in iter_action_files(args.actions_dir)]
+    counts = version_counts(raw, ACTION, directory_version(args.actions_dir))
+    print(f"📊 {len(raw)} actions: " + ', '.join(f"{n} en {v}" for v, n in sorted(counts.items())))
+    with open(args.batches, 'r', encoding='utf-8') as f:
+        batches = json.load(f)
+    counts = version_counts(batches.get('batches', []), BATCH, batches.get('schemaVersion'))
+    print(f"📊 {sum(counts.values())} batches: " + ', '.join(f"{n} en {v}" for v, n in sorted(counts.items())))
+
+    cache = UpgradeCache()
+    for label in ('froid', 'en cache'):
+        started = time.perf_counter()
+        actions = list(iter_actions(args.actions_dir, cache))
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔄 Chargement migré ({label}): {len(actions)} actions en {elapsed:.0f} ms")
+    hits, misses, size, _ = cache.cache_info()
+    print(f"   cache: {hits} hits, {misses} misses, {size} enregistrements")
+    upgraded = sum(1 for old, new in zip(raw, actions) if old != new)
+    print(f"✅ {upgraded} actions migrées vers {CURRENT_VERSION} à la lecture")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Compact typed models for the seed corpus.
+
+Holding the corpus as nested dicts repeats the same keys (command,
+description, name, label, type, required...) in thousands of small dicts.
+These classes use __slots__ instead, intern categories, tags and other
+low-cardinality strings (parameter definitions, link targets and the
+auto-generated example descriptions repeated across hundreds of files),
+and share one key-order tuple per record shape.
+
+Conversion is lossless: Model.from_dict(d).to_dict() == d, with the
+original key order and any unknown key (e.g. the stray top-level
+"parameters" found on some unified actions) preserved, so re-serializing
+with seed_corpus.dumps_action() reproduces the source file byte for byte.
+"""
+
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_MISSING = object()
+_KEY_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_keys(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Share one key-order tuple between all records of the same shape."""
+    shared = _KEY_ORDERS.get(keys)
+    if shared is None:
+        shared = _KEY_ORDERS[keys] = tuple(sys.intern(k) for k in keys)
+    return shared
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_list(values: Any) -> Any:
+    if isinstance(values, list):
+        return [_intern(v) for v in values]
+    return values
+
+
+def _model_list(model: type) -> Callable[[Any], Any]:
+    def convert(values):
+        if isinstance(values, list):
+            return [model.from_dict(v) if isinstance(v, dict) else v for v in values]
+        return values
+    return convert
+
+
+def _model(model: type) -> Callable[[Any], Any]:
+    def convert(value):
+        return model.from_dict(value) if isinstance(value, dict) else value
+    return convert
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, SeedRecord):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(v) for v in value]
+    return value
+
+
+class SeedRecord:
+    """Base class: maps JSON keys to slots and keeps the source key order.
+
+    Subclasses declare FIELDS as (jsonKey, attribute, converter) triples.
+    Keys that are not declared are kept in `extra`.
+    """
+
+    __slots__ = ('_keys', 'extra')
+    FIELDS: Tuple[Tuple[str, str, Optional[Callable[[Any], Any]]], ...] = ()
+
+    _BY_KEY: Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]] = {}
+    _BY_ATTR: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._BY_KEY = {key: (attr, conv) for key, attr, conv in cls.FIELDS}
+        cls._BY_ATTR = {attr: key for key, attr, _ in cls.FIELDS}
+
+    def __init__(self, **values):
+        keys = []
+        for key, attr, _ in self.FIELDS:
+            value = values.pop(attr, _MISSING)
+            if value is _MISSING:
+                object.__setattr__(self, attr, None)
+            else:
+                object.__setattr__(self, attr, value)
+                keys.append(key)
+        if values:
+            raise TypeError(f"{type(self).__name__}: champs inconnus {sorted(values)}")
+        self._keys = _intern_keys(tuple(keys))
+        self.extra = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        key = self._BY_ATTR.get(name)
+        if key is not None and key not in self._keys:
+            self._keys = _intern_keys(self._keys + (key,))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SeedRecord':
+        record = cls.__new__(cls)
+        by_key = cls._BY_KEY
+        extra = None
+        for _, attr, _ in cls.FIELDS:
+            object.__setattr__(record, attr, None)
+        for key, value in data.items():
+            field = by_key.get(key)
+            if field is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            attr, convert = field
+            object.__setattr__(record, attr, convert(value) if convert and value is not None else value)
+        object.__setattr__(record, '_keys', _intern_keys(tuple(data)))
+        object.__setattr__(record, 'extra', extra)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        by_key = self._BY_KEY
+        extra = self.extra
+        result = {}
+        for key in self._keys:
+            field = by_key.get(key)
+            if field is None:
+                result[key] = extra[key]
+            else:
+                result[key] = _dump(getattr(self, field[0]))
+        return result
+
+    def has(self, key: str) -> bool:
+        """True when the JSON key was present in the source record."""
+        return key in self._keys
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        ident = getattr(self, 'id', None) or getattr(self, 'name', None)
+        return f"{type(self).__name__}({ident!r})"
+
+
+class Link(SeedRecord):
+    __slots__ = ('title', 'url')
+    FIELDS = (
+        ('title', 'title', _intern),
+        ('url', 'url', _intern),
+    )
+
+
+class Example(SeedRecord):
+    __slots__ = ('command', 'description', 'platform')
+    FIELDS = (
+        ('command', 'command', None),
+        ('description', 'description', _intern),
+        ('platform', 'platform', None),
+    )
+
+
+class Parameter(SeedRecord):
+    __slots__ = ('name', 'label', 'type', 'default_value', 'required', 'description')
+    FIELDS = (
+        ('name', 'name', _intern),
+        ('label', 'label', _intern),
+        ('type', 'type', _intern),
+        ('defaultValue', 'default_value', _intern),
+        ('required', 'required', None),
+        ('description', 'description', _intern),
+    )
+
+
+class CommandTemplate(SeedRecord):
+    __slots__ = ('id', 'platform', 'name', 'command_pattern', 'parameters')
+    FIELDS = (
+        ('id', 'id', None),
+        ('platform', 'platform', None),
+        ('name', 'name', _intern),
+        ('commandPattern', 'command_pattern', None),
+        ('parameters', 'parameters', _model_list(Parameter)),
+    )
+
+
+class Action(SeedRecord):
+    __slots__ = (
+        'id', 'title', 'description', 'category', 'platform', 'supported_platforms', 'level', 'tags',
+        'windows_command_template_id', 'windows_command_template',
+        'linux_command_template_id', 'linux_command_template',
+        'examples', 'windows_examples', 'linux_examples',
+        'notes', 'links', 'cross_platform_notes',
+    )
+    FIELDS = (
+        ('id', 'id', None),
+        ('title', 'title', None),
+        ('description', 'description', None),
+        ('category', 'category', _intern),
+        ('platform', 'platform', None),
+        ('supportedPlatforms', 'supported_platforms', None),
+        ('level', 'level', None),
+        ('tags', 'tags', _intern_list),
+        ('windowsCommandTemplateId', 'windows_command_template_id', None),
+        ('windowsCommandTemplate', 'windows_command_template', _model(CommandTemplate)),
+        ('linuxCommandTemplateId', 'linux_command_template_id', None),
+        ('linuxCommandTemplate', 'linux_command_template', _model(CommandTemplate)),
+        ('examples', 'examples', _model_list(Example)),
+        ('windowsExamples', 'windows_examples', _model_list(Example)),
+        ('linuxExamples', 'linux_examples', _model_list(Example)),
+        ('notes', 'notes', None),
+        ('links', 'links', _model_list(Link)),
+        ('crossPlatformNotes', 'cross_platform_notes', None),
+    )
+
+    def templates(self) -> List[CommandTemplate]:
+        return [t for t in (self.windows_command_template, self.linux_command_template) if t]
+
+    def all_examples(self) -> List[Example]:
+        return (self.examples or []) + (self.windows_examples or []) + (self.linux_examples or [])
+
+
+class BatchCommand(SeedRecord):
+    __slots__ = ('action_id', 'order', 'is_executed', 'description')
+    FIELDS = (
+        ('actionId', 'action_id', None),
+        ('order', 'order', None),
+        ('isExecuted', 'is_executed', None),
+        ('description', 'description', None),
+    )
+
+
+class Batch(SeedRecord):
+    __slots__ = ('id', 'name', 'description', 'execution_mode', 'is_user_created', 'tags', 'commands')
+    FIELDS = (
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('description', 'description', None),
+        ('executionMode', 'execution_mode', None),
+        ('isUserCreated', 'is_user_created', None),
+        ('tags', 'tags', _intern_list),
+        ('commands', 'commands', _model_list(BatchCommand)),
+    )
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Schemas of the seed action and batch files and their compiled validators.
+
+ACTION_SCHEMA and BATCHES_SCHEMA (initial-batches.json) are a JSON Schema subset (type, properties, required,
+additionalProperties, items, enum, minLength, maxLength, maxItems, $ref).
+compile_validator() turns it into straight-line Python source: every
+property check is inlined, nested objects and arrays included, and the JSON
+path of an error ("$.windowsCommandTemplate.parameters[2].type") is only
+built when the error is reported. Constraints follow the EF Core model and
+JsonSeedService's import limits.
+
+Checks that a schema cannot express are in check_semantics():
+- every {placeholder} of a commandPattern is a declared parameter (and
+  unused parameters are reported as warnings);
+- the templates present agree with platform and supportedPlatforms.
+
+Usage:
+    python scripts/seed_schema.py                 # validate data/seed/actions
+    python scripts/seed_schema.py --emit          # print the generated validator
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from command_templates import parse
+from seed_corpus import ACTIONS_DIR, BATCHES_FILE, iter_action_files
+
+# Parameter types understood by CommandGeneratorService (anything else is quoted as a string)
+PARAMETER_TYPES = ['string', 'int', 'integer', 'bool', 'boolean', 'hostname', 'ipaddress', 'path']
+
+ACTION_SCHEMA: Dict[str, Any] = {
+    '$defs': {
+        'platform': {'type': 'integer', 'enum': [0, 1, 2]},
+        'parameter': {
+            'type': 'object',
+            'required': ['name'],
+            'additionalProperties': False,
+            'properties': {
+                'name': {'type': 'string', 'minLength': 1},
+                'label': {'type': ['string', 'null']},
+                'type': {'type': 'string', 'enum': PARAMETER_TYPES, 'severity': 'warning'},
+                'defaultValue': {'type': ['string', 'null']},
+                'required': {'type': 'boolean'},
+                'description': {'type': ['string', 'null']},
+            },
+        },
+        'template': {
+            'type': ['object', 'null'],
+            'required': ['id', 'platform', 'commandPattern'],
+            'additionalProperties': False,
+            'properties': {
+                'id': {'type': 'string', 'minLength': 1, 'maxLength': 50},
+                'platform': {'$ref': 'platform'},
+                'name': {'type': 'string'},
+                'commandPattern': {'type': 'string', 'minLength': 1},
+                'parameters': {'type': 'array', 'items': {'$ref': 'parameter'}},
+            },
+        },
+        'examples': {
+            'type': 'array',
+            'maxItems': 50,
+            'items': {
+                'type': 'object',
+                'required': ['command', 'description'],
+                'additionalProperties': False,
+                'properties': {
+                    'command': {'type': 'string', 'minLength': 1},
+                    'description': {'type': 'string'},
+                    'platform': {'$ref': 'platform'},
+                },
+            },
+        },
+        'strings': {'type': 'array', 'items': {'type': 'string'}},
+    },
+    'type': 'object',
+    'required': ['id', 'title', 'category', 'platform', 'level'],
+    'additionalProperties': False,
+    'properties': {
+        'id': {'type': 'string', 'minLength': 1, 'maxLength': 50},
+        'title': {'type': 'string', 'minLength': 1, 'maxLength': 200},
+        'description': {'type': 'string', 'maxLength': 2000},
+        'category': {'type': 'string', 'minLength': 1, 'maxLength': 100},
+        'platform': {'$ref': 'platform'},
+        'supportedPlatforms': {'type': 'array', 'maxItems': 2, 'items': {'type': 'integer', 'enum': [0, 1]}},
+        'level': {'type': 'integer', 'enum': [0, 1, 2]},
+        'tags': {'type': 'array', 'maxItems': 20, 'items': {'type': 'string', 'minLength': 1}},
+        'windowsCommandTemplateId': {'type': ['string', 'null']},
+        'windowsCommandTemplate': {'$ref': 'template'},
+        'linuxCommandTemplateId': {'type': ['string', 'null']},
+        'linuxCommandTemplate': {'$ref': 'template'},
+        'examples': {'$ref': 'examples'},
+        'windowsExamples': {'$ref': 'examples'},
+        'linuxExamples': {'$ref': 'examples'},
+        'notes': {'type': ['string', 'null'], 'maxLength': 5000},
+        'links': {
+            'type': 'array',
+            'maxItems': 10,
+            'items': {
+                'type': 'object',
+                'required': ['title', 'url'],
+                'additionalProperties': False,
+                'properties': {
+                    'title': {'type': 'string'},
+                    'url': {'type': 'string', 'minLength': 1},
+                },
+            },
+        },
+        'crossPlatformNotes': {
+            'type': 'object',
+            'additionalProperties': False,
+            'properties': {
+                'differences': {'$ref': 'strings'},
+                'commonalities': {'$ref': 'strings'},
+            },
+        },
+    },
+}
+
+BATCHES_SCHEMA: Dict[str, Any] = {
+    '$defs': {
+        'command': {
+            'type': 'object',
+            'required': ['actionId', 'order'],
+            'additionalProperties': False,
+            'properties': {
+                'actionId': {'type': 'string', 'minLength': 1, 'maxLength': 50},
+                'order': {'type': 'integer'},
+                'actionTitle': {'type': 'string'},
+                'command': {'type': 'string'},
+                'platform': {'$ref': 'platform'},
+                'description': {'type': ['string', 'null']},
+                'isExecuted': {'type': 'boolean'},
+            },
+        },
+        'platform': {'type': 'integer', 'enum': [0, 1, 2]},
+    },
+    'type': 'object',
+    'required': ['batches'],
+    'additionalProperties': False,
+    'properties': {
+        'schemaVersion': {'type': 'string'},
+        'batches': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['id', 'name', 'commands'],
+                'additionalProperties': False,
+                'properties': {
+                    'id': {'type': 'string', 'minLength': 1, 'maxLength': 50},
+                    'name': {'type': 'string', 'minLength': 1, 'maxLength': 200},
+                    'description': {'type': ['string', 'null'], 'maxLength': 1000},
+                    'executionMode': {'type': 'integer', 'enum': [0, 1]},
+                    'isUserCreated': {'type': 'boolean'},
+                    'tags': {'type': 'array', 'maxItems': 20, 'items': {'type': 'string', 'minLength': 1}},
+                    'commands': {'type': 'array', 'items': {'$ref': 'command'}},
+                },
+            },
+        },
+    },
+}
+
+# (JSON path, message)
+Issue = Tuple[str, str]
+
+_TYPE_TESTS = {
+    'string': 'type({v}) is str',
+    'integer': 'type({v}) is int',
+    'number': 'type({v}) in (int, float)',
+    'boolean': 'type({v}) is bool',
+    'array': 'type({v}) is list',
+    'object': 'type({v}) is dict',
+}
+
+
+class SchemaCompiler:
+    """Generate the source of validate(v0, errors, warnings) for a schema."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.defs = schema.get('$defs', {})
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self.counter = 0
+
+    def compile(self, name: str = 'validate') -> str:
+        self.lines = [f"def {name}(v0, errors, warnings):"]
+        self._node(self.schema, 'v0', '$', 1)
+        constants = [f"{key} = {value!r}" for key, value in self.constants.items()]
+        return '\n'.join(constants + ['', ''] + self.lines) + '\n'
+
+    def _emit(self, depth: int, line: str):
+        self.lines.append('    ' * depth + line)
+
+    def _name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _constant(self, value: Any) -> str:
+        for name, existing in self.constants.items():
+            if existing == value:
+                return name
+        name = self._name('K')
+        self.constants[name] = value
+        return name
+
+    def _report(self, depth: int, schema: Dict[str, Any], path: str, message: str):
+        target = 'warnings' if schema.get('severity') == 'warning' else 'errors'
+        self._emit(depth, f"{target}.append((f{path!r}, f{message!r}))")
+
+    def _node(self, schema: Dict[str, Any], var: str, path: str, depth: int):
+        if '$ref' in schema:
+            schema = self.defs[schema['$ref']]
+        types = schema.get('type', [])
+        types = [types] if isinstance(types, str) else list(types)
+        branches = [t for t in types if t != 'null']
+        keyword = 'if'
+        if 'null' in types:
+            self._emit(depth, f"if {var} is None:")
+            self._emit(depth + 1, 'pass')
+            keyword = 'elif'
+        for type_name in branches:
+            self._emit(depth, f"{keyword} {_TYPE_TESTS[type_name].format(v=var)}:")
+            before = len(self.lines)
+            self._constraints(schema, type_name, var, path, depth + 1)
+            if len(self.lines) == before:
+                self._emit(depth + 1, 'pass')
+            keyword = 'elif'
+        if branches:
+            self._emit(depth, 'else:')
+            expected = ' | '.join(types)
+            self._report(depth + 1, {}, path, f"type attendu {expected}, obtenu {{type({var}).__name__}}")
+
+    def _constraints(self, schema: Dict[str, Any], type_name: str, var: str, path: str, depth: int):
+        if 'enum' in schema:
+            allowed = self._constant(frozenset(schema['enum']))
+            self._emit(depth, f"if {var} not in {allowed}:")
+            self._report(depth + 1, schema, path, f"valeur {{{var}!r}} hors de {sorted(schema['enum'])}")
+        if type_name == 'string':
+            if 'minLength' in schema:
+                self._emit(depth, f"if len({var}) < {schema['minLength']}:")
+                self._report(depth + 1, schema, path, f"longueur minimale {schema['minLength']}")
+            if 'maxLength' in schema:
+                self._emit(depth, f"if len({var}) > {schema['maxLength']}:")
+                self._report(depth + 1, schema, path,
+                             f"longueur {{len({var})}} > {schema['maxLength']}")
+        elif type_name == 'array':
+            if 'maxItems' in schema:
+                self._emit(depth, f"if len({var}) > {schema['maxItems']}:")
+                self._report(depth + 1, schema, path, f"{{len({var})}} éléments > {schema['maxItems']}")
+            if 'items' in schema:
+                index, item = self._name('i'), self._name('v')
+                self._emit(depth, f"for {index}, {item} in enumerate({var}):")
+                self._node(schema['items'], item, f"{path}[{{{index}}}]", depth + 1)
+        elif type_name == 'object':
+            properties = schema.get('properties', {})
+            required = set(schema.get('required', []))
+            for key, sub in properties.items():
+                value = self._name('v')
+                self._emit(depth, f"{value} = {var}.get({key!r}, _MISSING)")
+                if key in required:
+                    self._emit(depth, f"if {value} is _MISSING:")
+                    self._report(depth + 1, schema, f"{path}.{key}", "champ requis")
+                    self._emit(depth, 'else:')
+                else:
+                    self._emit(depth, f"if {value} is not _MISSING:")
+                self._node(sub, value, f"{path}.{key}", depth + 1)
+            if schema.get('additionalProperties') is False:
+                known = self._constant(frozenset(properties))
+                self._emit(depth, f"if not {known}.issuperset({var}):")
+                self._emit(depth + 1, f"for key in sorted({var}.keys() - {known}):")
+                self._report(depth + 2, schema, path + '.{key}', "champ inconnu")
+
+
+def compile_validator(schema: Dict[str, Any] = ACTION_SCHEMA) -> Tuple[str, Callable[[Any, list, list], None]]:
+    """Return the generated source and the compiled validate(value, errors, warnings)."""
+    source = SchemaCompiler(schema).compile()
+    namespace: Dict[str, Any] = {'_MISSING': object()}
+    exec(compile(source, '<seed_schema>', 'exec'), namespace)
+    return source, namespace['validate']
+
+
+_SOURCE, _validate = compile_validator()
+_BATCHES_SOURCE, _validate_batches = compile_validator(BATCHES_SCHEMA)
+
+_TEMPLATE_KEYS = (('windowsCommandTemplate', 0), ('linuxCommandTemplate', 1))
+
+
+def check_semantics(action: Dict[str, Any], errors: List[Issue], warnings: List[Issue]):
+    for key, _ in _TEMPLATE_KEYS:
+        template = action.get(key)
+        if type(template) is not dict or type(template.get('commandPattern')) is not str:
+            continue
+        names = {p.get('name') for p in template.get('parameters') or [] if type(p) is dict}
+        used = parse(template['commandPattern']).names
+        for name in sorted(used - names):
+            errors.append((f"$.{key}.commandPattern", f"{{{name}}} n'est pas un paramètre déclaré"))
+        for position, param in enumerate(template.get('parameters') or []):
+            if type(param) is dict and param.get('name') not in used:
+                warnings.append((f"$.{key}.parameters[{position}].name",
+                                 f"paramètre '{param.get('name')}' absent du commandPattern"))
+
+    platform = action.get('platform')
+    present = [p for key, p in _TEMPLATE_KEYS if action.get(key)]
+    expected = [0, 1] if platform == 2 else [platform] if platform in (0, 1) else None
+    if expected is not None and present != expected:
+        errors.append(("$.platform", f"platform {platform} mais templates présents pour {present}"))
+    supported = action.get('supportedPlatforms')
+    if type(supported) is list and sorted(supported) != present:
+        errors.append(("$.supportedPlatforms", f"{supported} ne correspond pas aux templates présents {present}"))
+
+
+def validate_action(action: Any) -> Tuple[List[Issue], List[Issue]]:
+    """Return (errors, warnings) for one parsed action file."""
+    errors: List[Issue] = []
+    warnings: List[Issue] = []
+    _validate(action, errors, warnings)
+    if type(action) is dict:
+        check_semantics(action, errors, warnings)
+    return errors, warnings
+
+
+def check_batch_semantics(data: Dict[str, Any], action_ids: Set[str], errors: List[Issue],
+                          warnings: List[Issue]):
+    """action_ids: casefolded ids of the existing actions."""
+    seen = set()
+    for position, batch in enumerate(data.get('batches') or []):
+        if type(batch) is not dict:
+            continue
+        batch_id = batch.get('id')
+        if type(batch_id) is str:
+            if batch_id.casefold() in seen:
+                errors.append((f"$.batches[{position}].id", f"id en double {batch_id}"))
+            seen.add(batch_id.casefold())
+        commands = batch.get('commands')
+        if type(commands) is not list:
+            continue
+        if not commands:
+            warnings.append((f"$.batches[{position}].commands", "batch sans commande"))
+        orders = set()
+        for index, command in enumerate(commands):
+            if type(command) is not dict:
+                continue
+            path = f"$.batches[{position}].commands[{index}]"
+            action_id = command.get('actionId')
+            if type(action_id) is str and action_id.casefold() not in action_ids:
+                errors.append((f"{path}.actionId", f"action inconnue {action_id}"))
+            order = command.get('order')
+            if order in orders:
+                errors.append((f"{path}.order", f"ordre {order} en double"))
+            orders.add(order)
+
+
+def validate_batches(data: Any, action_ids: Set[str]) -> Tuple[List[Issue], List[Issue]]:
+    """Return (errors, warnings) for a parsed initial-batches.json."""
+    errors: List[Issue] = []
+    warnings: List[Issue] = []
+    _validate_batches(data, errors, warnings)
+    if type(data) is dict:
+        check_batch_semantics(data, action_ids, errors, warnings)
+    return errors, warnings
+
+
+def validate_batches_file(path: Path = BATCHES_FILE, actions_dir: Path = ACTIONS_DIR) -> Tuple[List[Issue], List[Issue]]:
+    """validate_batches() for a batches file, against the action files of actions_dir."""
+    action_ids = set()
+    for action_path in iter_action_files(actions_dir):
+        action_ids.add(action_path.stem.casefold())
+    try:
+        with open(path, 'rb') as f:
+            data = json.loads(f.read())
+    except ValueError as e:
+        return [('$', f"JSON invalide: {e}")], []
+    return validate_batches(data, action_ids)
+
+
+def _validate_files(paths: List[Path]) -> List[Tuple[str, List[Issue], List[Issue]]]:
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                action = json.loads(f.read())
+        except ValueError as e:
+            results.append((path.name, [('$', f"JSON invalide: {e}")], []))
+            continue
+        errors, warnings = validate_action(action)
+        if errors or warnings:
+            results.append((path.name, errors, warnings))
+    return results
+
+
+def validate_corpus(actions_dir: Path = ACTIONS_DIR, workers: int = 0) -> List[Tuple[str, List[Issue], List[Issue]]]:
+    """Validate every action file; return (file name, errors, warnings) for files with issues.
+
+    Files are split into one chunk per worker thread: reads overlap and the
+    json / validation work runs between them.
+    """
+    paths = iter_action_files(actions_dir)
+    workers = workers or min(8, os.cpu_count() or 1)
+    if workers <= 1:
+        return _validate_files(paths)
+    chunks = [paths[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = [r for chunk in pool.map(_validate_files, chunks) for r in chunk]
+    return sorted(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valide les fichiers d'actions contre le schéma")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--batches', type=Path,
+                        help=f"Fichier de batches à valider (défaut: {BATCHES_FILE.name} à côté de --actions-dir)")
+    parser.add_argument('--workers', type=int, default=0, help="Threads (0 = automatique, 1 = séquentiel)")
+    parser.add_argument('--no-warnings', action='store_true', help="N'affiche pas les avertissements")
+    parser.add_argument('--emit', action='store_true', help="Affiche le code du validateur généré")
+    args = parser.parse_args()
+
+    if args.emit:
+        print(_SOURCE)
+        return
+
+    started = time.perf_counter()
+    results = validate_corpus(args.actions_dir, args.workers)
+    # The batches of the corpus being validated, not the shipped ones
+    if args.batches is None:
+        args.batches = args.actions_dir.parent / BATCHES_FILE.name
+    if args.batches.exists():
+        errors, warnings = validate_batches_file(args.batches, args.actions_dir)
+        if errors or warnings:
+            results.append((args.batches.name, errors, warnings))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    error_count = warning_count = 0
+    for name, errors, warnings in results:
+        for path, message in errors:
+            print(f"❌ {name}: {path}: {message}")
+        if not args.no_warnings:
+            for path, message in warnings:
+                print(f"⚠️  {name}: {path}: {message}")
+        error_count += len(errors)
+        warning_count += len(warnings)
+
+    total = len(iter_action_files(args.actions_dir))
+    total += args.batches.exists()
+    print(f"📊 {total} fichiers validés en {elapsed:.1f} ms: {error_count} erreur(s), {warning_count} avertissement(s)")
+    if error_count:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
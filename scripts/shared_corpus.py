@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Flat, shareable encoding of the corpus for process-pool workers.
+
+Sending action dicts to a ProcessPoolExecutor pickles every action to
+every worker. Here the corpus is encoded once into a flat buffer, placed
+in multiprocessing.shared_memory, and workers attach to it by name: they
+read actions through read-only views over NumPy arrays that point into
+the shared block (no copy, nothing pickled but the block name and index
+ranges) and only send their small results back.
+
+Buffer layout (little-endian, sections 8-byte aligned):
+- magic, version and a JSON header giving each section's offset and size;
+- string table: int64 offsets + UTF-8 blob, every distinct string once
+  (texts, JSON key orders and extra-key payloads);
+- string lists: int32 string indexes (tags, supportedPlatforms...);
+- one fixed-width record array per seed_models class (actions, templates,
+  parameters, examples, links): the key order and extra keys of the
+  record, then one (kind, a, b) cell per declared field. Kinds are
+  absent, null, string (a = index), int, bool, record (a = row of the child table),
+  records (a = first row, b = count, children are contiguous), string
+  list (a = start, b = count) and JSON text for anything else.
+
+RecordView.to_dict() rebuilds the source dict exactly (key order, unknown
+keys and value types included), so the encoding is lossless.
+
+Usage:
+    python scripts/shared_corpus.py
+    python scripts/benchmark_corpus.py shared --scale 100
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from seed_corpus import ACTIONS_DIR, iter_actions
+from seed_models import Action, CommandTemplate, Example, Link, Parameter
+
+MAGIC = b'TWSC'
+FORMAT_VERSION = 1
+ALIGN = 8
+STRING_CACHE_SIZE = 65536
+DEFAULT_CHUNK = 64
+
+(KIND_ABSENT, KIND_NULL, KIND_STR, KIND_INT, KIND_BOOL,
+ KIND_RECORD, KIND_RECORDS, KIND_STRS, KIND_JSON) = range(9)
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+# Record tables, in buffer order, with the JSON keys they declare
+TABLES = {
+    'actions': Action,
+    'templates': CommandTemplate,
+    'parameters': Parameter,
+    'examples': Example,
+    'links': Link,
+}
+# Fields holding records of another table
+CHILDREN = {
+    ('actions', 'windowsCommandTemplate'): 'templates',
+    ('actions', 'linuxCommandTemplate'): 'templates',
+    ('actions', 'examples'): 'examples',
+    ('actions', 'windowsExamples'): 'examples',
+    ('actions', 'linuxExamples'): 'examples',
+    ('actions', 'links'): 'links',
+    ('templates', 'parameters'): 'parameters',
+}
+
+
+def table_fields(table: str) -> List[str]:
+    return [key for key, _, _ in TABLES[table].FIELDS]
+
+
+def record_dtype(field_count: int) -> np.dtype:
+    return np.dtype([('keys', '<i4'), ('extra', '<i4'), ('kind', 'i1', (field_count,)),
+                     ('a', '<i4', (field_count,)), ('b', '<i4', (field_count,))])
+
+
+def _align(size: int) -> int:
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+class _Encoder:
+    """Builds the sections of the flat buffer."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.key_orders: Dict[Tuple[str, ...], int] = {}
+        self.string_lists: List[int] = []
+        self.fields = {table: table_fields(table) for table in TABLES}
+        self.positions = {table: {key: i for i, key in enumerate(fields)} for table, fields in self.fields.items()}
+        # table -> list of (keys, extra, kinds, a, b), filled in place once reserved
+        self.rows: Dict[str, List[Optional[tuple]]] = {table: [] for table in TABLES}
+
+    def string(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def json_text(self, value: Any) -> int:
+        return self.string(json.dumps(value, ensure_ascii=False))
+
+    def records(self, table: str, items: List[Dict[str, Any]]) -> int:
+        start = len(self.rows[table])
+        self.rows[table].extend([None] * len(items))
+        for offset, item in enumerate(items):
+            self.rows[table][start + offset] = self.record(table, item)
+        return start
+
+    def record(self, table: str, data: Dict[str, Any]) -> tuple:
+        count = len(self.fields[table])
+        kinds, a, b = [KIND_ABSENT] * count, [0] * count, [0] * count
+        positions = self.positions[table]
+        strings = self.strings
+        extra = {}
+        for key, value in data.items():
+            position = positions.get(key)
+            if position is None:
+                extra[key] = value
+            elif type(value) is str:
+                # Inlined self.string(): most cells are strings
+                index = strings.get(value)
+                if index is None:
+                    index = strings[value] = len(strings)
+                kinds[position], a[position] = KIND_STR, index
+            else:
+                kinds[position], a[position], b[position] = self.cell(CHILDREN.get((table, key)), value)
+        keys = tuple(data)
+        order = self.key_orders.get(keys)
+        if order is None:
+            order = self.key_orders[keys] = self.json_text(list(keys))
+        return order, self.json_text(extra) if extra else -1, kinds, a, b
+
+    def cell(self, child: Optional[str], value: Any) -> Tuple[int, int, int]:
+        if type(value) is str:
+            return KIND_STR, self.string(value), 0
+        if value is None:
+            return KIND_NULL, 0, 0
+        if isinstance(value, bool):
+            return KIND_BOOL, int(value), 0
+        if isinstance(value, int) and INT32_MIN <= value <= INT32_MAX:
+            return KIND_INT, value, 0
+        if child is not None:
+            if isinstance(value, dict):
+                row = self.records(child, [value])
+                return KIND_RECORD, row, 0
+            if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+                return KIND_RECORDS, self.records(child, value), len(value)
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            start = len(self.string_lists)
+            self.string_lists.extend(self.string(v) for v in value)
+            return KIND_STRS, start, len(value)
+        return KIND_JSON, self.json_text(value), 0
+
+    def table_array(self, table: str) -> np.ndarray:
+        rows = self.rows[table]
+        array = np.zeros(len(rows), dtype=record_dtype(len(self.fields[table])))
+        if rows:
+            keys, extra, kinds, a, b = zip(*rows)
+            array['keys'], array['extra'] = keys, extra
+            array['kind'], array['a'], array['b'] = kinds, a, b
+        return array
+
+
+def encode_corpus(actions: Iterable[Dict[str, Any]]) -> bytes:
+    """Flat buffer holding the actions (see the module docstring for the layout)."""
+    encoder = _Encoder()
+    encoder.records('actions', list(actions))
+
+    blobs = [text.encode('utf-8') for text in encoder.strings]
+    offsets = np.zeros(len(blobs) + 1, dtype='<i8')
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    sections = [
+        ('string_offsets', offsets.tobytes()),
+        ('string_data', b''.join(blobs)),
+        ('string_lists', np.asarray(encoder.string_lists, dtype='<i4').tobytes()),
+    ]
+    counts = {'string_offsets': len(offsets), 'string_lists': len(encoder.string_lists)}
+    for table in TABLES:
+        sections.append((table, encoder.table_array(table).tobytes()))
+        counts[table] = len(encoder.rows[table])
+
+    header = {'version': FORMAT_VERSION, 'fields': encoder.fields, 'sections': {}}
+    position = 0
+    for name, data in sections:
+        header['sections'][name] = [position, len(data), counts.get(name, len(data))]
+        position = _align(position + len(data))
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    start = _align(len(MAGIC) + 12 + len(header_bytes))
+
+    buffer = bytearray(start + position)
+    buffer[:len(MAGIC) + 12] = MAGIC + struct.pack('<IQ', FORMAT_VERSION, len(header_bytes))
+    buffer[len(MAGIC) + 12:len(MAGIC) + 12 + len(header_bytes)] = header_bytes
+    for name, data in sections:
+        offset = start + header['sections'][name][0]
+        buffer[offset:offset + len(data)] = data
+    return bytes(buffer)
+
+
+class SharedCorpus:
+    """Read-only access to an encoded corpus, in shared memory or in a plain buffer."""
+
+    def __init__(self, buffer, shm: Optional[shared_memory.SharedMemory] = None, owner: bool = False):
+        if sys.byteorder != 'little':
+            raise ValueError("Le format est little-endian")
+        self.shm = shm
+        self.owner = owner
+        self._buffer = memoryview(buffer)
+        if bytes(self._buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Pas un corpus partagé TwinShell")
+        version, header_size = struct.unpack_from('<IQ', self._buffer, len(MAGIC))
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Version de format non supportée: {version}")
+        header_start = len(MAGIC) + 12
+        header = json.loads(bytes(self._buffer[header_start:header_start + header_size]))
+        start = _align(header_start + header_size)
+        self.fields: Dict[str, List[str]] = header['fields']
+        self.positions = {table: {key: i for i, key in enumerate(fields)} for table, fields in self.fields.items()}
+        self._sections = {name: (start + offset, size, count) for name, (offset, size, count) in header['sections'].items()}
+
+        def section(name: str) -> memoryview:
+            offset, size, _ = self._sections[name]
+            return self._buffer[offset:offset + size]
+
+        # Plain memoryviews: indexing them is much cheaper than NumPy scalars
+        self._offsets = section('string_offsets').cast('q')
+        self._data = section('string_data')
+        self._lists = section('string_lists').cast('i')
+        self._rows = {table: (struct.Struct(f'<ii{len(fields)}b{len(fields)}i{len(fields)}i'), self._sections[table][0])
+                      for table, fields in self.fields.items()}
+        self.string = lru_cache(maxsize=STRING_CACHE_SIZE)(self._string)
+        self._json = lru_cache(maxsize=STRING_CACHE_SIZE)(self._json_value)
+        self._ids: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def create(cls, actions: Iterable[Dict[str, Any]], name: Optional[str] = None) -> 'SharedCorpus':
+        """Encode actions into a new shared memory block owned (and unlinked on close) by the result."""
+        data = encode_corpus(actions)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm.buf[:len(data)], shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, untrack: bool = True) -> 'SharedCorpus':
+        """Open the block created by another process; it stays owned by its creator.
+
+        Attaching registers the block with the process's resource tracker, which unlinks it
+        when the process exits (before Python 3.13 and track=False): untrack undoes that.
+        Pool workers share their parent's tracker and must pass untrack=False.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        if untrack:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm.buf, shm)
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm else None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    def close(self):
+        """Drop the views, close the block and unlink it when owned."""
+        for view in (self._offsets, self._data, self._lists):
+            view.release()
+        self._rows = {}
+        self.string.cache_clear()
+        self._json.cache_clear()
+        self._buffer.release()
+        if self.shm is not None:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self) -> 'SharedCorpus':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def table(self, name: str) -> np.ndarray:
+        """Zero-copy NumPy view of a record table, for column-wise scans. Delete it before close()."""
+        offset, _, count = self._sections[name]
+        return np.frombuffer(self._buffer, dtype=record_dtype(len(self.fields[name])), count=count, offset=offset)
+
+    def row(self, table: str, row: int) -> tuple:
+        """(keys, extra, kinds..., a..., b...) of a record."""
+        layout, offset = self._rows[table]
+        return layout.unpack_from(self._buffer, offset + row * layout.size)
+
+    def _string(self, index: int) -> str:
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def _json_value(self, index: int) -> Any:
+        return json.loads(self.string(index))
+
+    def __len__(self) -> int:
+        return self._sections['actions'][2]
+
+    def __getitem__(self, index: int) -> 'RecordView':
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return RecordView(self, 'actions', index % len(self))
+
+    def __iter__(self) -> Iterator['RecordView']:
+        for index in range(len(self)):
+            yield RecordView(self, 'actions', index)
+
+    def index_of(self, action_id: str) -> Optional[int]:
+        if self._ids is None:
+            self._ids = {}
+            for index, action in enumerate(self):
+                value = action.get('id')
+                if isinstance(value, str):
+                    self._ids.setdefault(value.casefold(), index)
+        return self._ids.get(action_id.casefold())
+
+    def decode(self, table: str, cells: tuple, position: int) -> Any:
+        count = len(self.fields[table])
+        kind = cells[2 + position]
+        a = cells[2 + count + position]
+        if kind == KIND_STR:
+            return self.string(a)
+        if kind == KIND_INT:
+            return a
+        if kind == KIND_BOOL:
+            return bool(a)
+        if kind == KIND_NULL:
+            return None
+        if kind == KIND_RECORD:
+            return RecordView(self, CHILDREN[(table, self.fields[table][position])], a)
+        if kind == KIND_RECORDS:
+            child = CHILDREN[(table, self.fields[table][position])]
+            return [RecordView(self, child, row) for row in range(a, a + cells[2 + 2 * count + position])]
+        if kind == KIND_STRS:
+            return [self.string(i) for i in self._lists[a:a + cells[2 + 2 * count + position]]]
+        return self._json(a)
+
+
+class RecordView(Mapping):
+    """Read-only view of one record: its fixed-width row is unpacked, fields are decoded when read."""
+
+    __slots__ = ('corpus', 'table', 'index', 'cells', 'positions')
+
+    def __init__(self, corpus: SharedCorpus, table: str, index: int):
+        self.corpus = corpus
+        self.table = table
+        self.index = index
+        self.cells = corpus.row(table, index)
+        self.positions = corpus.positions[table]
+
+    def _extra(self) -> Dict[str, Any]:
+        index = self.cells[1]
+        return self.corpus._json(index) if index >= 0 else {}
+
+    def __getitem__(self, key: str) -> Any:
+        position = self.positions.get(key)
+        if position is None:
+            return self._extra()[key]
+        if self.cells[2 + position] == KIND_ABSENT:
+            raise KeyError(key)
+        return self.corpus.decode(self.table, self.cells, position)
+
+    def __contains__(self, key: object) -> bool:
+        position = self.positions.get(key)
+        if position is None:
+            return key in self._extra()
+        return self.cells[2 + position] != KIND_ABSENT
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.positions.get(key)
+        if position is None:
+            return self._extra().get(key, default)
+        if self.cells[2 + position] == KIND_ABSENT:
+            return default
+        return self.corpus.decode(self.table, self.cells, position)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.corpus._json(self.cells[0]))
+
+    def __len__(self) -> int:
+        return len(self.corpus._json(self.cells[0]))
+
+    def __repr__(self):
+        return f"RecordView({self.table}[{self.index}])"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The source record, rebuilt exactly."""
+        return {key: _materialize(self[key]) for key in self}
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, RecordView):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_materialize(v) for v in value]
+    return value
+
+
+# ----------------------------------------------------------------------
+# Process pool over a shared corpus
+# ----------------------------------------------------------------------
+
+_worker_corpus: Optional[SharedCorpus] = None
+
+
+def _attach_worker(name: str):
+    global _worker_corpus
+    _worker_corpus = SharedCorpus.attach(name, untrack=False)
+
+
+def _run_range(func: Callable[[RecordView], Any], start: int, stop: int) -> List[Any]:
+    return [func(_worker_corpus[index]) for index in range(start, stop)]
+
+
+def map_actions(func: Callable[[RecordView], Any], corpus: SharedCorpus, workers: int = 0,
+                chunk_size: int = DEFAULT_CHUNK) -> List[Any]:
+    """[func(action) for action in corpus] on a process pool; workers attach to the shared block.
+
+    func must be a module-level function; each task only carries it and an index range.
+    """
+    if corpus.name is None:
+        raise ValueError("Le corpus doit être en mémoire partagée (SharedCorpus.create)")
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker, initargs=(corpus.name,)) as pool:
+        futures = [pool.submit(_run_range, func, start, min(start + chunk_size, len(corpus)))
+                   for start in range(0, len(corpus), chunk_size)]
+        return [result for future in futures for result in future.result()]
+
+
+def command_summary(action: Mapping) -> Tuple[int, int]:
+    """(number of commands, total command length) of an action: a small per-action job for benchmarks."""
+    commands = [e['command'] for key in ('examples', 'windowsExamples', 'linuxExamples')
+                for e in action.get(key) or () if 'command' in e]
+    for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+        template = action.get(key)
+        if template is not None and template.get('commandPattern'):
+            commands.append(template['commandPattern'])
+    return len(commands), sum(len(c) for c in commands)
+
+
+def main():
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Encode le corpus en mémoire partagée et vérifie l'aller-retour")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--workers', type=int, default=0)
+    args = parser.parse_args()
+
+    actions = list(iter_actions(args.actions_dir))
+    started = time.perf_counter()
+    with SharedCorpus.create(actions) as corpus:
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"📦 {len(corpus)} actions encodées en {elapsed:.0f} ms: {corpus.nbytes / 1024:.0f} KB "
+              f"en mémoire partagée ({corpus.name})")
+        mismatches = [a.get('id') for a, view in zip(actions, corpus) if view.to_dict() != a]
+        if mismatches:
+            print(f"❌ Aller-retour différent pour {len(mismatches)} action(s): {', '.join(mismatches[:10])}")
+            sys.exit(1)
+        print("✅ Aller-retour identique pour toutes les actions")
+        started = time.perf_counter()
+        summaries = map_actions(command_summary, corpus, args.workers)
+        elapsed = (time.perf_counter() - started) * 1000
+        if summaries != [command_summary(a) for a in actions]:
+            print("❌ Résultats des workers différents du calcul direct")
+            sys.exit(1)
+        print(f"✅ {sum(n for n, _ in summaries)} commandes résumées par les workers en {elapsed:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
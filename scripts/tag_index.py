@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Tag index of the corpus: counts, co-occurrence, bitsets and suggestions.
+
+Tags are normalised with seed_corpus.normalize_tag, then held as NumPy
+arrays:
+- counts[t] and the T x T co-occurrence matrix (diagonal = counts);
+- one bitset per tag (uint64 words, bit i = action i), so "actions having
+  all of tags X, Y" is an AND of a few rows;
+- two token x tag score matrices for the suggester, learned from the
+  title, commands and category of the tagged actions: positive PMI
+  (discounted for rare pairs) and TF-IDF (each tag is a document made of
+  the tokens of its actions).
+
+Suggesting tags for a new action tokenises its title, command and
+category the same way, sums the score rows of the known tokens and keeps
+the best tags: a handful of array operations, a few microseconds.
+
+Usage:
+    python scripts/tag_index.py
+    python scripts/tag_index.py --cooccur ad
+    python scripts/tag_index.py --with ad user
+    python scripts/tag_index.py --suggest "Créer un utilisateur" --command "New-ADUser -Name {name}"
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from corpus_client import load_actions
+from related_actions import words
+from seed_corpus import ACTIONS_DIR, merge_tags, normalize_tag
+
+METHODS = ('pmi', 'tfidf')
+# Token / tag pairs seen fewer times do not count for PMI
+MIN_PAIR_COUNT = 2
+
+
+def context_tokens(title: str = '', commands: Iterable[str] = (), category: str = '') -> List[str]:
+    """Distinct tokens of an action: title, command and category words, hyphenated words split as well."""
+    tokens = {}
+    for text in (title, *commands, category):
+        for word in words(text or ''):
+            tokens.setdefault(word, None)
+            if '-' in word:
+                for part in word.split('-'):
+                    if len(part) > 2:
+                        tokens.setdefault(part, None)
+    return list(tokens)
+
+
+def action_commands(action: Dict[str, Any]) -> List[str]:
+    commands = []
+    for key in ('windowsCommandTemplate', 'linuxCommandTemplate'):
+        template = action.get(key)
+        if isinstance(template, dict):
+            commands.append(template.get('commandPattern') or '')
+    for key in ('examples', 'windowsExamples', 'linuxExamples'):
+        commands.extend(e.get('command', '') for e in action.get(key) or [] if isinstance(e, dict))
+    return commands
+
+
+def _pairs_within_groups(indptr: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """All (a, b) pairs of values sharing a group (a CSR row), including (a, a)."""
+    sizes = np.diff(indptr)
+    owner = np.repeat(np.arange(len(sizes)), sizes)
+    repeats = sizes[owner]
+    left = np.repeat(values, repeats)
+    total = int(repeats.sum())
+    offsets = np.repeat(indptr[owner] - (np.cumsum(repeats) - repeats), repeats)
+    right = values[np.arange(total, dtype=np.int64) + offsets]
+    return left, right
+
+
+class TagIndex:
+    """Tag statistics and suggester built from the actions."""
+
+    def __init__(self, actions: Iterable[Dict[str, Any]]):
+        self.ids: List[str] = []
+        self.tags: List[str] = []
+        self.tag_ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+        tag_ptr, tag_values = [0], []
+        token_ptr, token_values = [0], []
+        for action in actions:
+            self.ids.append(action.get('id', ''))
+            for tag in merge_tags(action.get('tags')):
+                tag_values.append(self.tag_ids.setdefault(tag, len(self.tag_ids)))
+            tag_ptr.append(len(tag_values))
+            for token in context_tokens(action.get('title', ''), action_commands(action), action.get('category', '')):
+                token_values.append(self.token_ids.setdefault(token, len(self.token_ids)))
+            token_ptr.append(len(token_values))
+        self.tags = list(self.tag_ids)
+        self.tokens = list(self.token_ids)
+
+        count, tag_count = len(self.ids), len(self.tags)
+        tag_ptr = np.asarray(tag_ptr, dtype=np.int64)
+        tag_values = np.asarray(tag_values, dtype=np.int64)
+        token_ptr = np.asarray(token_ptr, dtype=np.int64)
+        token_values = np.asarray(token_values, dtype=np.int64)
+
+        self.counts = np.bincount(tag_values, minlength=tag_count).astype(np.int32)
+        left, right = _pairs_within_groups(tag_ptr, tag_values)
+        self.cooccurrence = np.bincount(left * tag_count + right, minlength=tag_count * tag_count
+                                        ).astype(np.int32).reshape(tag_count, tag_count)
+
+        tagged_actions = np.repeat(np.arange(count), np.diff(tag_ptr))
+        self.bitsets = np.zeros((tag_count, (count + 63) // 64), dtype=np.uint64)
+        np.bitwise_or.at(self.bitsets, (tag_values, tagged_actions // 64),
+                         np.left_shift(np.uint64(1), (tagged_actions % 64).astype(np.uint64)))
+
+        self._build_suggester(count, tag_ptr, tag_values, token_ptr, token_values)
+
+    def _build_suggester(self, count, tag_ptr, tag_values, token_ptr, token_values):
+        tag_count, token_count = len(self.tags), len(self.tokens)
+        token_counts = np.bincount(token_values, minlength=token_count).astype(np.float64)
+        # (token, tag) pairs of every action: expand each action's tokens by its tag count
+        tags_per_action = np.diff(tag_ptr)
+        token_owner = np.repeat(np.arange(count), np.diff(token_ptr))
+        repeats = tags_per_action[token_owner]
+        pair_tokens = np.repeat(token_values, repeats)
+        offsets = np.repeat(tag_ptr[token_owner] - (np.cumsum(repeats) - repeats), repeats)
+        pair_tags = tag_values[np.arange(int(repeats.sum()), dtype=np.int64) + offsets]
+        joint = np.bincount(pair_tokens * tag_count + pair_tags, minlength=token_count * tag_count
+                            ).astype(np.float64).reshape(token_count, tag_count)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pmi = np.log(joint * count / np.outer(token_counts, self.counts))
+        pmi[(joint < MIN_PAIR_COUNT) | ~np.isfinite(pmi) | (pmi < 0)] = 0
+        self.pmi = (pmi * joint / (joint + 1)).astype(np.float32)
+
+        document_frequency = np.count_nonzero(joint, axis=1)
+        self.token_idf = (np.log((1 + tag_count) / (1 + document_frequency)) + 1).astype(np.float32)
+        tfidf = joint * self.token_idf[:, None]
+        norms = np.linalg.norm(tfidf, axis=0)
+        norms[norms == 0] = 1
+        self.tfidf = (tfidf / norms).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def suggest(self, title: str = '', command: str = '', category: str = '', top: int = 8,
+                method: str = 'pmi', exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Tags for a new action, best first, as (tag, score)."""
+        rows = [self.token_ids[t] for t in context_tokens(title, [command], category) if t in self.token_ids]
+        if not rows:
+            return []
+        if method == 'pmi':
+            scores = self.pmi[rows].sum(axis=0)
+        else:
+            scores = self.tfidf[rows].T @ self.token_idf[rows]
+        for tag in exclude:
+            position = self.tag_ids.get(normalize_tag(tag))
+            if position is not None:
+                scores[position] = 0
+        top = min(top, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.tags[i], float(scores[i])) for i in best if scores[i] > 0]
+
+    def cooccurring(self, tag: str, top: int = 10) -> List[Tuple[str, int]]:
+        """Tags most often found with tag, as (tag, number of shared actions)."""
+        position = self.tag_ids.get(normalize_tag(tag))
+        if position is None:
+            return []
+        row = self.cooccurrence[position].copy()
+        row[position] = 0
+        best = np.argsort(-row, kind='stable')[:top]
+        return [(self.tags[i], int(row[i])) for i in best if row[i]]
+
+    def actions_with(self, *tags: str) -> List[str]:
+        """Ids of the actions having all the given tags."""
+        positions = [self.tag_ids.get(normalize_tag(tag)) for tag in tags]
+        if not positions or None in positions:
+            return []
+        mask = np.bitwise_and.reduce(self.bitsets[positions], axis=0)
+        bits = np.unpackbits(mask.astype('<u8').view(np.uint8), bitorder='little')
+        return [self.ids[i] for i in np.flatnonzero(bits[:len(self.ids)])]
+
+
+def load_tag_index(actions_dir: Path = ACTIONS_DIR) -> TagIndex:
+    return TagIndex(load_actions(actions_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index des tags: statistiques, cooccurrences et suggestions")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--cooccur', metavar='TAG', help="Tags les plus souvent associés à TAG")
+    parser.add_argument('--with', dest='with_tags', nargs='+', metavar='TAG',
+                        help="Actions ayant tous ces tags")
+    parser.add_argument('--suggest', metavar='TITRE', help="Propose des tags pour une nouvelle action")
+    parser.add_argument('--command', default='', help="Commande de la nouvelle action (avec --suggest)")
+    parser.add_argument('--category', default='', help="Catégorie de la nouvelle action (avec --suggest)")
+    parser.add_argument('--method', choices=METHODS, default='pmi')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = load_tag_index(args.actions_dir)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"📊 {len(index)} actions, {len(index.tags)} tags, {len(index.tokens)} tokens (index: {elapsed:.0f} ms)")
+
+    def timed(run, repeat: int = 1000):
+        result = run()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        return result, (time.perf_counter() - started) / repeat * 1e6
+
+    if args.suggest is not None:
+        suggestions, micros = timed(lambda: index.suggest(args.suggest, args.command, args.category,
+                                                          args.top, args.method))
+        print(f"🏷️  Suggestions ({args.method}, {micros:.1f} µs):")
+        for tag, score in suggestions:
+            print(f"   {score:7.3f}  {tag}")
+    if args.cooccur:
+        position = index.tag_ids.get(normalize_tag(args.cooccur))
+        if position is None:
+            print(f"❌ Tag inconnu: {args.cooccur}")
+        else:
+            print(f"🔗 Associés à '{index.tags[position]}' ({index.counts[position]} actions):")
+        for tag, shared in index.cooccurring(args.cooccur, args.top):
+            print(f"   {shared:5d}  {tag}")
+    if args.with_tags:
+        ids, micros = timed(lambda: index.actions_with(*args.with_tags))
+        print(f"🔍 {len(ids)} action(s) avec {' + '.join(args.with_tags)} ({micros:.1f} µs):")
+        for action_id in ids:
+            print(f"   {action_id}")
+    if args.suggest is None and not args.cooccur and not args.with_tags:
+        print("🏷️  Tags les plus fréquents:")
+        for position in np.argsort(-index.counts, kind='stable')[:args.top]:
+            print(f"   {index.counts[position]:5d}  {index.tags[position]}")
+
+
+if __name__ == '__main__':
+    main()
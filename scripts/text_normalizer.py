@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Python port of TwinShell.Core.Helpers.TextNormalizer.
+
+normalize_for_search gives the same result as the app's
+NormalizeForSearch (see docs/developer/SEARCH_FUNCTIONALITY.md):
+diacritics removed (FormD, non-spacing marks dropped, FormC), lower-cased
+with ToLowerInvariant, '-', '_' and '.' replaced by spaces, runs of spaces
+collapsed and the result trimmed. The .NET details are kept:
+- "blank" and Trim() use .NET's whitespace set (char.IsWhiteSpace), not
+  str.isspace(), which also treats U+001C..U+001F as whitespace;
+- only runs of U+0020 are collapsed, tabs and newlines stay;
+- ToLowerInvariant maps each character on its own (no final sigma);
+- .NET walks UTF-16 chars, so non-spacing marks outside the BMP (seen as
+  surrogates) are kept;
+- U+FFFE and lone surrogates raise ValueError, like String.Normalize.
+Character properties come from unicodedata (Unicode 14 on Python 3.11),
+the app's from ICU: characters assigned in later Unicode versions, such
+as U+0ECE, may normalize differently.
+The shared fixtures in tests/TwinShell.Core.Tests/Fixtures/text-normalizer.json
+are checked against both implementations (TextNormalizerFixtureTests and
+--check-fixtures).
+
+normalize_for_search is memoized in a bounded LRU. NormalizedCorpus
+normalizes every searchable field of the corpus (the fields SearchService
+scores) once and stores them in _actions_normalized.json next to the
+actions directory (not inside it, which the app ships), keyed by the
+file SHA-256 of the lazy_corpus catalog, so later runs only normalize new
+or modified actions.
+
+Usage:
+    python scripts/text_normalizer.py "Get-ADUser_Café--Réseau"
+    python scripts/text_normalizer.py --check-fixtures
+    python scripts/text_normalizer.py --corpus
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from lazy_corpus import ENTRY_ID, ENTRY_SHA256, ActionCatalog
+from seed_corpus import ACTIONS_DIR, load_action, sidecar_path, write_text_atomic
+
+NORMALIZED_SUFFIX = '_normalized.json'
+# Bump when the normalization or the stored fields change
+NORMALIZED_VERSION = 1
+CACHE_SIZE = 65536
+FIXTURES_FILE = (Path(__file__).resolve().parent.parent / 'tests' / 'TwinShell.Core.Tests' / 'Fixtures'
+                 / 'text-normalizer.json')
+
+# char.IsWhiteSpace: U+0009..U+000D, U+0085 and the Zs / Zl / Zp characters
+DOTNET_WHITESPACE = ('\t\n\x0b\x0c\r\x85 \xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006'
+                     '\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+_SEPARATORS = str.maketrans('-_.', '   ')
+_SPACE_RUNS = re.compile(' {2,}')
+# Rejected by String.Normalize ("String contains invalid Unicode code points")
+_INVALID_CODE_POINTS = re.compile('[\ufffe\ud800-\udfff]')
+
+# Fields scored by SearchService, in its order
+SEARCH_FIELDS = ('title', 'description', 'category', 'tags', 'notes', 'windowsTemplate', 'linuxTemplate')
+
+
+def is_null_or_white_space(text: Optional[str]) -> bool:
+    return not text or not text.strip(DOTNET_WHITESPACE)
+
+
+def remove_diacritics(text: Optional[str]) -> str:
+    """RemoveDiacritics: "Réseau" -> "Reseau" (ß and other letters without a decomposition are kept)."""
+    if is_null_or_white_space(text):
+        return ''
+    if text.isascii():
+        return text
+    if _INVALID_CODE_POINTS.search(text):
+        raise ValueError("String contains invalid Unicode code points")
+    decomposed = unicodedata.normalize('NFD', text)
+    kept = ''.join(c for c in decomposed if ord(c) > 0xFFFF or unicodedata.category(c) != 'Mn')
+    return unicodedata.normalize('NFC', kept)
+
+
+def to_lower_invariant(text: str) -> str:
+    """ToLowerInvariant: one character at a time, so a final capital sigma becomes σ, not ς."""
+    if text.isascii() or 'Σ' not in text:
+        return text.lower()
+    return ''.join(c.lower() for c in text)
+
+
+def _normalize_for_search(text: Optional[str]) -> str:
+    if is_null_or_white_space(text):
+        return ''
+    normalized = to_lower_invariant(remove_diacritics(text)).translate(_SEPARATORS)
+    return _SPACE_RUNS.sub(' ', normalized).strip(DOTNET_WHITESPACE)
+
+
+normalize_for_search = lru_cache(maxsize=CACHE_SIZE)(_normalize_for_search)
+normalize_for_search.__doc__ = """NormalizeForSearch: "  Get-ADUser_Café--Réseau " -> "get aduser cafe reseau" (memoized)."""
+
+
+def get_search_tokens(normalized_text: Optional[str]) -> List[str]:
+    """GetSearchTokens: split an already normalized text on spaces."""
+    if is_null_or_white_space(normalized_text):
+        return []
+    return [token for token in normalized_text.split(' ') if token]
+
+
+def contains_all_tokens(searchable_text: Optional[str], search_tokens: Optional[Iterable[str]]) -> bool:
+    """ContainsAllTokens: every token is a substring of the text (AND, any order)."""
+    if is_null_or_white_space(searchable_text):
+        return False
+    return all(token in searchable_text for token in search_tokens or ())
+
+
+def levenshtein_distance(source: Optional[str], target: Optional[str]) -> int:
+    if not source:
+        return len(target) if target else 0
+    if not target:
+        return len(source)
+    previous = list(range(len(target) + 1))
+    for i, s in enumerate(source, 1):
+        current = [i]
+        for j, t in enumerate(target, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (s != t)))
+        previous = current
+    return previous[-1]
+
+
+def is_fuzzy_match(source: str, target: str, max_distance_ratio: float = 0.3) -> bool:
+    if is_null_or_white_space(source) or is_null_or_white_space(target):
+        return False
+    return levenshtein_distance(source, target) / max(len(source), len(target)) <= max_distance_ratio
+
+
+def get_fuzzy_match_score(searchable_text: str, search_token: str) -> float:
+    """GetFuzzyMatchScore: 1.0 for a substring match, else the best word similarity above 70%."""
+    if is_null_or_white_space(searchable_text) or is_null_or_white_space(search_token):
+        return 0.0
+    if search_token in searchable_text:
+        return 1.0
+    best = 0.0
+    for word in searchable_text.split(' '):
+        if not word:
+            continue
+        ratio = levenshtein_distance(search_token, word) / max(len(search_token), len(word))
+        if ratio <= 0.3:
+            best = max(best, 1.0 - ratio)
+    return best
+
+
+def normalize_action(action: Dict[str, Any]) -> Dict[str, str]:
+    """Normalized searchable fields of an action, combined the way SearchService combines them."""
+    fields = {
+        'title': normalize_for_search(action.get('title')),
+        'description': normalize_for_search(action.get('description')),
+        'category': normalize_for_search(action.get('category')),
+        'tags': ' '.join(normalize_for_search(tag) for tag in action.get('tags') or []),
+        'notes': normalize_for_search(action.get('notes')),
+    }
+    for key, field in (('windowsCommandTemplate', 'windowsTemplate'), ('linuxCommandTemplate', 'linuxTemplate')):
+        template = action.get(key)
+        if isinstance(template, dict):
+            fields[field] = (f"{normalize_for_search(template.get('name'))} "
+                             f"{normalize_for_search(template.get('commandPattern'))}")
+        else:
+            fields[field] = ''
+    return fields
+
+
+class NormalizedCorpus:
+    """Normalized searchable fields of every action, stored next to the catalog."""
+
+    def __init__(self, actions_dir: Path = ACTIONS_DIR):
+        self.actions_dir = Path(actions_dir)
+        self.path = sidecar_path(self.actions_dir, NORMALIZED_SUFFIX)
+        # stem -> (sha256, action id, fields)
+        self.entries: Dict[str, tuple] = {}
+
+    @classmethod
+    def load(cls, actions_dir: Path = ACTIONS_DIR, refresh: bool = True) -> 'NormalizedCorpus':
+        corpus = cls(actions_dir)
+        try:
+            with open(corpus.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == NORMALIZED_VERSION:
+                corpus.entries = {stem: tuple(entry) for stem, entry in data['entries'].items()}
+        except (OSError, ValueError, KeyError):
+            pass
+        if refresh and corpus.refresh():
+            corpus.save()
+        return corpus
+
+    def refresh(self) -> int:
+        """Normalize new or modified actions and drop removed ones; return the change count."""
+        catalog = ActionCatalog.load(self.actions_dir)
+        changes = 0
+        for stem, entry in catalog.entries.items():
+            current = self.entries.get(stem)
+            if current and current[0] == entry[ENTRY_SHA256]:
+                continue
+            action = load_action(self.actions_dir / f"{stem}.json")
+            self.entries[stem] = (entry[ENTRY_SHA256], entry[ENTRY_ID], normalize_action(action))
+            changes += 1
+        for stem in [s for s in self.entries if s not in catalog.entries]:
+            del self.entries[stem]
+            changes += 1
+        return changes
+
+    def save(self):
+        data = {
+            'version': NORMALIZED_VERSION,
+            'entries': {stem: list(entry) for stem, entry in sorted(self.entries.items())},
+        }
+        write_text_atomic(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def fields(self) -> Dict[str, Dict[str, str]]:
+        """Action id -> normalized fields."""
+        return {action_id: fields for _, action_id, fields in self.entries.values()}
+
+    def matching(self, query: str) -> List[str]:
+        """Ids of the actions where one field contains every token of the query (SearchService's exact match)."""
+        tokens = get_search_tokens(normalize_for_search(query))
+        return sorted(action_id for _, action_id, fields in self.entries.values()
+                      if any(contains_all_tokens(fields[f], tokens) for f in SEARCH_FIELDS))
+
+
+def check_fixtures(path: Path = FIXTURES_FILE) -> List[str]:
+    """Compare this port with the expected values of the shared fixtures; return the mismatches."""
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    failures = []
+    for case in fixtures['normalizeForSearch']:
+        actual = normalize_for_search(case['input'])
+        if actual != case['expected']:
+            failures.append(f"normalizeForSearch({case['input']!r}) = {actual!r}, attendu {case['expected']!r}")
+    for case in fixtures['removeDiacritics']:
+        actual = remove_diacritics(case['input'])
+        if actual != case['expected']:
+            failures.append(f"removeDiacritics({case['input']!r}) = {actual!r}, attendu {case['expected']!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalisation de texte identique à TextNormalizer (app)")
+    parser.add_argument('texts', nargs='*', help="Textes à normaliser")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--check-fixtures', nargs='?', const=FIXTURES_FILE, type=Path, metavar='JSON',
+                        help="Vérifie le portage sur les fixtures partagées avec les tests C#")
+    parser.add_argument('--corpus', action='store_true',
+                        help="Normalise le corpus et met à jour le cache _actions_normalized.json")
+    parser.add_argument('--search', metavar='REQUÊTE', help="Actions correspondant à la requête")
+    args = parser.parse_args()
+
+    for text in args.texts:
+        print(f"{text!r} -> {normalize_for_search(text)!r}")
+
+    if args.check_fixtures:
+        failures = check_fixtures(args.check_fixtures)
+        for failure in failures:
+            print(f"❌ {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"✅ Fixtures conformes ({args.check_fixtures.name})")
+
+    if args.corpus or args.search:
+        started = time.perf_counter()
+        corpus = NormalizedCorpus.load(args.actions_dir, refresh=False)
+        changes = corpus.refresh()
+        if changes:
+            corpus.save()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"📊 {len(corpus)} actions normalisées ({changes} mise(s) à jour) en {elapsed:.0f} ms")
+        if args.search:
+            ids = corpus.matching(args.search)
+            print(f"🔍 {len(ids)} action(s) pour {args.search!r}")
+            for action_id in ids:
+                print(f"   {action_id}")
+
+
+if __name__ == '__main__':
+    main()
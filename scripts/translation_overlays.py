@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Per-locale translation overlays on top of the (French) seed corpus.
+
+The app models translations as ActionTranslation rows (ActionId,
+CultureCode, Title, Description, Notes). The seed keeps them in one sparse
+file per culture, data/seed/translations/<culture>.json, holding only the
+fields that have been translated:
+
+    {
+      "cultureCode": "en",
+      "version": 1,
+      "translations": {
+        "ad-create-user": {"title": "Create a user", "description": "..."},
+        "WIN-PRIVACY-002": {"notes": "..."}
+      }
+    }
+
+Ids are matched case-insensitively, like lazy_corpus. Overlay files are
+read the first time their culture is used; LocalizedAction is a read-only
+view over the base action that looks a field up in the culture chain
+("en-GB", then "en") when it is accessed, then falls back to the base
+text. Nothing is copied, so a culture costs the memory of its translated
+strings only.
+
+The coverage report counts, per culture, the translatable fields (non-empty
+in the base corpus) that have a translation in its chain, by field and by
+category. For the culture's own file it also lists translations of unknown
+actions or fields, empty texts, texts left identical to the source and
+texts longer than the ActionTranslations columns.
+
+Usage:
+    python scripts/translation_overlays.py
+    python scripts/translation_overlays.py --culture en --show ad-create-user
+    python scripts/translation_overlays.py --culture en --missing
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from lazy_corpus import LazyCorpus
+from seed_corpus import ACTIONS_DIR, SEED_DIR, iter_actions, write_text_atomic
+
+TRANSLATIONS_DIR = SEED_DIR / 'translations'
+OVERLAY_VERSION = 1
+# Language of the seed text itself
+BASE_CULTURE = 'fr'
+TRANSLATABLE_FIELDS = ('title', 'description', 'notes')
+# Column sizes of ActionTranslationConfiguration
+MAX_LENGTHS = {'title': 200, 'description': 1000, 'notes': 2000}
+
+
+def normalize_culture(culture: str) -> str:
+    return culture.strip().replace('_', '-').lower()
+
+
+def culture_chain(culture: str) -> List[str]:
+    """Cultures to look up, most specific first: "en-GB" -> ["en-gb", "en"]. The base culture ends the chain."""
+    parts = normalize_culture(culture).split('-')
+    chain = []
+    for end in range(len(parts), 0, -1):
+        code = '-'.join(parts[:end])
+        if code == BASE_CULTURE:
+            break
+        chain.append(code)
+    return chain
+
+
+class TranslationOverlay:
+    """Sparse translations of one culture: {action id (casefolded): {field: text}}."""
+
+    def __init__(self, culture: str, translations: Optional[Dict[str, Dict[str, str]]] = None):
+        self.culture = normalize_culture(culture)
+        self.translations: Dict[str, Dict[str, str]] = {}
+        self._ids: Dict[str, str] = {}
+        for action_id, fields in (translations or {}).items():
+            self.update(action_id, fields)
+
+    @classmethod
+    def load(cls, path: Path) -> 'TranslationOverlay':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version', OVERLAY_VERSION) > OVERLAY_VERSION:
+            raise ValueError(f"{path}: version {data['version']} non supportée")
+        return cls(data.get('cultureCode') or path.stem, data.get('translations'))
+
+    def save(self, path: Path):
+        translations = {self._ids[key]: dict(self.translations[key]) for key in sorted(self.translations)}
+        data = {'cultureCode': self.culture, 'version': OVERLAY_VERSION, 'translations': translations}
+        write_text_atomic(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+    def update(self, action_id: str, fields: Mapping[str, str]):
+        key = action_id.casefold()
+        self._ids.setdefault(key, action_id)
+        self.translations.setdefault(key, {}).update(fields)
+
+    def get(self, action_id: str) -> Optional[Dict[str, str]]:
+        return self.translations.get(action_id.casefold())
+
+    def ids(self) -> List[str]:
+        """Action ids as written in the file."""
+        return [self._ids[key] for key in self.translations]
+
+    def __len__(self) -> int:
+        return len(self.translations)
+
+
+class Translations:
+    """Overlay files of a directory, each parsed on first use."""
+
+    def __init__(self, directory: Path = TRANSLATIONS_DIR):
+        self.directory = Path(directory)
+        self._overlays: Dict[str, Optional[TranslationOverlay]] = {}
+        self._files: Optional[Dict[str, Path]] = None
+
+    def files(self) -> Dict[str, Path]:
+        """{normalized culture: overlay file}, from one scan of the directory.
+
+        File names keep their own casing ("en-GB.json", as the app writes
+        CultureCode), so lookups go through this map rather than building a
+        lower-cased name that a case-sensitive filesystem would not find.
+        """
+        if self._files is None:
+            self._files = {}
+            if self.directory.is_dir():
+                for path in sorted(self.directory.glob('*.json')):
+                    if not path.name.startswith('_'):
+                        self._files.setdefault(normalize_culture(path.stem), path)
+        return self._files
+
+    def path(self, culture: str) -> Path:
+        culture = normalize_culture(culture)
+        return self.files().get(culture, self.directory / f"{culture}.json")
+
+    def cultures(self) -> List[str]:
+        return sorted(self.files())
+
+    def overlay(self, culture: str) -> Optional[TranslationOverlay]:
+        culture = normalize_culture(culture)
+        if culture not in self._overlays:
+            path = self.files().get(culture)
+            self._overlays[culture] = TranslationOverlay.load(path) if path is not None else None
+        return self._overlays[culture]
+
+    def chain(self, culture: str) -> List[TranslationOverlay]:
+        return [o for o in (self.overlay(c) for c in culture_chain(culture)) if o is not None]
+
+    def loaded(self) -> List[str]:
+        return [culture for culture, overlay in self._overlays.items() if overlay is not None]
+
+
+class LocalizedAction(Mapping):
+    """Read-only view of an action whose translatable fields are looked up in overlays on access."""
+
+    __slots__ = ('action', 'overlays')
+
+    def __init__(self, action: Mapping[str, Any], overlays: List[TranslationOverlay]):
+        self.action = action
+        self.overlays = overlays
+
+    def translation(self, field: str) -> Optional[str]:
+        """Translated text of field, or None when it falls back to the base text."""
+        if field not in TRANSLATABLE_FIELDS:
+            return None
+        action_id = self.action.get('id') or ''
+        for overlay in self.overlays:
+            fields = overlay.get(action_id)
+            if fields and fields.get(field):
+                return fields[field]
+        return None
+
+    def __getitem__(self, key: str) -> Any:
+        text = self.translation(key)
+        return text if text is not None else self.action[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.action)
+
+    def __len__(self) -> int:
+        return len(self.action)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Merged copy, for serialization."""
+        return {key: self[key] for key in self.action}
+
+
+class LocalizedCorpus:
+    """LazyCorpus seen in one culture."""
+
+    def __init__(self, culture: str, corpus: Optional[LazyCorpus] = None,
+                 translations: Optional[Translations] = None):
+        self.culture = normalize_culture(culture)
+        self.corpus = corpus if corpus is not None else LazyCorpus()
+        self.translations = translations if translations is not None else Translations()
+
+    def get(self, action_id: str, default: Any = None) -> Any:
+        action = self.corpus.get(action_id)
+        if action is None:
+            return default
+        return LocalizedAction(action, self.translations.chain(self.culture))
+
+    def __getitem__(self, action_id: str) -> LocalizedAction:
+        action = self.get(action_id)
+        if action is None:
+            raise KeyError(action_id)
+        return action
+
+    def __iter__(self) -> Iterator[LocalizedAction]:
+        overlays = self.translations.chain(self.culture)
+        for action in self.corpus:
+            yield LocalizedAction(action, overlays)
+
+    def __len__(self) -> int:
+        return len(self.corpus)
+
+
+def coverage(actions: Iterable[Dict[str, Any]], overlays: List[TranslationOverlay]) -> Dict[str, Any]:
+    """Coverage of a culture chain against the base actions; file problems are reported for overlays[0]."""
+    overlay = overlays[0]
+    total = translated = 0
+    by_category: Dict[str, Counter] = defaultdict(Counter)
+    by_field: Dict[str, Counter] = defaultdict(Counter)
+    missing: List[str] = []
+    issues: Dict[str, List[str]] = defaultdict(list)
+    seen = set()
+    for action in actions:
+        action_id = action.get('id', '')
+        view = LocalizedAction(action, overlays)
+        fields = overlay.get(action_id) or {}
+        if fields:
+            seen.add(action_id.casefold())
+        complete = True
+        for field in TRANSLATABLE_FIELDS:
+            source = action.get(field)
+            if not source:
+                continue
+            text = view.translation(field)
+            total += 1
+            by_category[action.get('category', '')]['total'] += 1
+            by_field[field]['total'] += 1
+            if text:
+                translated += 1
+                by_category[action.get('category', '')]['translated'] += 1
+                by_field[field]['translated'] += 1
+                if text == source:
+                    issues['identical'].append(f"{action_id}.{field}")
+                if len(text) > MAX_LENGTHS[field]:
+                    issues['too_long'].append(f"{action_id}.{field} ({len(text)} > {MAX_LENGTHS[field]})")
+            else:
+                complete = False
+        if not complete:
+            missing.append(action_id)
+        for field, text in fields.items():
+            if field not in TRANSLATABLE_FIELDS:
+                issues['unknown_field'].append(f"{action_id}.{field}")
+            elif not isinstance(text, str) or not text.strip():
+                issues['empty'].append(f"{action_id}.{field}")
+    issues['unknown_action'] = [action_id for action_id in overlay.ids() if action_id.casefold() not in seen]
+    return {
+        'culture': overlay.culture,
+        'total': total,
+        'translated': translated,
+        'by_category': {c: dict(v) for c, v in sorted(by_category.items())},
+        'by_field': {f: dict(by_field[f]) for f in TRANSLATABLE_FIELDS if f in by_field},
+        'missing': missing,
+        'issues': {k: v for k, v in issues.items() if v},
+    }
+
+
+def percent(part: int, total: int) -> str:
+    return f"{part / total * 100:5.1f}%" if total else "  n/a"
+
+
+def print_coverage(report: Dict[str, Any]):
+    print(f"🌐 {report['culture']}: {report['translated']}/{report['total']} champs traduits "
+          f"({percent(report['translated'], report['total']).strip()})")
+    for field, counts in report['by_field'].items():
+        print(f"   {field:<12} {counts.get('translated', 0):5d}/{counts['total']:<5d} "
+              f"{percent(counts.get('translated', 0), counts['total'])}")
+    for category, counts in report['by_category'].items():
+        print(f"   {percent(counts.get('translated', 0), counts['total'])}  {category}")
+    for issue, entries in report['issues'].items():
+        print(f"   ⚠️  {issue}: {len(entries)}")
+        for entry in entries[:10]:
+            print(f"      {entry}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calques de traduction par culture et couverture")
+    parser.add_argument('--actions-dir', type=Path, default=ACTIONS_DIR)
+    parser.add_argument('--translations-dir', type=Path, default=TRANSLATIONS_DIR)
+    parser.add_argument('--culture', help="Culture à analyser (défaut: toutes)")
+    parser.add_argument('--show', nargs='+', metavar='ID', help="Affiche ces actions dans la culture choisie")
+    parser.add_argument('--missing', action='store_true', help="Liste les actions incomplètement traduites")
+    parser.add_argument('--json', type=Path, metavar='FICHIER', help="Écrit le rapport de couverture en JSON")
+    args = parser.parse_args()
+
+    translations = Translations(args.translations_dir)
+    if args.show:
+        if not args.culture:
+            parser.error("--show nécessite --culture")
+        corpus = LocalizedCorpus(args.culture, LazyCorpus(args.actions_dir), translations)
+        for action_id in args.show:
+            action = corpus.get(action_id)
+            print(json.dumps(action.to_dict(), ensure_ascii=False, indent=2) if action
+                  else f"❌ Action introuvable: {action_id}")
+        return
+
+    cultures = [normalize_culture(args.culture)] if args.culture else translations.cultures()
+    if not cultures:
+        print(f"⚠️  Aucun calque de traduction dans {args.translations_dir}")
+        return
+
+    actions = [{'id': a.get('id', ''), 'category': a.get('category', ''),
+                **{f: a.get(f) for f in TRANSLATABLE_FIELDS}} for a in iter_actions(args.actions_dir)]
+    reports = []
+    for culture in cultures:
+        overlay = translations.overlay(culture)
+        if overlay is None:
+            print(f"❌ Calque introuvable: {translations.path(culture)}")
+            sys.exit(1)
+        report = coverage(actions, [overlay] + translations.chain(culture)[1:])
+        reports.append(report)
+        print_coverage(report)
+        if args.missing:
+            print(f"   📝 {len(report['missing'])} action(s) à traduire:")
+            for action_id in report['missing']:
+                print(f"      {action_id}")
+
+    if args.json:
+        write_text_atomic(args.json, json.dumps(reports, ensure_ascii=False, indent=2))
+        print(f"💾 Rapport: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
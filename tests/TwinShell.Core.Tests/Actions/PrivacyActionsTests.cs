@@ -28,7 +28,7 @@ public class PrivacyActionsTests
         foreach (var filePath in Directory.GetFiles(actionsDir, "*.json"))
         {
             var fileName = Path.GetFileName(filePath);
-            if (fileName == "_index.json") continue; // Skip index file
+            if (fileName == "_index.json" || fileName == "_manifest.json") continue; // Skip index and manifest files
 
             var json = File.ReadAllText(filePath);
             var actionElement = JsonDocument.Parse(json).RootElement;
@@ -0,0 +1,58 @@
+using System.Text.Json;
+using TwinShell.Core.Helpers;
+
+namespace TwinShell.Core.Tests.Helpers;
+
+/// <summary>
+/// Checks TextNormalizer against the shared fixture file Fixtures/text-normalizer.json.
+/// The same file is checked by the Python port (scripts/text_normalizer.py --check-fixtures),
+/// so both implementations stay in agreement.
+/// </summary>
+public class TextNormalizerFixtureTests
+{
+    private const string FixturePath = "../../../Fixtures/text-normalizer.json";
+
+    public static IEnumerable<object[]> NormalizeForSearchCases() => LoadCases("normalizeForSearch");
+
+    public static IEnumerable<object[]> RemoveDiacriticsCases() => LoadCases("removeDiacritics");
+
+    [Theory]
+    [MemberData(nameof(NormalizeForSearchCases))]
+    public void NormalizeForSearch_MatchesFixture(string input, string expected)
+    {
+        // Act
+        var result = TextNormalizer.NormalizeForSearch(input);
+
+        // Assert
+        result.Should().Be(expected);
+    }
+
+    [Theory]
+    [MemberData(nameof(RemoveDiacriticsCases))]
+    public void RemoveDiacritics_MatchesFixture(string input, string expected)
+    {
+        // Act
+        var result = TextNormalizer.RemoveDiacritics(input);
+
+        // Assert
+        result.Should().Be(expected);
+    }
+
+    private static IEnumerable<object[]> LoadCases(string section)
+    {
+        var path = Path.GetFullPath(FixturePath);
+        if (!File.Exists(path))
+        {
+            throw new FileNotFoundException($"Fixture file not found: {path}");
+        }
+
+        using var document = JsonDocument.Parse(File.ReadAllText(path));
+        return document.RootElement.GetProperty(section).EnumerateArray()
+            .Select(c => new object[]
+            {
+                c.GetProperty("input").GetString() ?? string.Empty,
+                c.GetProperty("expected").GetString() ?? string.Empty
+            })
+            .ToList();
+    }
+}